@@ -0,0 +1,315 @@
+# Модуль замеров производительности расчётных блоков.
+
+# Для натуральных логарифмов в эталонном (поэлементном) расчёте
+import math
+
+# Для замеров времени
+import time
+
+# Для подавления печати дебитов во время замеров
+import contextlib
+import io
+import os
+import tempfile
+
+import numpy as np
+
+from .HGD_Corr import Correlations, coriolis, friction, transfer
+from .HGD_Pl import Plast
+from .HGD_Skv import SKV
+from .HGD_Tr123 import Tr123
+from .HGD_TrO import TrO
+from .HGD_Store import dump_data, endpoints, load_data
+
+
+def plast_loop(PL):
+
+    # Эталонный поэлементный расчёт пласта (прежняя реализация Plast.solve)
+    P = [[0 for _ in range(PL.N + 1)] for _ in range(3)]
+    wr = [[0 for _ in range(PL.N + 1)] for _ in range(3)]
+    r = [[0 for _ in range(PL.N + 1)] for _ in range(3)]
+    Q = [0 for _ in range(3)]
+
+    muN = PL.muN0 * (1 + 2.5 * PL.alphav)
+
+    for i in range(3):
+        Q[i] = (2 * PL.pi * PL.h[i] * PL.k[i] * (PL.Pk[i] - PL.Pc[i])) / (
+            muN * math.log(PL.rk[i] / PL.rc[i])
+        )
+
+        for j in range(0, PL.N + 1):
+            if j == 0:
+                r[i][j] = PL.rc[i]
+            else:
+                r[i][j] = (PL.rk[i] / PL.N) * j
+
+            P[i][j] = PL.Pk[i] - (
+                ((PL.Pk[i] - PL.Pc[i]) / math.log(PL.rk[i] / PL.rc[i]))
+                * math.log(PL.rk[i] / r[i][j])
+            )
+
+            wr[i][j] = (PL.k[i] * (PL.Pc[i] - PL.Pk[i])) / (
+                muN * math.log(PL.rk[i] / PL.rc[i]) * r[i][j]
+            )
+
+    return Q, P, wr, r
+
+
+def timeit(func, repeat=3):
+
+    # Лучшее время из нескольких запусков, с
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_plast(filepath, sizes=(10**3, 10**5, 10**6)):
+
+    # Сравнение поэлементного и векторного расчёта пласта при разных N1
+    PL = Plast()
+    PL.load(filepath)
+
+    rows = []
+    for N in sizes:
+        PL.N = N
+        t_loop = timeit(lambda: plast_loop(PL), repeat=1 if N >= 10**5 else 3)
+        t_vec = timeit(lambda: (PL.solve(), PL.grid()))
+        rows.append((N, t_loop, t_vec, t_loop / t_vec))
+
+    print("%10s %12s %12s %10s" % ("N1", "цикл, с", "numpy, с", "ускорение"))
+    for N, t_loop, t_vec, speedup in rows:
+        print("%10d %12.5f %12.5f %10.1f" % (N, t_loop, t_vec, speedup))
+
+    return rows
+
+
+def grid_error(profile, N, mode, q=5000.0, M=20000):
+
+    # Наибольшая ошибка кусочно-линейного профиля давления на сетке относительно
+    # аналитического решения, по плотному набору радиусов (равномерному и логарифмическому)
+    err = 0
+    r = profile.grid(N, mode, q)
+    for i in range(profile.n):
+        rc, rk = profile.rc[i, 0], profile.rk[i, 0]
+        re = np.union1d(np.linspace(rc, rk, M), np.geomspace(rc, rk, M))
+        Pe = profile.P(re)[i]
+        Pg = np.interp(re, r[i], profile.P(r)[i])
+        err = max(err, np.abs(Pg - Pe).max())
+    return err
+
+
+def bench_grid(filepath, sizes=(10, 20, 50, 100, 200, 500, 1000), q=5000.0):
+
+    # Ошибка профиля давления в пласте в зависимости от числа узлов и типа сетки, Па
+    PL = Plast()
+    PL.load(filepath)
+    with contextlib.redirect_stdout(io.StringIO()):
+        PL.solve()
+
+    modes = ("uniform", "log", "geom")
+    rows = [(N,) + tuple(grid_error(PL.profile, N, m, q) for m in modes) for N in sizes]
+
+    print("%10s %14s %14s %14s" % ("N1", "uniform", "log", "geom q=%g" % q))
+    for row in rows:
+        print("%10d %14.4e %14.4e %14.4e" % row)
+
+    return rows
+
+
+def bench_skv(filepath, wells=(3, 30, 300, 3000)):
+
+    # Время одного шага по глубине при одновременном расчёте n скважин
+    PL = Plast()
+    PL.load(filepath)
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "Data_HGD_output.toml")
+        with contextlib.redirect_stdout(io.StringIO()):
+            PL.solve()
+        PL.dump(out)
+        SK = SKV()
+        SK.load(filepath, out)
+
+    base = {key: list(getattr(SK, key)) for key in ("Hskv", "rc", "h", "Pc", "Qpl")}
+
+    rows = []
+    for n in wells:
+        # Размножение исходных скважин до n штук
+        for key, value in base.items():
+            setattr(SK, key, [value[i % len(value)] for i in range(n)])
+        t = timeit(SK.solve)
+        rows.append((n, t, t / SK.N * 1e6, t / n * 1e3))
+
+    print(
+        "%10s %12s %14s %16s" % ("скважин", "время, с", "шаг, мкс", "на скважину, мс")
+    )
+    for row in rows:
+        print("%10d %12.4f %14.2f %16.3f" % row)
+
+    return rows
+
+
+def bench_handoff(sizes=(10**3, 10**4, 10**5), wells=3):
+
+    # Выгрузка и чтение шести профилей (скважины x узлы) в toml и в двоичном хранилище
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for N in sizes:
+            data = {
+                key: np.random.default_rng(0).uniform(1e6, 2e7, (wells, N + 1))
+                for key in ("Pskv", "Gskv", "Tskv", "Ptr", "Gtr", "Ttr")
+            }
+            times = []
+            for name in ("Data_HGD_output.toml", "Data_HGD_output"):
+                filepath = os.path.join(tmp, name)
+                t_dump = timeit(lambda: dump_data(filepath, data), repeat=1)
+                t_load = timeit(lambda: endpoints(load_data(filepath)["Ptr"]), repeat=1)
+                times += [t_dump, t_load]
+            rows.append((N,) + tuple(times))
+
+    print(
+        "%10s %12s %12s %12s %12s"
+        % ("N", "toml dump", "toml load", "npy dump", "npy load")
+    )
+    for row in rows:
+        print("%10d %12.5f %12.5f %12.5f %12.5f" % row)
+
+    return rows
+
+
+def bench_rk(filepath, tols=(1e-3, 1e-4, 1e-6, 1e-8)):
+
+    # Погрешность давления и температуры в конце скважин и трубопроводов от них
+    # относительно эталона (переменный шаг, точность 1e-12): расчёт по N сечениям
+    # и расчёт с переменным шагом при разной точности, число вычислений правых частей
+    PL = Plast()
+    PL.verbose = False
+    PL.load(filepath)
+    PL.solve()
+
+    def chain(rk):
+        SK = SKV()
+        SK.rk = rk
+        SK.load(filepath, {"Qpl": PL.Q})
+        t = time.perf_counter()
+        SK.solve()
+        TR = Tr123()
+        TR.rk = rk
+        TR.load(filepath, {"Qpl": PL.Q, "Pskv": SK.P1, "Gskv": SK.G1, "Tskv": SK.T1})
+        TR.solve()
+        t = time.perf_counter() - t
+        evals = sum(s.stats["evals"] if rk else s.N for s in (SK, TR))
+        return TR.P1[:, -1], TR.T1[:, -1], evals, t
+
+    P0, T0 = chain(1e-12)[:2]
+
+    print(
+        "%10s %14s %12s %12s %12s"
+        % ("точность", "вычислений", "ошибка P, Па", "ошибка T, К", "время, с")
+    )
+    for rk in (None,) + tuple(tols):
+        P, T, evals, t = chain(rk)
+        print(
+            "%10s %14d %12.3g %12.3g %12.4f"
+            % (rk or "N", evals, np.abs(P - P0).max(), np.abs(T - T0).max(), t)
+        )
+
+
+def bench_fast(filepath, tols=(1e-2, 1e-4, 1e-6)):
+
+    # Трубопроводы от скважин и общий трубопровод: расчёт по N сечениям и быстрый
+    # расчёт по формуле Шухова, погрешность давления и температуры на выходе
+    # относительно эталона (переменный шаг, точность 1e-12)
+    PL = Plast()
+    PL.verbose = False
+    PL.load(filepath)
+    PL.solve()
+    SK = SKV()
+    SK.load(filepath, {"Qpl": PL.Q})
+    SK.solve()
+    DT2 = {"Qpl": PL.Q, "Pskv": SK.P1, "Gskv": SK.G1, "Tskv": SK.T1}
+
+    def chain(rk=None, fast=None):
+        TR = Tr123()
+        TR.rk = rk
+        TR.fast = fast
+        TR.load(filepath, DT2)
+        t = time.perf_counter()
+        TR.solve()
+        TO = TrO()
+        TO.rk = rk
+        TO.fast = fast
+        TO.load(filepath, dict(DT2, Ptr=TR.P1, Gtr=TR.G1, Ttr=TR.T1))
+        TO.solve()
+        return TO.P1[0, -1], TO.T1[0, -1], time.perf_counter() - t
+
+    P0, T0 = chain(rk=1e-12)[:2]
+
+    print(
+        "%10s %12s %12s %12s" % ("точность", "ошибка P, Па", "ошибка T, К", "время, с")
+    )
+    for fast in (None,) + tuple(tols):
+        P, T, t = chain(fast=fast)
+        print("%10s %12.3g %12.3g %12.5f" % (fast or "N", abs(P - P0), abs(T - T0), t))
+
+
+def bench_corr(filepath, wells=(3, 300, 3000)):
+
+    # Корреляции трения и теплоотдачи на одном шаге по глубине: прямые формулы
+    # (как прежде на каждом шаге) и таблица Correlations, рассчитанная один раз
+    PL = Plast()
+    PL.verbose = False
+    PL.load(filepath)
+    PL.solve()
+    SK = SKV()
+    SK.load(filepath, {"Qpl": PL.Q})
+    SK.prepare()
+
+    muN = SK.muN0 * (1 + 2.5 * SK.alphav)
+    C = SK.CN * (1 - SK.alphav) + SK.CV * SK.alphav
+    lyambdaN = SK.lyambdaN0 * (1 - SK.alphav) + SK.lyambdaV * SK.alphav
+    Pr = (muN * C) / lyambdaN
+
+    # Отклонение таблицы от прямых формул по всем сечениям скважин
+    corr = None
+    error = 0.0
+    for s in SK.stream():
+        if corr is None:
+            corr = Correlations(
+                s["Re"], SK.Re1, SK.Re2, SK.OTsheroh, SK.E, Pr, lyambdaN, SK.dc
+            )
+        TgrSkv = SK.Tgr + s["z"] * SK.gradT
+        Gr = SK.g * SK.deltaZ**3 * SK.betaN * np.abs(s["T"] - TgrSkv) / s["nu"] ** 2
+        error = max(error, corr.check(s["Re"], Gr))
+
+    print("%10s %14s %14s" % ("скважин", "формулы, мкс", "таблица, мкс"))
+    for n in wells:
+        # Размножение исходных скважин до n штук
+        Re, Grn, dc = (np.resize(a, n) for a in (corr.Re, Gr, SK.dc))
+        table = Correlations(Re, SK.Re1, SK.Re2, SK.OTsheroh, SK.E, Pr, lyambdaN, dc)
+
+        def direct():
+            friction(Re, SK.Re1, SK.Re2, SK.OTsheroh)
+            coriolis(Re, SK.Re1, SK.Re2)
+            transfer(Re, Pr, Grn, lyambdaN, dc, SK.Re1, SK.Re2)
+
+        t1 = timeit(lambda: [direct() for _ in range(100)]) / 100
+        t2 = timeit(lambda: [table.alphaSS(Grn) for _ in range(100)]) / 100
+        print("%10d %14.2f %14.2f" % (n, t1 * 1e6, t2 * 1e6))
+
+    print("Наибольшее относительное отклонение таблицы от формул:", error)
+    return error
+
+
+if __name__ == "__main__":
+
+    bench_plast(r"Project_HGD\Data_HGD_input.toml")
+    bench_grid(r"Project_HGD\Data_HGD_input.toml")
+    bench_skv(r"Project_HGD\Data_HGD_input.toml")
+    bench_handoff()
+    bench_rk(r"Project_HGD\Data_HGD_input.toml")
+    bench_fast(r"Project_HGD\Data_HGD_input.toml")
+    bench_corr(r"Project_HGD\Data_HGD_input.toml")
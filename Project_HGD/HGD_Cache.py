@@ -0,0 +1,124 @@
+# Модуль кэша результатов расчётных блоков на диске.
+#
+# Результат блока хранится под ключом - хэшем исходных данных, которые блок читает
+# (список KEYS у класса блока), правила выгрузки профилей и ключа результата предыдущего
+# блока. Повторный расчёт с теми же данными берёт результат из кэша, а при изменении
+# одного параметра заново рассчитываются только блоки, которые от него зависят.
+#
+# Каталог кэша содержит по подкаталогу на результат, в нём по файлу .npy на величину
+# (список RESULTS у класса блока). Размер кэша ограничен: при превышении удаляются
+# результаты, которые дольше всех не использовались.
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from .HGD_Store import content
+
+
+class Cache:
+    def __init__(self, dirpath=".hgd_cache", limit=2**30):
+
+        # Каталог кэша и предельный объём результатов в нём, байт
+        self.dirpath = dirpath
+        self.limit = limit
+        # Число попаданий и промахов за время работы
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, stage, upstream=None):
+
+        # Хэш имени блока, читаемых им исходных данных, правила выгрузки, точности
+        # расчёта с переменным шагом и быстрого расчёта, ключа результата предыдущего
+        # блока. Файлы исходных данных (таблица PVT) входят в хэш содержимым
+        data = {key: content(stage.DT.get(key)) for key in stage.KEYS}
+        data = {key: np.asarray(v).tolist() for key, v in data.items() if v is not None}
+        text = json.dumps(
+            [
+                type(stage).__name__,
+                data,
+                str(getattr(stage, "output", "")),
+                getattr(stage, "rk", None),
+                getattr(stage, "fast", None),
+                upstream,
+            ],
+            sort_keys=True,
+        )
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key):
+
+        # Результат из кэша (словарь массивов с отображением в память) или None
+        path = os.path.join(self.dirpath, key)
+        if not os.path.isdir(path):
+            self.misses += 1
+            return None
+
+        # Время изменения каталога - время последнего использования результата
+        os.utime(path)
+        self.hits += 1
+        data = {}
+        for name in os.listdir(path):
+            if name.endswith(".npy"):
+                data[name[:-4]] = np.load(os.path.join(path, name), mmap_mode="r")
+        return data
+
+    def put(self, key, data):
+
+        # Результат пишется во временный каталог и затем переименовывается, чтобы
+        # параллельные процессы не прочитали его недописанным
+        path = os.path.join(self.dirpath, key)
+        tmp = "%s.tmp%d" % (path, os.getpid())
+        os.makedirs(tmp, exist_ok=True)
+        for name, value in data.items():
+            np.save(os.path.join(tmp, name + ".npy"), np.asarray(value))
+
+        try:
+            os.replace(tmp, path)
+        except OSError:
+            # Тот же результат уже записан другим процессом
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict(keep=key)
+
+    def size(self, path):
+
+        return sum(entry.stat().st_size for entry in os.scandir(path))
+
+    def evict(self, keep=None):
+
+        # Удаление давно не использованных результатов сверх предельного объёма
+        entries = []
+        for entry in os.scandir(self.dirpath):
+            if entry.is_dir() and ".tmp" not in entry.name:
+                entries.append((entry.stat().st_mtime, self.size(entry.path), entry))
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.limit:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry.path, ignore_errors=True)
+            total -= size
+
+    def run(self, stage, upstream=None):
+
+        # Расчёт блока с использованием кэша, возвращает ключ результата блока
+        key = self.key(stage, upstream)
+        data = self.get(key)
+
+        if data is None:
+            stage.solve()
+            self.put(key, {name: getattr(stage, name) for name in stage.RESULTS})
+        else:
+            # Вспомогательные величины блока (шаги, диаметры) рассчитываются заново,
+            # профили берутся из кэша
+            stage.prepare()
+            for name, value in data.items():
+                setattr(stage, name, value)
+
+        return key
@@ -0,0 +1,118 @@
+# Модуль корреляций гидравлического трения и теплоотдачи, общий для блоков скважин
+# и трубопроводов.
+#
+# Число Рейнольдса Re = G * D / (S * muN) по длине скважины или трубопровода не меняется:
+# произведение плотности на скорость задано расходом, а вязкость от температуры не зависит.
+# Поэтому коэффициенты трения и Кориолиса, режим течения, турбулентная теплоотдача и
+# степени Re**0.33, Re**0.8, Pr**0.43 вычисляются один раз на расчёт - таблица
+# Correlations по строке на скважину, трубопровод или сценарий. На шаге по сечениям
+# остаётся только множитель Gr**0.1 ламинарной теплоотдачи.
+#
+# Функции friction, coriolis и transfer - прямые формулы, по ним таблица строится,
+# и с ними она сверяется (Correlations.check).
+
+import numpy as np
+
+
+def friction(Re, Re1, Re2, OTsheroh):
+
+    # Коэффициент гидравлического трения lyambdaT по числу Рейнольдса: точно Re2,
+    # ламинарный, переходный, турбулентный и квадратичный режимы
+    lyambda1 = 64 / Re1
+    lyambda2 = 0.11 * (((68 / Re2) + OTsheroh) ** 0.25)
+    return np.select(
+        [
+            Re == Re2,
+            Re <= Re1,
+            Re <= Re2,
+            Re <= 500 / OTsheroh,
+        ],
+        [
+            lyambda2,
+            lyambda1,
+            lyambda1 + ((lyambda2 - lyambda1) / (Re2 - Re1)) * (Re - Re1),
+            0.067 * (((158 / Re) + 2 * OTsheroh) ** 0.2),
+        ],
+        0.067 * ((2.136 * OTsheroh) ** 0.2),
+    )
+
+
+def coriolis(Re, Re1, Re2):
+
+    # Коэффициент Кориолиса для ламинарного, переходного и турбулентного режимов
+    return np.where(Re <= Re1, 2, np.where(Re >= Re2, 1.1, (-1.169e-4 * Re) + 2.269))
+
+
+def transfer(Re, Pr, Gr, lyambdaN, D, Re1, Re2):
+
+    # Коэффициент теплоотдачи от потока к стенке alphaSS, Вт/м**2 * K
+
+    # Для ламинарного режима
+    alphaL = 0.17 * (lyambdaN / D) * Re**0.33 * Pr**0.43 * Gr**0.1 * 1
+
+    # Для турбулентного режима
+    alphaT = 0.021 * (lyambdaN / D) * Re**0.8 * Pr**0.43 * 1
+
+    # Для ламинарного, турбулентного и переходного режимов
+    return np.where(
+        Re <= Re1,
+        alphaL,
+        np.where(Re >= Re2, alphaT, alphaL + ((alphaT - alphaL) / 8000) * (Re - 2000)),
+    )
+
+
+class Correlations:
+    def __init__(self, Re, Re1, Re2, OTsheroh, E, Pr, lyambdaN, D):
+
+        # Исходные данные корреляций: число Рейнольдса строк, критические числа,
+        # шероховатость, коэффициент технического состояния труб, число Прандтля,
+        # теплопроводность смеси и диаметр
+        self.Re = Re
+        self.Re1 = Re1
+        self.Re2 = Re2
+        self.OTsheroh = OTsheroh
+        self.Pr = Pr
+        self.lyambdaN = lyambdaN
+        self.D = D
+
+        # Режим течения: 0 - ламинарный, 1 - переходный, 2 - турбулентный
+        self.laminar = Re <= Re1
+        self.turbulent = Re >= Re2
+        self.regime = np.where(self.laminar, 0, np.where(self.turbulent, 2, 1))
+
+        # Коэффициенты трения и Кориолиса
+        self.lyambdaT = friction(Re, Re1, Re2, OTsheroh)
+        self.lyambdaTr = (1.05 * self.lyambdaT) / (E**2)
+        self.alphak = coriolis(Re, Re1, Re2)
+
+        # Теплоотдача: множитель при Gr**0.1 для ламинарного режима и турбулентная
+        self.cL = 0.17 * (lyambdaN / D) * Re**0.33 * Pr**0.43
+        self.alphaT = 0.021 * (lyambdaN / D) * Re**0.8 * Pr**0.43 * 1
+
+    def alphaSS(self, Gr):
+
+        # Коэффициент теплоотдачи от потока к стенке при числе Грасгофа Gr
+        alphaL = self.cL * Gr**0.1 * 1
+        return np.where(
+            self.laminar,
+            alphaL,
+            np.where(
+                self.turbulent,
+                self.alphaT,
+                alphaL + ((self.alphaT - alphaL) / 8000) * (self.Re - 2000),
+            ),
+        )
+
+    def check(self, Re, Gr):
+
+        # Наибольшее относительное отклонение табличных величин от прямых формул
+        # при числах Рейнольдса и Грасгофа рассчитанного состояния потока
+        pairs = (
+            (self.lyambdaT, friction(Re, self.Re1, self.Re2, self.OTsheroh)),
+            (self.alphak, coriolis(Re, self.Re1, self.Re2)),
+            (
+                self.alphaSS(Gr),
+                transfer(Re, self.Pr, Gr, self.lyambdaN, self.D, self.Re1, self.Re2),
+            ),
+        )
+        return max(float(np.max(np.abs(a - b) / np.abs(b))) for a, b in pairs)
@@ -0,0 +1,88 @@
+# Модуль диагностики шагов расчёта по сечениям: число Рейнольдса, коэффициенты трения
+# lyambdaT, теплоотдачи alphaSS и Кориолиса alphak, потери давления на трение deltaPtr
+# и тепловой поток в грунт Qvn на каждом участке скважин и трубопроводов.
+#
+# Блоки SKV, Tr123 и TrO вызывают наблюдателя stage.observer(блок, строки, j, величины)
+# на каждом участке j = 0..N-1 расчёта по сечениям (с переменным шагом и быстрым
+# расчётом - не вызывают). Без наблюдателя цикл по сечениям только проверяет его
+# отсутствие. Recorder - готовый наблюдатель, записывающий величины в массивы
+# строка x участок, выделенные один раз на расчёт блока.
+
+import numpy as np
+
+# Величины, передаваемые наблюдателю на каждом участке
+DIAGNOSTICS = ("Re", "lyambdaT", "alphaSS", "alphak", "deltaPtr", "Qvn")
+
+
+class Recorder:
+    def __init__(self, names=DIAGNOSTICS):
+
+        # Записываемые величины и массивы (строка x участок) по ним
+        self.names = names
+        self.data = {}
+
+    def attach(self, stage):
+
+        # Подключение к блоку: записи предыдущего расчёта сбрасываются. С переменным
+        # шагом и быстрым расчётом блок наблюдателя не вызывает
+        if getattr(stage, "rk", None) is not None or (
+            getattr(stage, "fast", None) is not None
+        ):
+            raise ValueError(
+                "Наблюдатель вызывается только при расчёте по сечениям, у блока %s "
+                "задан расчёт с переменным шагом (rk) или быстрый расчёт (fast)"
+                % type(stage).__name__
+            )
+        stage.observer = self
+        self.data = {}
+        return self
+
+    def __call__(self, stage, sl, j, values):
+
+        # Массивы выделяются на первом участке первой пачки строк каждого расчёта, когда
+        # известно число строк блока
+        if j == 0 and not sl.start:
+            rows = getattr(stage, "m", getattr(stage, "n", None))
+            self.data = {name: np.zeros((rows, stage.N)) for name in self.names}
+        for name in self.names:
+            self.data[name][sl, j] = values[name]
+
+    def regime(self, stage):
+
+        # Режим течения на участках по записанному числу Рейнольдса:
+        # 0 - ламинарный, 1 - переходный, 2 - турбулентный
+        if "Re" not in self.data:
+            raise ValueError(
+                "Число Рейнольдса не записано: блок не рассчитан по сечениям после attach"
+            )
+        Re = self.data["Re"]
+        return np.where(Re <= stage.Re1, 0, np.where(Re >= stage.Re2, 2, 1))
+
+    def transitions(self, stage):
+
+        # Участки смены режима течения: пары (строка, участок)
+        regime = self.regime(stage)
+        return np.argwhere(regime[:, 1:] != regime[:, :-1]) + (0, 1)
+
+
+if __name__ == "__main__":
+
+    from .HGD_Pl import Plast
+    from .HGD_Skv import SKV
+
+    PL = Plast()
+    PL.verbose = False
+    PL.load(r"Project_HGD\Data_HGD_input.toml")
+    PL.solve()
+
+    SK = SKV()
+    RE = Recorder().attach(SK)
+    SK.load(r"Project_HGD\Data_HGD_input.toml", {"Qpl": PL.Q})
+    SK.solve()
+
+    for name in DIAGNOSTICS:
+        value = RE.data[name]
+        print(
+            "%9s: от %12.5g до %12.5g" % (name, value.min(), value.max()),
+        )
+    print("Смены режима течения (скважина, участок):", RE.transitions(SK).tolist())
@@ -0,0 +1,169 @@
+# Модуль ансамблевого расчёта: M сценариев исходных данных рассчитываются одновременно
+# по всей цепочке пласт - скважина - трубопровод - общий трубопровод.
+#
+# Строки массивов блоков Plast, SKV и Tr123 - пары (сценарий, скважина), строки TrO - сценарии.
+
+# Векторные вычисления сразу по всем сценариям
+import numpy as np
+
+from .HGD_Pl import Plast
+from .HGD_Skv import SKV
+from .HGD_Store import load_data
+from .HGD_Tr123 import Tr123
+from .HGD_TrO import TrO
+
+# Относительный разброс параметров с неопределённостью по умолчанию
+SPREAD = {"k": 0.3, "alphav": 0.2, "muN0": 0.1, "Pk": 0.05, "Tgr": 0.02}
+
+# Параметры, заданные отдельно для каждой скважины
+WELL_KEYS = ("h", "k", "Pc", "Pk", "rc", "rk", "Hskv", "L")
+
+
+class Ensemble:
+    def __init__(self):
+
+        # Количество сценариев, рассчитываемых за один проход цепочки
+        self.block = 5000
+        # Точность расчёта с переменным шагом, None - расчёт по N сечениям
+        self.rk = None
+        # Точность быстрого расчёта трубопроводов по формуле Шухова
+        self.fast = None
+
+    def load(self, filepath):
+
+        # Подключение и интерпретация файла данных Data_HGD_input.toml
+        self.DT = load_data(filepath)
+
+        # Количество скважин в одном сценарии
+        self.n = len(self.DT["Hskv"])
+        self.M = 1
+        self.samples = {}
+
+    def sample(self, M, spread=None, seed=None):
+
+        # Равномерные случайные отклонения параметров от исходных значений на +-spread,
+        # для параметров скважин - независимо по каждой скважине
+        rng = np.random.default_rng(seed)
+        spread = SPREAD if spread is None else spread
+
+        samples = {}
+        for key, rel in spread.items():
+            base = np.asarray(self.DT[key], dtype=float)
+            samples[key] = base * (1 + rel * rng.uniform(-1, 1, (M,) + base.shape))
+
+        # Коэффициент обводненности не выходит за пределы [0, 1]
+        if "alphav" in samples:
+            samples["alphav"] = np.clip(samples["alphav"], 0, 1)
+
+        self.set(samples)
+
+    def set(self, samples):
+
+        # Явно заданные сценарии: для каждого параметра массив (M,) или (M, n)
+        self.samples = {key: np.asarray(v, dtype=float) for key, v in samples.items()}
+        self.M = len(next(iter(self.samples.values())))
+
+    def config(self, a, b):
+
+        # Исходные данные для сценариев a..b-1: для блоков скважин параметры
+        # развёрнуты по строкам (сценарий, скважина), для общего трубопровода - по сценариям
+        m = b - a
+        DT = dict(self.DT)
+        DTo = dict(self.DT)
+
+        for key in WELL_KEYS:
+            DT[key] = np.tile(np.asarray(self.DT[key], dtype=float), m)
+
+        for key, value in self.samples.items():
+            if key in WELL_KEYS:
+                DT[key] = value[a:b].ravel()
+            else:
+                DT[key] = np.repeat(value[a:b], self.n)
+                DTo[key] = value[a:b]
+
+        return DT, DTo
+
+    def solve(self):
+
+        # Величины на выходе общего трубопровода по сценариям: расход, давление, температура
+        self.G = np.zeros(self.M)
+        self.P = np.zeros(self.M)
+        self.T = np.zeros(self.M)
+        # Давление и температура в конце трубопроводов от скважин (сценарий x скважина)
+        self.Ptr = np.zeros((self.M, self.n))
+        self.Ttr = np.zeros((self.M, self.n))
+
+        for a in range(0, self.M, self.block):
+            b = min(a + self.block, self.M)
+            DT, DTo = self.config(a, b)
+
+            PL = Plast()
+            PL.verbose = False
+            PL.load(DT)
+            PL.solve()
+
+            SK = SKV()
+            SK.output = "end"
+            SK.rk = self.rk
+            SK.load(DT, {"Qpl": PL.Q})
+            SK.solve()
+
+            # Последующим блокам передаются только последние сечения профилей
+            DT2 = {
+                "Qpl": PL.Q,
+                "Pskv": SK.P1[:, -1:],
+                "Gskv": SK.G1[:, -1:],
+                "Tskv": SK.T1[:, -1:],
+            }
+            del SK
+
+            TR = Tr123()
+            TR.output = "end"
+            TR.rk = self.rk
+            TR.fast = self.fast
+            TR.load(DT, DT2)
+            TR.solve()
+
+            DT2.update(
+                {"Ptr": TR.P1[:, -1:], "Gtr": TR.G1[:, -1:], "Ttr": TR.T1[:, -1:]}
+            )
+            self.Ptr[a:b] = TR.P1[:, -1].reshape(b - a, self.n)
+            self.Ttr[a:b] = TR.T1[:, -1].reshape(b - a, self.n)
+            del TR
+
+            TO = TrO()
+            TO.output = "end"
+            TO.rk = self.rk
+            TO.fast = self.fast
+            TO.load(DTo, DT2)
+            TO.solve()
+
+            self.G[a:b] = TO.G1[:, -1]
+            self.P[a:b] = TO.P1[:, -1]
+            self.T[a:b] = TO.T1[:, -1]
+
+        return {"G": self.G, "P": self.P, "T": self.T}
+
+    def stats(self):
+
+        # Среднее, стандартное отклонение и 10/50/90 процентили величин на выходе
+        rows = {}
+        for name, value in (("G", self.G), ("P", self.P), ("T", self.T)):
+            p10, p50, p90 = np.percentile(value, (10, 50, 90))
+            rows[name] = (value.mean(), value.std(), p10, p50, p90)
+        return rows
+
+
+if __name__ == "__main__":
+
+    EN = Ensemble()
+    EN.load(r"Project_HGD\Data_HGD_input.toml")
+    EN.sample(10000, seed=1)
+    EN.solve()
+
+    print(
+        "%4s %14s %14s %14s %14s %14s"
+        % ("", "среднее", "ст. откл.", "P10", "P50", "P90")
+    )
+    for name, row in EN.stats().items():
+        print("%4s %14.6g %14.6g %14.6g %14.6g %14.6g" % ((name,) + row))
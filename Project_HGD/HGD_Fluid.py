@@ -0,0 +1,137 @@
+# Модуль свойств смеси нефти и воды, общий для блоков скважин и трубопроводов.
+#
+# FluidModel один раз на расчёт вычисляет постоянные при заданной обводнённости alphav
+# величины (вязкость Эйнштейна, теплоёмкость, теплопроводность, число Прандтля) и
+# выдаёт плотность смеси, её производную и кинематическую вязкость по массивам
+# температур. По умолчанию плотность нефти и воды - линейное тепловое расширение
+# (коэффициенты betaN и betaV), с таблицей PVT (ключ pvt в Data_HGD_input) -
+# кусочно-линейная интерполяция табличных плотностей.
+
+import numpy as np
+
+from .HGD_Store import load_data
+
+
+class PVTTable:
+    def __init__(self, data):
+
+        # data - путь к файлу toml (или словарь) с массивами T, К, и плотностями
+        # нефти po и воды pov при этих температурах, кг/м**3
+        DT = load_data(data)
+        self.T = np.asarray(DT["T"], dtype=float)
+        self.po = np.asarray(DT["po"], dtype=float)
+        self.pov = np.asarray(DT["pov"], dtype=float)
+
+        # Плотности нефти и воды на интервалах таблицы: po = a + b * T, pov = av + bv * T.
+        # Плотность смеси линейна по обводнённости, поэтому её коэффициенты на интервале -
+        # смесь этих коэффициентов, без пересчёта по каждой обводнённости
+        dT = np.diff(self.T)
+        self.b = np.diff(self.po) / dT
+        self.a = self.po[:-1] - self.b * self.T[:-1]
+        self.bv = np.diff(self.pov) / dT
+        self.av = self.pov[:-1] - self.bv * self.T[:-1]
+
+    def lookup(self, T, alphav):
+
+        # Коэффициенты a, b для каждого элемента T; за пределами таблицы -
+        # продолжение крайних интервалов
+        T, alphav = np.broadcast_arrays(
+            np.asarray(T, dtype=float), np.asarray(alphav, dtype=float)
+        )
+        i = np.searchsorted(self.T, T, side="right") - 1
+        i = np.clip(i, 0, len(self.T) - 2)
+
+        a = self.a[i] + alphav * (self.av[i] - self.a[i])
+        b = self.b[i] + alphav * (self.bv[i] - self.b[i])
+        return a, b
+
+    def rho(self, T, alphav):
+
+        a, b = self.lookup(T, alphav)
+        return a + b * np.asarray(T, dtype=float)
+
+    def drho(self, T, alphav):
+
+        return self.lookup(T, alphav)[1]
+
+
+class FluidModel:
+    def __init__(
+        self,
+        po,
+        pov,
+        betaN,
+        betaV,
+        alphav,
+        muN0,
+        CN,
+        CV,
+        lyambdaN0,
+        lyambdaV,
+        pvt=None,
+    ):
+
+        # Плотности нефти и воды при нормальных условиях и коэффициенты влияния
+        # температуры на них, коэффициент обводнённости и доля нефти
+        self.po = po
+        self.pov = pov
+        self.betaN = betaN
+        self.betaV = betaV
+        self.alphav = alphav
+        self.oil = 1 - alphav
+
+        # Формула вязкости Эйнштейна для смеси воды и нефти
+        self.muN = muN0 * (1 + 2.5 * alphav)
+        # Теплоёмкость и теплопроводность смеси
+        self.C = CN * self.oil + CV * alphav
+        self.lyambdaN = lyambdaN0 * self.oil + lyambdaV * alphav
+        # Число Прандтля для нефти
+        self.Pr = (self.muN * self.C) / self.lyambdaN
+
+        # Таблица PVT: путь к файлу, словарь или готовый объект PVTTable
+        if pvt is not None and not isinstance(pvt, PVTTable):
+            pvt = PVTTable(pvt)
+        self.pvt = pvt
+
+    def rho(self, T):
+
+        # Плотность смеси при температуре T
+        if self.pvt is not None:
+            return self.pvt.rho(T, self.alphav)
+        return (self.po / (1 + (self.betaN * (T - 293)))) * self.oil + (
+            self.pov / (1 + (self.betaV * (T - 293)))
+        ) * self.alphav
+
+    def drho(self, T):
+
+        # Производная плотности смеси по температуре
+        if self.pvt is not None:
+            return self.pvt.drho(T, self.alphav)
+        return (
+            -(self.po * self.betaN / (1 + (self.betaN * (T - 293))) ** 2) * self.oil
+            - (self.pov * self.betaV / (1 + (self.betaV * (T - 293))) ** 2)
+            * self.alphav
+        )
+
+    def nu(self, T):
+
+        # Кинематическая вязкость смеси при температуре T
+        return self.muN / self.rho(T)
+
+
+def fluid(stage):
+
+    # Модель смеси по исходным данным блока скважин или трубопроводов
+    return FluidModel(
+        stage.po,
+        stage.pov,
+        stage.betaN,
+        stage.betaV,
+        stage.alphav,
+        stage.muN0,
+        stage.CN,
+        stage.CV,
+        stage.lyambdaN0,
+        stage.lyambdaV,
+        stage.DT.get("pvt"),
+    )
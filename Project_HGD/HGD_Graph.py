@@ -0,0 +1,210 @@
+# Модуль инкрементного пересчёта системы после изменения исходных данных.
+#
+# Зависимости блоков описаны у их классов: KEYS - читаемые исходные данные, INPUTS -
+# читаемые результаты предыдущих блоков, OUTPUTS - результаты, передаваемые далее.
+# По ним строится граф зависимостей, и после изменения исходных данных пересчитываются
+# только блоки, зависящие от изменённых параметров. Скважины и трубопроводы от них
+# рассчитываются независимо друг от друга, поэтому при изменении параметров отдельной
+# скважины (например, Hskv[i]) пересчитывается только её строка, которая подставляется
+# в прежние профили. Подстановка возможна только при общих сечениях строк, то есть при
+# расчёте по N сечениям: с переменным шагом (rk) и при быстром расчёте (fast) сечения и
+# участки зависят от рассчитываемых строк, и блок пересчитывается целиком.
+
+import numpy as np
+
+from .HGD_Ensemble import WELL_KEYS
+from .HGD_Pl import Plast
+from .HGD_Skv import SKV
+from .HGD_Store import content, load_data
+from .HGD_System import SystemResult
+from .HGD_Tr123 import Tr123
+from .HGD_TrO import TrO
+
+# Блоки системы в порядке расчёта и их имена (как у правила выгрузки в run_system)
+STAGES = (Plast, SKV, Tr123, TrO)
+NAMES = {Plast: "plast", SKV: "skv", Tr123: "tr", TrO: "tro"}
+
+# Блоки, у которых пересчитываются отдельные строки (скважины) профилей.
+# Пласт рассчитывается по аналитической формуле и пересчитывается целиком
+ROW_STAGES = (SKV, Tr123)
+
+
+def graph(stages=STAGES):
+
+    # Граф зависимостей: для каждого блока - блоки, результаты которых он читает
+    producer = {}
+    deps = {}
+    for stage in stages:
+        deps[stage] = []
+        for name in stage.INPUTS:
+            if name in producer and producer[name] not in deps[stage]:
+                deps[stage].append(producer[name])
+        for name in stage.OUTPUTS:
+            producer[name] = stage
+    return deps
+
+
+def changed_rows(old, new, keys, n):
+
+    # Скважины, затронутые изменением исходных данных keys: пустое множество - блок
+    # не затронут, None - затронуты все скважины (изменён общий параметр или их число)
+    rows = set()
+    for key in keys:
+        a = np.asarray(old.get(key))
+        b = np.asarray(new.get(key))
+        if a.shape == b.shape and np.array_equal(a, b):
+            continue
+        if key not in WELL_KEYS or a.shape != b.shape or a.shape != (n,):
+            return None
+        rows.update(np.flatnonzero(a != b).tolist())
+    return rows
+
+
+def take(data, rows, keys):
+
+    # Строки rows величин keys, остальные величины передаются как есть
+    return {
+        key: np.asarray(value)[rows] if key in keys else value
+        for key, value in data.items()
+    }
+
+
+class Incremental:
+    def __init__(self, output="full"):
+
+        # Правило выгрузки профилей, общее или словарь {"skv": ..., "tr": ..., "tro": ...}
+        self.output = output
+        # Точность расчёта с переменным шагом, None - расчёт по N сечениям
+        self.rk = None
+        # Точность быстрого расчёта трубопроводов по формуле Шухова
+        self.fast = None
+        # Исходные данные последнего расчёта (и они же для сравнения, файлы - хэшем
+        # содержимого) и рассчитанные блоки
+        self.DT = None
+        self.state = None
+        self.stages = {}
+        self.graph = graph()
+        # Блоки, пересчитанные при последнем вызове run: имя - номера скважин (None - все)
+        self.solved = {}
+
+    def create(self, cls):
+
+        stage = cls()
+        if cls is Plast:
+            stage.verbose = False
+        else:
+            output = self.output
+            if isinstance(output, dict):
+                output = output.get(NAMES[cls], "full")
+            stage.output = output
+            stage.rk = self.rk
+            if cls is not SKV:
+                stage.fast = self.fast
+        return stage
+
+    def results(self, names):
+
+        # Результаты рассчитанных блоков, которые читает следующий блок
+        data = {}
+        for stage in self.stages.values():
+            for name, attr in stage.OUTPUTS.items():
+                if name in names:
+                    data[name] = getattr(stage, attr)
+        return data
+
+    def load(self, stage, DT, DT2):
+
+        if stage.INPUTS:
+            stage.load(DT, DT2)
+        else:
+            stage.load(DT)
+
+    def solve(self, cls, DT):
+
+        # Полный расчёт блока
+        stage = self.create(cls)
+        self.load(stage, DT, self.results(cls.INPUTS))
+        stage.solve()
+        self.stages[cls] = stage
+
+    def spliceable(self, cls):
+
+        # Строки подставляются только в расчёт по N сечениям, общим для всех строк
+        return self.rk is None and (self.fast is None or cls is SKV)
+
+    def splice(self, cls, DT, rows):
+
+        # Расчёт только скважин rows и подстановка их строк в прежние профили блока.
+        # False - сечения подрасчёта не совпали с прежними, строки не подставлены
+        stage = self.stages[cls]
+        DT2 = self.results(cls.INPUTS)
+        self.load(stage, DT, DT2)
+        stage.prepare()
+
+        sub = self.create(cls)
+        self.load(sub, take(DT, rows, WELL_KEYS), take(DT2, rows, DT2))
+        sub.solve()
+        if sub.N != stage.N or not np.array_equal(sub.nodes, stage.nodes):
+            return False
+
+        for name in stage.RESULTS:
+            if name == "nodes":
+                continue
+            value = np.array(getattr(stage, name))
+            value[rows] = getattr(sub, name)
+            setattr(stage, name, value)
+        return True
+
+    def run(self, config):
+
+        # Расчёт системы с новыми исходными данными, пересчитываются только блоки
+        # и скважины, зависящие от изменённых параметров
+        DT = load_data(config)
+        state = {key: content(value) for key, value in DT.items()}
+        n = len(DT["Hskv"])
+
+        rows = {}
+        self.solved = {}
+        for cls in STAGES:
+
+            # Затронутые скважины: по своим исходным данным и по предыдущим блокам
+            if self.DT is None:
+                changed = None
+            else:
+                changed = changed_rows(self.state, state, cls.KEYS, n)
+                for dep in self.graph[cls]:
+                    if changed is None or rows[dep] is None:
+                        changed = None
+                    else:
+                        changed |= rows[dep]
+            rows[cls] = changed
+
+            if changed is not None and not changed:
+                continue
+            if changed is not None and cls in ROW_STAGES and self.spliceable(cls):
+                if self.splice(cls, DT, sorted(changed)):
+                    self.solved[NAMES[cls]] = sorted(changed)
+                    continue
+            self.solve(cls, DT)
+            self.solved[NAMES[cls]] = None
+
+        self.DT = dict(DT)
+        self.state = state
+        return SystemResult(*(self.stages[cls] for cls in STAGES))
+
+
+if __name__ == "__main__":
+
+    IN = Incremental()
+    IN.run(r"Project_HGD\Data_HGD_input.toml")
+    print("Пересчитаны блоки:", IN.solved)
+
+    DT = dict(IN.DT, LTrO=IN.DT["LTrO"] * 1.1)
+    RS = IN.run(DT)
+    print("Изменена длина общего трубопровода, пересчитаны блоки:", IN.solved)
+
+    DT = dict(DT, Hskv=list(DT["Hskv"]))
+    DT["Hskv"][1] += 100
+    RS = IN.run(DT)
+    print("Изменена глубина скважины №2, пересчитаны блоки:", IN.solved)
+    print("Давление на выходе общего трубопровода, Па:", RS.P)
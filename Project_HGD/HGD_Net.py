@@ -0,0 +1,295 @@
+# Модуль расчёта сети сбора: скважины - трубопроводы от скважин - узлы сбора -
+# трубопроводы между узлами - выход сети.
+#
+# Сеть задаётся в Data_HGD_input: netWells - узел сбора, в который приходит трубопровод
+# от каждой скважины, netTo - узел, в который выходит трубопровод из каждого узла сбора
+# (-1 - выход сети), netL - длины этих трубопроводов, Pout - давление на выходе сети.
+# Из каждого узла выходит один трубопровод (сеть - дерево), поэтому расход по каждому
+# трубопроводу - сумма дебитов скважин выше по течению. Без ключей net* сеть - три
+# скважины, один узел и общий трубопровод длиной LTrO.
+#
+# Неизвестные - забойные давления скважин Pc и давления в узлах сбора Pj, уравнения -
+# совпадение давления в конце каждого трубопровода с давлением в узле, куда он выходит.
+# Система решается методом Ньютона с разреженной матрицей Якоби: производные по
+# забойному давлению и по давлению и расходу на входе трубопровода вычисляются
+# приращениями, строками тех же векторных блоков, за один расчёт на итерацию.
+# Температура в узлах (смешение потоков) в матрицу Якоби не входит и уточняется
+# от итерации к итерации.
+
+import numpy as np
+
+from .HGD_Ensemble import WELL_KEYS
+from .HGD_Graph import take
+from .HGD_Pl import Plast
+from .HGD_Skv import SKV
+from .HGD_Store import load_data
+from .HGD_Tr123 import Tr123
+
+# Разреженные матрицы scipy, если он установлен; без него - плотная матрица numpy
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    csr_matrix = None
+
+
+class Network:
+    def __init__(self):
+
+        # Точность расчёта скважин с переменным шагом и быстрого расчёта трубопроводов
+        self.rk = 1e-6
+        self.fast = 1e-4
+        # Допустимая невязка давлений, Па, и наибольшее число итераций Ньютона
+        self.tol = 1.0
+        self.maxiter = 50
+        # Относительные приращения давления и расхода для производных
+        self.eps = 1e-5
+
+    def load(self, filepath):
+
+        # Подключение и интерпретация файла данных Data_HGD_input.toml
+        self.DT = load_data(filepath)
+        self.n = len(self.DT["Hskv"])
+
+        # Узлы сбора скважин, узлы выхода трубопроводов из узлов и их длины
+        self.wells = np.asarray(self.DT.get("netWells", [0] * self.n), dtype=int)
+        self.to = np.asarray(self.DT.get("netTo", [-1]), dtype=int)
+        self.L = np.asarray(self.DT.get("netL", [self.DT["LTrO"]]), dtype=float)
+        self.J = len(self.to)
+        self.Pout = self.DT["Pout"]
+
+        self.topology()
+
+    def topology(self):
+
+        # Сеть - дерево с одним выходом: номера узлов в пределах 0..J-1, один узел
+        # выходит на выход сети (-1), из каждого узла выход достигается не более чем
+        # через J трубопроводов (иначе в сети цикл)
+        if np.any((self.to < -1) | (self.to >= self.J)) or np.any(
+            (self.wells < 0) | (self.wells >= self.J)
+        ):
+            raise ValueError("Номера узлов сети вне диапазона 0 - %d" % (self.J - 1))
+        if np.count_nonzero(self.to == -1) != 1:
+            raise ValueError(
+                "У сети должен быть один выход (netTo = -1), задано: %d"
+                % np.count_nonzero(self.to == -1)
+            )
+        for j in range(self.J):
+            k = j
+            for _ in range(self.J):
+                k = self.to[k]
+                if k < 0:
+                    break
+            if k >= 0:
+                raise ValueError("Сеть содержит цикл, узел %d не выходит на выход" % j)
+
+        # Уровни узлов: узлы, в которые не входят другие трубопроводы, - уровень 0,
+        # трубопроводы одного уровня рассчитываются одновременно
+        level = np.zeros(self.J, dtype=int)
+        for _ in range(self.J):
+            for j in range(self.J):
+                if self.to[j] >= 0:
+                    level[self.to[j]] = max(level[self.to[j]], level[j] + 1)
+        self.levels = [np.flatnonzero(level == k) for k in range(level.max() + 1)]
+
+        # Скважины выше по течению каждого узла (матрица узел x скважина)
+        self.upstream = np.zeros((self.J, self.n), dtype=bool)
+        for i in range(self.n):
+            j = self.wells[i]
+            while j >= 0:
+                self.upstream[j, i] = True
+                j = self.to[j]
+
+    def well_rows(self, Pc):
+
+        # Скважины и трубопроводы от них: строки с давлениями Pc и Pc + dP,
+        # возвращает давление, расход, температуру в конце трубопровода и производные
+        n = self.n
+        dP = self.eps * Pc
+        DT = take(self.DT, np.tile(np.arange(n), 2), WELL_KEYS)
+        DT["Pc"] = np.concatenate([Pc, Pc + dP])
+
+        PL = Plast()
+        PL.verbose = False
+        PL.load(DT)
+        PL.solve()
+
+        SK = SKV()
+        SK.output = "end"
+        SK.rk = self.rk
+        SK.load(DT, {"Qpl": PL.Q})
+        SK.solve()
+
+        TR = self.pipe()
+        TR.load(
+            DT,
+            {
+                "Qpl": PL.Q,
+                "Pskv": SK.P1[:, -1:],
+                "Gskv": SK.G1[:, -1:],
+                "Tskv": SK.T1[:, -1:],
+            },
+        )
+        TR.solve()
+
+        P, G, T = TR.P1[:, -1], TR.G1[:, -1], TR.T1[:, -1]
+        self.Q = PL.Q[:n]
+        return P[:n], G[:n], T[:n], (P[n:] - P[:n]) / dP, (G[n:] - G[:n]) / dP
+
+    def pipe(self):
+
+        # Трубопровод - блок Tr123, строки которого - отдельные трубопроводы
+        TR = Tr123()
+        TR.output = "end"
+        TR.fast = self.fast
+        TR.rk = self.rk if self.fast is None else None
+        return TR
+
+    def pipe_rows(self, L, P0, G, T0):
+
+        # Трубопроводы из узлов сбора: строки с исходными P0, G, с P0 + dP и с G + dG,
+        # возвращает давление и температуру в конце и производные давления по P0 и G
+        m = len(L)
+        dP = self.eps * P0
+        dG = self.eps * G
+        DT = dict(self.DT)
+        DT["L"] = np.tile(L, 3)
+        # Вход из трубопровода того же диаметра
+        DT["rc"] = np.full(3 * m, self.DT["Dt"] / 2)
+
+        TR = self.pipe()
+        G3 = np.concatenate([G, G, G + dG])
+        TR.load(
+            DT,
+            {
+                "Qpl": np.zeros(3 * m),
+                "Pskv": np.concatenate([P0, P0 + dP, P0])[:, None],
+                "Gskv": G3[:, None],
+                "Tskv": np.tile(T0, 3)[:, None],
+            },
+        )
+        TR.solve()
+
+        P, T = TR.P1[:, -1], TR.T1[:, -1]
+        return P[:m], T[:m], (P[m : 2 * m] - P[:m]) / dP, (P[2 * m :] - P[:m]) / dG
+
+    def residual(self, Pc, Pj):
+
+        # Невязки давлений и элементы матрицы Якоби (строка, столбец, значение).
+        # Неизвестные: Pc скважин (0..n-1), затем Pj узлов (n..n+J-1)
+        n, J = self.n, self.J
+        Pw, Gw, Tw, dPw, dGw = self.well_rows(Pc)
+
+        # Расход и температура на входе трубопроводов из узлов: смешение потоков
+        self.Gj = self.upstream @ Gw
+        H = np.zeros(J)
+        for j in range(J):
+            H[j] = (Gw * Tw)[self.wells == j].sum()
+
+        r = np.zeros(n + J)
+        rows = [np.arange(n), np.arange(n)]
+        cols = [np.arange(n), n + self.wells]
+        vals = [dPw, -np.ones(n)]
+
+        # Трубопроводы от скважин выходят в свои узлы
+        r[:n] = Pw - Pj[self.wells]
+
+        self.Pe = np.zeros(J)
+        self.Tj = np.zeros(J)
+        self.Te = np.zeros(J)
+        for level in self.levels:
+            self.Tj[level] = H[level] / self.Gj[level]
+            Pe, Te, dPe, dGe = self.pipe_rows(
+                self.L[level], Pj[level], self.Gj[level], self.Tj[level]
+            )
+            self.Pe[level] = Pe
+            self.Te[level] = Te
+
+            for k, j in enumerate(level):
+                down = self.to[j]
+                if down >= 0:
+                    H[down] += self.Gj[j] * Te[k]
+                    r[n + j] = Pe[k] - Pj[down]
+                    rows.append([n + j])
+                    cols.append([n + down])
+                    vals.append([-1.0])
+                else:
+                    r[n + j] = Pe[k] - self.Pout
+
+                # Давление в конце зависит от давления в узле и от расхода, то есть
+                # от забойных давлений всех скважин выше по течению
+                up = np.flatnonzero(self.upstream[j])
+                rows.append(np.full(len(up) + 1, n + j))
+                cols.append(np.concatenate([[n + j], up]))
+                vals.append(np.concatenate([[dPe[k]], dGe[k] * dGw[up]]))
+
+        self.Pw, self.Gw, self.Tw = Pw, Gw, Tw
+        jac = (np.concatenate(rows), np.concatenate(cols), np.concatenate(vals))
+        return r, jac
+
+    def step(self, r, jac):
+
+        # Решение J * dx = -r с разреженной или плотной матрицей Якоби
+        size = len(r)
+        rows, cols, vals = jac
+        if csr_matrix is not None:
+            return spsolve(csr_matrix((vals, (rows, cols)), shape=(size, size)), -r)
+        A = np.zeros((size, size))
+        np.add.at(A, (rows, cols), vals)
+        return np.linalg.solve(A, -r)
+
+    def solve(self):
+
+        # Начальное приближение: забойные давления из исходных данных, давления
+        # в узлах - давление на выходе сети
+        n = self.n
+        Pk = np.asarray(self.DT["Pk"], dtype=float)
+        x = np.concatenate(
+            [np.asarray(self.DT["Pc"], dtype=float), np.full(self.J, float(self.Pout))]
+        )
+
+        self.history = []
+        r, jac = self.residual(x[:n], x[n:])
+        for it in range(self.maxiter + 1):
+            self.history.append(float(np.max(np.abs(r))))
+            if self.history[-1] <= self.tol or it == self.maxiter:
+                break
+
+            # Шаг Ньютона с дроблением, пока невязка не уменьшится; забойное давление
+            # остаётся ниже пластового, чтобы дебит был положительным
+            dx = self.step(r, jac)
+            for _ in range(10):
+                x1 = x + dx
+                x1[:n] = np.minimum(x1[:n], Pk * (1 - 1e-3))
+                r1, jac1 = self.residual(x1[:n], x1[n:])
+                if np.max(np.abs(r1)) < self.history[-1]:
+                    break
+                dx /= 2
+            x, r, jac = x1, r1, jac1
+
+        self.iterations = len(self.history) - 1
+        self.Pc = x[:n]
+        self.Pj = x[n:]
+        self.converged = self.history[-1] <= self.tol
+
+        # Величины на выходе сети
+        out = np.flatnonzero(self.to < 0)
+        self.G = float(self.Gj[out].sum())
+        self.P = float(self.Pout)
+        self.T = float((self.Gj[out] * self.Te[out]).sum() / self.G)
+
+    def summary(self):
+
+        return {"Q": float(self.Q.sum()), "G": self.G, "P": self.P, "T": self.T}
+
+
+if __name__ == "__main__":
+
+    NET = Network()
+    NET.load(r"Project_HGD\Data_HGD_input.toml")
+    NET.solve()
+
+    print("Итераций Ньютона:", NET.iterations, "невязки, Па:", NET.history)
+    print("Забойные давления скважин, Па:", NET.Pc)
+    print("Давления в узлах сбора, Па:", NET.Pj)
+    print("Расход, давление и температура на выходе сети:", NET.summary())
@@ -0,0 +1,193 @@
+# Модуль распределения добычи: подбор забойных давлений Pc скважин (положений штуцеров),
+# при которых суммарный расход на выходе общего трубопровода наибольший.
+#
+# Ограничения: давление в конце каждого трубопровода от скважины не ниже давления
+# в узле сбора Pcol (иначе скважина не подаёт нефть в общий трубопровод), температура на
+# выходе общего трубопровода не ниже температуры застывания парафина Twax и, по желанию,
+# давление на выходе не ниже Pmin.
+#
+# Расход каждой скважины растёт при снижении Pc, а давление в конце её трубопровода от
+# других скважин не зависит. Поэтому сначала все скважины одновременно подбираются методом
+# секущих на границу Pcol. Если при этом нарушено ограничение на выходе, скважины по одной
+# прикрываются: выбирается скважина с наибольшим приростом ограничиваемой величины на
+# единицу потерянного расхода (производные - одним пакетом вариантов), для неё пакетом
+# рассчитываются несколько значений Pc и затем уточняется граница ограничения.
+#
+# Все точки рассчитываются ансамблем (модуль HGD_Ensemble): пакет вариантов - один
+# векторный проход цепочки. Рассчитанные точки запоминаются.
+
+import numpy as np
+
+from .HGD_Ensemble import Ensemble
+from .HGD_Shoot import secant
+from .HGD_Store import load_data
+
+
+class Allocation:
+    def __init__(self):
+
+        # Точность расчёта с переменным шагом и быстрого расчёта трубопроводов
+        self.rk = 1e-6
+        self.fast = 1e-4
+        # Давление в узле сбора (в начале общего трубопровода, как в HGD_TrO), Па
+        self.Pcol = 4.2e6
+        # Температура застывания парафина, К, и наименьшее давление на выходе, Па
+        self.Twax = 303.0
+        self.Pmin = None
+        # Допустимые нарушения ограничений по давлению, Па, и температуре, К
+        self.tol = 1.0
+        self.Ttol = 1e-3
+        # Число значений Pc в пакете при прикрытии скважины, наибольшее число шагов
+        self.batch = 8
+        self.maxiter = 50
+
+    def load(self, filepath):
+
+        # Подключение и интерпретация файла данных Data_HGD_input.toml
+        self.DT = load_data(filepath)
+        self.n = len(self.DT["Hskv"])
+        self.Pk = np.asarray(self.DT["Pk"], dtype=float)
+
+        # Пределы забойных давлений: дебит скважины положителен
+        self.lo = np.zeros(self.n)
+        self.hi = self.Pk * (1 - 1e-3)
+
+        # Запомненные точки, число пакетов и рассчитанных вариантов
+        self.memo = {}
+        self.runs = 0
+        self.evals = 0
+
+    def evaluate(self, X):
+
+        # Расход, давление и температура на выходе общего трубопровода и давления в конце
+        # трубопроводов от скважин для вариантов X (вариант x скважина). Новые варианты
+        # рассчитываются одним ансамблем
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        new = {}
+        for x in X:
+            if x.tobytes() not in self.memo:
+                new[x.tobytes()] = x
+
+        if new:
+            EN = Ensemble()
+            EN.rk = self.rk
+            EN.fast = self.fast
+            EN.load(self.DT)
+            EN.set({"Pc": np.array(list(new.values()))})
+            EN.solve()
+            for m, key in enumerate(new):
+                self.memo[key] = (EN.G[m], EN.P[m], EN.T[m], EN.Ptr[m])
+            self.runs += 1
+            self.evals += len(new)
+
+        rows = [self.memo[x.tobytes()] for x in X]
+        return {
+            "G": np.array([row[0] for row in rows]),
+            "P": np.array([row[1] for row in rows]),
+            "T": np.array([row[2] for row in rows]),
+            "Ptr": np.array([row[3] for row in rows]),
+        }
+
+    def constraints(self):
+
+        # Ограничения на выходе общего трубопровода: величина, нижняя граница, допуск
+        rows = [("T", self.Twax, self.Ttol)]
+        if self.Pmin is not None:
+            rows.append(("P", self.Pmin, self.tol))
+        return rows
+
+    def solve(self):
+
+        # Все скважины - на границу давления в узле сбора
+        def arrival(Pc):
+            return self.evaluate(Pc)["Ptr"][0] - self.Pcol
+
+        x = np.asarray(self.DT["Pc"], dtype=float)
+        x, _, _ = secant(arrival, x, self.lo, self.hi, self.tol, 1.0, self.maxiter)
+        x = np.maximum(x, self.lo)
+
+        for self.iterations in range(self.maxiter):
+
+            # Наиболее нарушенное ограничение на выходе
+            e = self.evaluate(x)
+            slack = [
+                (e[name][0] - bound) / tol for name, bound, tol in self.constraints()
+            ]
+            k = int(np.argmin(slack))
+            if slack[k] >= -1:
+                break
+            name, bound, tol = self.constraints()[k]
+
+            # Производные расхода и ограничиваемой величины по Pc скважин - одним пакетом
+            h = 1e-4 * np.maximum(x, 1e5)
+            h = np.where(x + h <= self.hi, h, -h)
+            E = self.evaluate(x + np.diag(h))
+            dG = (E["G"] - e["G"][0]) / h
+            dc = (E[name] - e[name][0]) / h
+
+            # Скважина с наибольшим приростом величины на единицу потерянного расхода
+            ok = (x < self.hi) & (dc > 0)
+            if not ok.any():
+                break
+            i = int(np.argmax(np.where(ok, dc / np.maximum(-dG, 1e-12), -np.inf)))
+
+            # Пакет значений Pc этой скважины до верхнего предела
+            grid = x[i] + (self.hi[i] - x[i]) * np.linspace(0, 1, self.batch + 1)[1:]
+            X = np.repeat(x[None], self.batch, axis=0)
+            X[:, i] = grid
+            s = self.evaluate(X)[name] - bound
+            feasible = np.flatnonzero(s >= 0)
+            if len(feasible) == 0:
+                x[i] = self.hi[i]
+                continue
+
+            # Уточнение границы ограничения между соседними значениями пакета
+            j = feasible[0]
+            a = x[i] if j == 0 else grid[j - 1]
+            sa = e[name][0] - bound if j == 0 else s[j - 1]
+
+            def line(v):
+                y = x.copy()
+                y[i] = v[0]
+                return self.evaluate(y)[name] - bound
+
+            slope = (s[j] - sa) / (grid[j] - a)
+            v, _, _ = secant(line, [grid[j]], a, grid[j], tol, slope, self.maxiter)
+            x[i] = v[0]
+
+        e = self.evaluate(x)
+        self.Pc = x
+        self.G = float(e["G"][0])
+        self.P = float(e["P"][0])
+        self.T = float(e["T"][0])
+        self.Ptr = e["Ptr"][0]
+
+        # Скважины, не достигающие давления узла сбора и при наибольшем Pc, - закрыты
+        self.shut = (x >= self.hi) & (self.Ptr < self.Pcol - self.tol)
+        self.feasible = bool(
+            np.all((self.Ptr >= self.Pcol - self.tol) | self.shut)
+            and all(
+                e[name][0] >= bound - tol for name, bound, tol in self.constraints()
+            )
+        )
+        return self.Pc
+
+
+if __name__ == "__main__":
+
+    AL = Allocation()
+    AL.load(r"Project_HGD\Data_HGD_input.toml")
+    AL.solve()
+
+    print("Забойные давления скважин, Па:", AL.Pc)
+    print("Давления в конце трубопроводов от скважин, Па:", AL.Ptr)
+    print("Расход, давление и температура на выходе:", AL.G, AL.P, AL.T)
+    print("Закрытые скважины:", np.flatnonzero(AL.shut) + 1)
+    print(
+        "Ограничения выполнены:",
+        AL.feasible,
+        "пакетов:",
+        AL.runs,
+        "вариантов:",
+        AL.evals,
+    )
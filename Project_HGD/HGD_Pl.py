@@ -1,24 +1,105 @@
-# Модуль рассчёта пласта, последовательный рассчёт сразу трёх пластов.
+# Модуль рассчёта пласта, векторный рассчёт сразу всех пластов.
 
 # Для построения графиков и их исследований
 import matplotlib.pyplot as plt
 
-# Востребователен для натуральных логарифмов и квадратных корней
-import math
+# Векторные вычисления сразу по всем пластам и узлам сетки
+import numpy as np
 
-# Нужен для подгрузки данных, таких как  P, T, po и т.д. из готового файла
-import toml
+from .HGD_Prof import instrument
+from .HGD_Store import dump_data, load_data
 
+# Цвета графиков по номеру пласта
+COLORS = ["orange", "green", "blue"]
 
+
+class ProfilePl:
+    def __init__(self, h, k, Pc, Pk, rc, rk, muN, pi):
+
+        # Параметры пластов в виде столбцов, чтобы формулы транслировались по радиусам
+        self.h = np.asarray(h, dtype=float).reshape(-1, 1)
+        self.k = np.asarray(k, dtype=float).reshape(-1, 1)
+        self.Pc = np.asarray(Pc, dtype=float).reshape(-1, 1)
+        self.Pk = np.asarray(Pk, dtype=float).reshape(-1, 1)
+        self.rc = np.asarray(rc, dtype=float).reshape(-1, 1)
+        self.rk = np.asarray(rk, dtype=float).reshape(-1, 1)
+        self.muN = np.asarray(muN, dtype=float).reshape(-1, 1)
+        self.pi = np.asarray(pi, dtype=float).reshape(-1, 1)
+        self.n = self.h.shape[0]
+
+        # Логарифм отношения радиусов, общий для всех формул
+        self.lnR = np.log(self.rk / self.rc)
+
+        # Формула Дюпюи, расход объемный
+        self.Q = (
+            (2 * self.pi * self.h * self.k * (self.Pk - self.Pc))
+            / (self.muN * self.lnR)
+        )[:, 0]
+
+    def radii(self, r):
+
+        # Общий для всех пластов набор радиусов (m,) или свой для каждого пласта (n, m)
+        r = np.asarray(r, dtype=float)
+        if r.ndim < 2:
+            r = r.reshape(1, -1)
+        return r
+
+    def P(self, r):
+
+        # Распределение давления в пласте
+        r = self.radii(r)
+        return self.Pk - ((self.Pk - self.Pc) / self.lnR) * np.log(self.rk / r)
+
+    def wr(self, r):
+
+        # Распределение скоростей фильтрации
+        r = self.radii(r)
+        return (self.k * (self.Pc - self.Pk)) / (self.muN * self.lnR * r)
+
+    def grid(self, N, mode="uniform", q=5000.0):
+
+        j = np.arange(N + 1)
+
+        # Логарифмическая сетка: узлы равномерны по ln(r), сгущаются к стенке скважины
+        if mode == "log":
+            return self.rc * (self.rk / self.rc) ** (j / N)
+
+        # Геометрическое сгущение к скважине: последний шаг в q раз длиннее первого,
+        # каждый следующий шаг длиннее предыдущего в q**(1 / (N - 1)) раз. Форма сетки
+        # от N не зависит, с ростом N все шаги уменьшаются; expm1 - без переполнения
+        if mode == "geom":
+            if q == 1:
+                return self.rc + (self.rk - self.rc) * (j / N)
+            lnq = np.log(q) / max(N - 1, 1)
+            return self.rc + (self.rk - self.rc) * np.expm1(j * lnq) / np.expm1(N * lnq)
+
+        # Равномерная сетка по радиусу, первый узел совпадает со стенкой скважины
+        if mode == "uniform":
+            r = (self.rk / N) * j
+            r[:, 0] = self.rc[:, 0]
+            return r
+
+        raise ValueError("Неизвестный тип сетки пласта: %s" % mode)
+
+
+@instrument
 class Plast:
+    # Исходные данные, от которых зависит дебит (ключ кэша результатов)
+    KEYS = ("h", "k", "Pc", "Pk", "muN0", "rc", "rk", "alphav", "pi")
+    # Пласт - первый блок системы: результатов предыдущих блоков он не читает,
+    # дебит передаётся последующим блокам из атрибута Q
+    INPUTS = ()
+    OUTPUTS = {"Qpl": "Q"}
+
     def __init__(self):
 
-        pass
+        # Печать дебитов после расчёта
+        self.verbose = True
 
     def load(self, filepath):
 
         # Подключение и интерпретация файла данных Data_HGD_input.toml
-        self.DT = toml.load(filepath)
+        self.DT = load_data(filepath)
 
         # Блок ввода исходных параметров системы.
 
@@ -42,64 +123,49 @@ class Plast:
         self.alphav = self.DT["alphav"]
         # Число пи
         self.pi = self.DT["pi"]
+        # Тип сетки по радиусу: uniform, log или geom
+        self.grid1 = self.DT.get("grid1", "uniform")
+        # Отношение длины последнего шага геометрической сетки к первому
+        self.q1 = self.DT.get("q1", 5000.0)
 
-    def dump(self, filepath):
+    def dump(self, filepath, profiles=False):
 
-        self.DT2 = {"Ppl": self.P, "Qpl": self.Q}
+        # Последующим блокам нужен только дебит, профили давления выгружаются по запросу
+        self.DT2 = {"Qpl": self.Q}
+        if profiles:
+            self.grid()
+            self.DT2["Ppl"] = self.P
 
-        with open(filepath, "w") as io:
-            toml.dump(self.DT2, io)
+        dump_data(filepath, self.DT2)
 
     def solve(self):
 
-        # Задание списков физических параметров для системы пласта
-        self.P = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.wr = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.r = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.Q = [0 for _ in range(3)]
-
         # Формула Эйнштейна для вязкости эмульсии
-        muN = self.muN0 * (1 + 2.5 * self.alphav)
+        muN = self.muN0 * (1 + 2.5 * np.asarray(self.alphav))
 
-        # Формула Дюпюи, расход объемный
-        for i in range(3):
-            self.Q[i] = (
-                2 * self.pi * self.h[i] * self.k[i] * (self.Pk[i] - self.Pc[i])
-            ) / (muN * math.log(self.rk[i] / self.rc[i]))
-
-            for j in range(0, self.N + 1):
-                # Увеличение радиуса с каждой итерацией
-                if j == 0:
-                    self.r[i][j] = self.rc[i]
-                else:
-                    self.r[i][j] = (self.rk[i] / self.N) * j
-
-                # Распределение давления в пласте
-                self.P[i][j] = self.Pk[i] - (
-                    ((self.Pk[i] - self.Pc[i]) / math.log(self.rk[i] / self.rc[i]))
-                    * math.log(self.rk[i] / self.r[i][j])
-                )
-
-                # Распределение скоростей фильтрации
-                self.wr[i][j] = (self.k[i] * (self.Pc[i] - self.Pk[i])) / (
-                    muN * math.log(self.rk[i] / self.rc[i]) * self.r[i][j]
-                )
-
-        print(
-            "Суммарный дебит, Кг**3/сут:",
-            (self.Q[0] + self.Q[1] + self.Q[2]) * 850 * 60 * 60 * 24,
+        # Аналитический профиль пласта, количество пластов берётся из длины h, k, Pc
+        self.profile = ProfilePl(
+            self.h, self.k, self.Pc, self.Pk, self.rc, self.rk, muN, self.pi
         )
-        print("Дебит с 1 скважины, Кг**3/с:", self.Q[0] * 850)
-        print("Дебит со 2 скважины, Кг**3/с:", self.Q[1] * 850)
-        print("Дебит с 3 скважины, Кг**3/с:", self.Q[2] * 850)
+        self.n = self.profile.n
+        self.Q = self.profile.Q
+
+        if self.verbose:
+            print("Суммарный дебит, Кг**3/сут:", self.Q.sum() * 850 * 60 * 60 * 24)
+            for i in range(self.n):
+                print("Дебит со скважины №%d, Кг**3/с:" % (i + 1), self.Q[i] * 850)
+
+    def grid(self):
+
+        # Сетка и профили строятся только при построении графиков или выгрузке
+        self.r = self.profile.grid(self.N, self.grid1, self.q1)
+        self.P = self.profile.P(self.r)
+        self.wr = self.profile.wr(self.r)
 
     def plot(self):
 
         # Построение графиков
-
-        self.P[0] = [self.P[0][_] / 1e6 for _ in range(0, self.N + 1)]
-        self.P[1] = [self.P[1][_] / 1e6 for _ in range(0, self.N + 1)]
-        self.P[2] = [self.P[2][_] / 1e6 for _ in range(0, self.N + 1)]
+        self.grid()
 
         plt.figure(1)
         # заголовок
@@ -110,10 +176,9 @@ class Plast:
         plt.ylabel("Давление, МПа", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.r[0], self.P[0], c="orange", linewidth=2)
-        plt.plot(self.r[1], self.P[1], c="green", linewidth=2)
-        plt.plot(self.r[2], self.P[2], c="blue", linewidth=2)
-        plt.legend(["Пласт №1", "Пласт №2", "Пласт №3"])
+        for i in range(self.n):
+            plt.plot(self.r[i], self.P[i] / 1e6, c=COLORS[i % 3], linewidth=2)
+        plt.legend(["Пласт №%d" % (i + 1) for i in range(self.n)])
         plt.show()
 
 
@@ -122,7 +187,7 @@ if __name__ == "__main__":
     PL = Plast()
     PL.load(r"Project_HGD\Data_HGD_input.toml")
     PL.solve()
-    PL.dump(r"Project_HGD\Data_HGD_output.toml")
+    PL.dump(r"Project_HGD\Data_HGD_output")
     PL.plot()
 
     print(PL)
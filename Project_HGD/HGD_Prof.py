@@ -0,0 +1,188 @@
+# Модуль замеров времени по этапам расчётных блоков Plast, SKV, Tr123 и TrO.
+#
+# Методы load, solve, dump и plot блоков обёрнуты декоратором instrument. Пока замеры
+# выключены (PROFILER.active = False), обёртка только проверяет этот признак. Включённый
+# профилировщик на каждый вызов записывает: блок, этап, время, число строк (скважин,
+# трубопроводов, сценариев), число сохранённых сечений, число шагов и шагов строк в
+# секунду (для solve), объём массивов блока после этапа, а с memory=True - и пик
+# выделенной памяти за этап (tracemalloc). Записи выгружаются строками JSON (JSON lines)
+# и дописываются в файл, чтобы сравнивать замеры разных версий.
+
+import argparse
+import contextlib
+import datetime
+import functools
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from . import __version__
+
+# Обёртываемые методы блоков - этапы расчёта
+PHASES = ("load", "solve", "dump", "plot")
+
+
+class Profiler:
+    def __init__(self):
+
+        # Замеры выключены; с memory=True - замер пика памяти (замедляет расчёт)
+        self.active = False
+        self.memory = False
+        self.records = []
+
+    def enable(self, memory=False):
+
+        self.active = True
+        self.memory = memory
+
+    def disable(self):
+
+        self.active = False
+
+    def clear(self):
+
+        self.records = []
+
+    @contextlib.contextmanager
+    def phase(self, stage, name):
+
+        # Замер одного этапа блока stage
+        if self.memory:
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            record = {"stage": type(stage).__name__, "phase": name, "time": elapsed}
+            if self.memory:
+                record["peak"] = tracemalloc.get_traced_memory()[1] - base
+                if not tracing:
+                    tracemalloc.stop()
+            record.update(measure(stage, name, elapsed))
+            self.records.append(record)
+
+    def write(self, filepath, **meta):
+
+        # Дописывание записей в файл JSON lines; в каждой записи - версия пакета,
+        # время замера и дополнительные поля meta (например, метка сборки)
+        stamp = datetime.datetime.now().isoformat(timespec="seconds")
+        with open(filepath, "a") as io:
+            for record in self.records:
+                row = dict(version=__version__, stamp=stamp, **meta)
+                row.update(record)
+                io.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def summary(self):
+
+        # Суммарное время и число вызовов по парам (блок, этап)
+        rows = {}
+        for record in self.records:
+            key = (record["stage"], record["phase"])
+            total, calls = rows.get(key, (0.0, 0))
+            rows[key] = (total + record["time"], calls + 1)
+        return rows
+
+
+def measure(stage, name, elapsed):
+
+    # Размеры рассчитанного блока: строки, сечения, шаги и объём массивов
+    rows = getattr(stage, "m", getattr(stage, "n", None))
+    record = {"rows": rows}
+    nodes = getattr(stage, "nodes", None)
+    if nodes is not None:
+        record["nodes"] = len(nodes)
+
+    if name == "solve":
+        # Шаги: принятые шаги с переменным шагом, участки быстрого расчёта или N
+        # сечений; пласт без профилей по сечениям рассчитывается формулой за один шаг
+        stats = getattr(stage, "stats", None) or {}
+        steps = stats.get("steps", stats.get("segments", getattr(stage, "N", 1)))
+        if nodes is None:
+            steps = 1
+        record["steps"] = int(steps)
+        if rows and elapsed > 0:
+            record["rate"] = steps * rows / elapsed
+
+    record["bytes"] = int(
+        sum(
+            value.nbytes
+            for value in vars(stage).values()
+            if isinstance(value, np.ndarray) and not isinstance(value, np.memmap)
+        )
+    )
+    return record
+
+
+# Общий профилировщик всех блоков
+PROFILER = Profiler()
+
+
+def instrument(cls):
+
+    # Декоратор класса блока: замер этапов PHASES. Без включённого профилировщика -
+    # прямой вызов метода
+    for name in PHASES:
+        method = getattr(cls, name, None)
+        if method is not None:
+            setattr(cls, name, timed(method, name))
+    return cls
+
+
+def timed(method, name):
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not PROFILER.active:
+            return method(self, *args, **kwargs)
+        with PROFILER.phase(self, name):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def main(argv=None):
+
+    from .HGD_System import run_system
+
+    parser = argparse.ArgumentParser(
+        prog="python -m Project_HGD.HGD_Prof",
+        description="Замер времени этапов блоков при расчёте всей цепочки.",
+    )
+    parser.add_argument("base", help="файл исходных данных toml")
+    parser.add_argument(
+        "-o", "--output", help="файл JSON lines для дописывания замеров"
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="число расчётов")
+    parser.add_argument("--rk", type=float, help="точность расчёта с переменным шагом")
+    parser.add_argument("--fast", type=float, help="точность быстрого расчёта")
+    parser.add_argument("--memory", action="store_true", help="замер пика памяти")
+    parser.add_argument("--label", default="", help="метка замера (сборка, машина)")
+    args = parser.parse_args(argv)
+
+    PROFILER.enable(args.memory)
+    for _ in range(args.repeat):
+        run_system(args.base, output="end", rk=args.rk, fast=args.fast)
+    PROFILER.disable()
+
+    if args.output:
+        PROFILER.write(args.output, label=args.label)
+
+    print("%8s %6s %8s %12s" % ("блок", "этап", "вызовов", "время, с"), file=sys.stderr)
+    for (stage, phase), (total, calls) in PROFILER.summary().items():
+        print("%8s %6s %8d %12.4f" % (stage, phase, calls, total), file=sys.stderr)
+
+
+if __name__ == "__main__":
+
+    # Блоки обёрнуты профилировщиком модуля пакета, а не копии, запущенной как __main__
+    from . import HGD_Prof
+
+    HGD_Prof.main()
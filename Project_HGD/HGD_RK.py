@@ -0,0 +1,78 @@
+# Модуль интегрирования с переменным шагом: вложенный метод Рунге - Кутты
+# Дормана - Принса 5(4) с оценкой погрешности на каждом шаге.
+#
+# Блоки скважин и трубопроводов записывают свои уравнения как систему ОДУ для давления
+# и температуры по безразмерной координате x = 0..1 (доля длины скважины или трубопровода),
+# поэтому все строки (скважины, трубопроводы, сценарии) интегрируются одним общим шагом.
+# Шаг увеличивается на гладких участках и уменьшается у входа и при смене режима течения.
+
+import numpy as np
+
+# Коэффициенты метода Дормана - Принса
+C = (0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1)
+A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+# Решение 5-го порядка совпадает с последней строкой A, разность с решением
+# 4-го порядка даёт оценку погрешности шага
+E = (
+    71 / 57600,
+    0,
+    -71 / 16695,
+    71 / 1920,
+    -17253 / 339200,
+    22 / 525,
+    -1 / 40,
+)
+
+
+def dopri(f, y0, tol=1e-6, h=0.01, hmin=1e-9):
+
+    # Интегрирование dy/dx = f(x, y) от x = 0 до 1 с относительной погрешностью tol
+    # на шаге. Возвращает узлы x, состояния y в узлах и счётчики шагов и вычислений f
+    x = 0.0
+    y = np.asarray(y0, dtype=float)
+    k1 = f(x, y)
+    stats = {"steps": 0, "rejected": 0, "evals": 1}
+    xs = [x]
+    ys = [y]
+
+    while x < 1:
+        h = min(h, 1 - x)
+
+        k = [k1]
+        for i in range(1, 7):
+            yi = y + h * sum(a * kj for a, kj in zip(A[i], k) if a)
+            k.append(f(x + C[i] * h, yi))
+        stats["evals"] += 6
+
+        # Погрешность шага относительно величины решения, наибольшая по всем строкам
+        err = h * sum(e * kj for e, kj in zip(E, k) if e)
+        err = np.max(np.abs(err) / (tol * np.maximum(np.abs(y), np.abs(yi))))
+
+        if err <= 1 or h <= hmin:
+            x += h
+            y = yi
+            k1 = k[6]
+            xs.append(x)
+            ys.append(y)
+            stats["steps"] += 1
+        else:
+            stats["rejected"] += 1
+
+        # Новый шаг по оценке погрешности, с ограничением роста и уменьшения
+        if not np.isfinite(err):
+            h *= 0.2
+        elif err == 0:
+            h *= 5
+        else:
+            h *= min(5, max(0.2, 0.9 * err**-0.2))
+        h = max(h, hmin)
+
+    return np.array(xs), np.array(ys), stats
@@ -0,0 +1,166 @@
+# Модуль чувствительности величин на выходе общего трубопровода (расход G, давление P,
+# температура T) к исходным данным.
+#
+# Производные вычисляются центральными разностями, но все возмущённые варианты
+# (по два на параметр) рассчитываются одним ансамблем (модуль HGD_Ensemble), то есть
+# одним векторным проходом цепочки, а не 2 x P отдельными расчётами. Строки ансамбля
+# продвигаются общими шагами, поэтому разности не содержат шума от разбиения.
+#
+# Параметры - исходные данные, которые читают блоки (списки KEYS у их классов), кроме
+# чисел шагов разбиения; параметры скважин и трубопроводов от них - отдельно по каждой
+# скважине.
+
+import numpy as np
+
+from .HGD_Ensemble import Ensemble
+from .HGD_Pl import Plast
+from .HGD_Skv import SKV
+from .HGD_Store import load_data
+from .HGD_System import run_system
+from .HGD_Tr123 import Tr123
+from .HGD_TrO import TrO
+
+# Исходные данные, по которым производные не вычисляются: числа шагов и таблица PVT
+EXCLUDE = ("N1", "N2", "N3", "N4", "pvt")
+
+# Величины на выходе общего трубопровода
+OUTPUTS = ("G", "P", "T")
+
+
+def parameters(DT):
+
+    # Параметры (ключ, номер скважины или None) в порядке блоков и их списков KEYS
+    keys = []
+    for cls in (Plast, SKV, Tr123, TrO):
+        for key in cls.KEYS:
+            if key not in keys and key not in EXCLUDE and key in DT:
+                keys.append(key)
+
+    names = []
+    for key in keys:
+        value = np.asarray(DT[key], dtype=float)
+        if value.ndim == 0:
+            names.append((key, None))
+        else:
+            names.extend((key, i) for i in range(len(value)))
+    return keys, names
+
+
+class Sensitivity:
+    def __init__(self):
+
+        # Относительное приращение параметров
+        self.eps = 1e-6
+        # Точность расчёта с переменным шагом и быстрого расчёта трубопроводов
+        self.rk = None
+        self.fast = None
+
+    def load(self, filepath):
+
+        # Подключение и интерпретация файла данных Data_HGD_input.toml
+        self.DT = load_data(filepath)
+        self.keys, self.names = parameters(self.DT)
+
+    def solve(self):
+
+        # Варианты 2p и 2p + 1 - параметр p увеличен и уменьшен на h[p]
+        M = 2 * len(self.names)
+        base = {key: np.asarray(self.DT[key], dtype=float) for key in self.keys}
+        samples = {
+            key: np.repeat(value[None], M, axis=0) for key, value in base.items()
+        }
+        self.h = np.zeros(len(self.names))
+        for p, (key, i) in enumerate(self.names):
+            x = base[key] if i is None else base[key][i]
+            self.h[p] = self.eps * max(abs(x), 1e-12)
+            if i is None:
+                samples[key][2 * p] += self.h[p]
+                samples[key][2 * p + 1] -= self.h[p]
+            else:
+                samples[key][2 * p, i] += self.h[p]
+                samples[key][2 * p + 1, i] -= self.h[p]
+
+        EN = Ensemble()
+        EN.rk = self.rk
+        EN.fast = self.fast
+        EN.load(self.DT)
+        EN.set(samples)
+        out = EN.solve()
+
+        # Матрица производных: строка - величина на выходе, столбец - параметр
+        self.jac = np.array(
+            [(out[name][0::2] - out[name][1::2]) / (2 * self.h) for name in OUTPUTS]
+        )
+
+        # Величины на выходе при исходных данных - полусумма вариантов первого параметра
+        self.value = np.array([(out[name][0] + out[name][1]) / 2 for name in OUTPUTS])
+        return self.jac
+
+    def check(self, p):
+
+        # Проверка столбца p матрицы производных отдельными расчётами цепочки с
+        # параметром, увеличенным и уменьшенным на h[p]. Возвращает производные
+        # ансамбля, отдельных расчётов и наибольшее относительное расхождение
+        key, i = self.names[p]
+        out = []
+        for sign in (1, -1):
+            value = np.array(self.DT[key], dtype=float)
+            if i is None:
+                value = value + sign * self.h[p]
+            else:
+                value[i] += sign * self.h[p]
+            RS = run_system(
+                dict(self.DT, **{key: value.tolist()}),
+                output="end",
+                rk=self.rk,
+                fast=self.fast,
+            )
+            out.append(np.array([getattr(RS, name) for name in OUTPUTS]))
+
+        # Расхождение - относительно производной; для нулевых производных - относительно
+        # изменения величины на 1e-9 её значения при приращении h[p]
+        separate = (out[0] - out[1]) / (2 * self.h[p])
+        scale = np.maximum(np.abs(separate), np.abs(self.value) * 1e-9 / self.h[p])
+        return (
+            self.jac[:, p],
+            separate,
+            float(np.max(np.abs(self.jac[:, p] - separate) / scale)),
+        )
+
+    def elasticity(self):
+
+        # Относительная чувствительность: изменение величины в долях на долю
+        # изменения параметра, для сравнения параметров разной размерности
+        x = np.array(
+            [self.DT[key] if i is None else self.DT[key][i] for key, i in self.names],
+            dtype=float,
+        )
+        return self.jac * x / self.value[:, None]
+
+    def rank(self, output="P", top=10):
+
+        # Параметры, сильнее всего влияющие на величину output (G, P или T)
+        e = self.elasticity()[OUTPUTS.index(output)]
+        order = np.argsort(-np.abs(e))[:top]
+        return [
+            (self.names[p], e[p], self.jac[OUTPUTS.index(output), p]) for p in order
+        ]
+
+
+if __name__ == "__main__":
+
+    SE = Sensitivity()
+    SE.load(r"Project_HGD\Data_HGD_input.toml")
+    SE.solve()
+
+    # Проверка отдельными расчётами цепочки: пи и проницаемость первого пласта
+    for key, i in (("pi", None), ("k", 0)):
+        jac, separate, error = SE.check(SE.names.index((key, i)))
+        name = key if i is None else "%s[%d]" % (key, i)
+        print("Проверка %s: ансамбль" % name, jac, "отдельно", separate, error)
+
+    for output in OUTPUTS:
+        print("Наиболее влияющие на %s параметры (эластичность, производная):" % output)
+        for (key, i), e, d in SE.rank(output):
+            name = key if i is None else "%s[%d]" % (key, i)
+            print("%12s %14.4g %14.4g" % (name, e, d))
@@ -0,0 +1,203 @@
+# Модуль обратного расчёта (метод стрельбы): подбор забойных давлений Pc скважин,
+# при которых цепочка даёт заданное давление на устье скважин или на выходе общего
+# трубопровода.
+#
+# Для давления на устье уравнения скважин независимы: все скважины подбираются
+# одновременно, одним расчётом цепочки на итерацию (строки блоков - скважины). Для
+# давления на выходе общего трубопровода подбирается одна величина - доля депрессии a:
+# Pc = Pk - a * (Pk - Pc0), дебиты скважин меняются в одной пропорции. Общий трубопровод
+# рассчитывается от узла сбора с давлением Pcol (как в HGD_TrO), поэтому решение годно,
+# только если трубопроводы от скважин подают нефть в узел: давление в их конце не ниже
+# Pcol, давление на устье положительно. Иначе converged = False.
+#
+# Корень ищется методом секущих с вилкой: после смены знака невязки шаг секущих, вышедший
+# за вилку, заменяется делением вилки пополам. Расчёты цепочки запоминаются по забойным
+# давлениям, следующий подбор начинается с предыдущего решения и наклона.
+
+import numpy as np
+
+from .HGD_Store import load_data
+from .HGD_System import run_system
+
+
+def secant(f, x, lo, hi, tol, slope=None, maxeval=20):
+
+    # Корни функции f(x) (массив невязок по строкам) на отрезках [lo, hi] с точностью
+    # tol по невязке. slope - оценка наклона f для первого шага, без неё первый шаг
+    # пробный. Возвращает решение, наклон в нём и число вычислений f
+    x = np.clip(np.asarray(x, dtype=float), lo, hi)
+    r = f(x)
+    evals = 1
+
+    # Вилка: точки с отрицательной и положительной невязкой
+    xn = np.where(r < 0, x, np.nan)
+    xp = np.where(r > 0, x, np.nan)
+    xprev = rprev = None
+    s = np.full(x.shape, np.nan) if slope is None else np.asarray(slope, dtype=float)
+
+    while np.any(np.abs(r) > tol) and evals < maxeval:
+        if xprev is None:
+            if slope is None:
+                # Пробный шаг, в сторону от ближайшей границы
+                dx = 1e-3 * np.maximum(np.abs(x), 1)
+                x1 = np.where(x + dx <= hi, x + dx, x - dx)
+            else:
+                x1 = x - r / s
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                s = np.where(x != xprev, (r - rprev) / (x - xprev), s)
+            x1 = x - r / s
+
+        # Шаг вне вилки или без наклона - деление вилки пополам
+        bracket = np.isfinite(xn) & np.isfinite(xp)
+        a = np.minimum(xn, xp)
+        b = np.maximum(xn, xp)
+        out = bracket & ~((x1 > a) & (x1 < b))
+        x1 = np.where(out, (a + b) / 2, x1)
+        x1 = np.where(np.isfinite(x1), x1, x)
+        x1 = np.clip(x1, lo, hi)
+
+        # Сошедшиеся строки не сдвигаются
+        x1 = np.where(np.abs(r) <= tol, x, x1)
+        r1 = f(x1)
+        evals += 1
+
+        xn = np.where(r1 < 0, x1, xn)
+        xp = np.where(r1 > 0, x1, xp)
+        xprev, rprev = x, r
+        x, r = x1, r1
+
+    return x, s, evals
+
+
+class Shooting:
+    def __init__(self):
+
+        # Точность расчёта с переменным шагом и быстрого расчёта трубопроводов
+        self.rk = 1e-6
+        self.fast = 1e-4
+        # Допустимая невязка давления, Па, и наибольшее число расчётов цепочки
+        self.tol = 1.0
+        self.maxeval = 20
+        # Давление в узле сбора (в начале общего трубопровода, как в HGD_TrO), Па
+        self.Pcol = 4.2e6
+
+    def load(self, filepath):
+
+        # Подключение и интерпретация файла данных Data_HGD_input.toml
+        self.DT = load_data(filepath)
+        self.Pk = np.asarray(self.DT["Pk"], dtype=float)
+        self.Pc = np.asarray(self.DT["Pc"], dtype=float)
+
+        # Запомненные расчёты цепочки (по забойным давлениям) и их число
+        self.memo = {}
+        self.runs = 0
+        # Наклоны невязок в предыдущих решениях, для начала следующего подбора
+        self.slope = {"wellhead": 1.0, "outlet": None}
+        self.a = np.array([1.0])
+
+    def forward(self, Pc):
+
+        # Давления на устье скважин, на выходе общего трубопровода и в конце
+        # трубопроводов от скважин при забойных давлениях Pc; повторный запрос с теми
+        # же Pc берётся из памяти
+        key = np.asarray(Pc, dtype=float).tobytes()
+        if key not in self.memo:
+            RS = run_system(
+                dict(self.DT, Pc=list(Pc)), output="end", rk=self.rk, fast=self.fast
+            )
+            self.memo[key] = (
+                np.array(RS.skv.P1[:, -1], dtype=float),
+                RS.P,
+                np.array(RS.tr.P1[:, -1], dtype=float),
+            )
+            self.runs += 1
+        return self.memo[key]
+
+    def wellhead(self, target):
+
+        # Забойные давления для заданного давления на устье (общего или по скважинам)
+        target = np.broadcast_to(np.asarray(target, dtype=float), self.Pc.shape)
+
+        def f(Pc):
+            return self.forward(Pc)[0] - target
+
+        runs = self.runs
+        hi = self.Pk * (1 - 1e-3)
+        self.Pc, self.slope["wellhead"], _ = secant(
+            f, self.Pc, 0, hi, self.tol, self.slope["wellhead"], self.maxeval
+        )
+        self.evals = self.runs - runs
+        self.finish(f, self.Pc, np.zeros_like(hi), hi, target, "на устье")
+        self.check(collector=False)
+        return self.Pc
+
+    def outlet(self, target):
+
+        # Забойные давления для заданного давления на выходе общего трубопровода,
+        # депрессии всех скважин меняются в одной пропорции a
+        Pc0 = np.asarray(self.DT["Pc"], dtype=float)
+        drawdown = self.Pk - Pc0
+
+        def f(a):
+            return np.array([self.forward(self.Pk - a[0] * drawdown)[1] - target])
+
+        runs = self.runs
+        hi = np.min(self.Pk / drawdown)
+        self.a, self.slope["outlet"], _ = secant(
+            f, self.a, 1e-3, hi, self.tol, self.slope["outlet"], self.maxeval
+        )
+        self.evals = self.runs - runs
+        self.Pc = self.Pk - self.a[0] * drawdown
+        self.finish(f, self.a, np.array([1e-3]), np.array([hi]), target, "на выходе")
+        self.check(collector=True)
+        return self.Pc
+
+    def finish(self, f, x, lo, hi, target, where):
+
+        # Невязка решения (расчёт цепочки - из памяти) и признак сходимости, как у
+        # HGD_Net. Если заданное давление вне диапазона, достижимого на пределах
+        # [lo, hi], - ValueError с этим диапазоном
+        self.residual = f(x)
+        self.converged = bool(np.all(np.abs(self.residual) <= self.tol))
+        if self.converged:
+            return
+
+        # На пределах дебит близок к нулю или предельный: предупреждения numpy не нужны
+        with np.errstate(all="ignore"):
+            rlo, rhi = f(lo), f(hi)
+        low = np.minimum(rlo, rhi)
+        high = np.maximum(rlo, rhi)
+        if np.any((low > self.tol) | (high < -self.tol)):
+            raise ValueError(
+                "Давление %s недостижимо, достижимый диапазон, Па: %s - %s"
+                % (where, low + target, high + target)
+            )
+
+    def check(self, collector):
+
+        # Допустимость решения по скважинам: давление на устье положительно, а с
+        # collector - и давление в конце трубопровода от скважины не ниже Pcol.
+        # Недопустимое решение не считается сошедшимся
+        Pskv, _, Ptr = self.forward(self.Pc)
+        self.feasible = Pskv > 0
+        if collector:
+            self.feasible &= Ptr >= self.Pcol - self.tol
+        self.converged = self.converged and bool(self.feasible.all())
+
+
+if __name__ == "__main__":
+
+    SH = Shooting()
+    SH.load(r"Project_HGD\Data_HGD_input.toml")
+
+    for target in (3.0e6, 3.5e6, 3.6e6):
+        Pc = SH.wellhead(target)
+        print("Устье %.2f МПа: Pc, Па" % (target / 1e6), Pc, "расчётов:", SH.evals)
+        print("Сошёлся:", SH.converged, "невязка, Па:", SH.residual)
+
+    for target in (4.19e6, 4.1e6):
+        Pc = SH.outlet(target)
+        print("Выход %.2f МПа: Pc, Па" % (target / 1e6), Pc, "расчётов:", SH.evals)
+        print("Сошёлся:", SH.converged, "невязка, Па:", SH.residual)
+        print("Допустимо по скважинам:", SH.feasible)
@@ -1,26 +1,84 @@
-# Модуль рассчёта трёх скважин.
+# Модуль рассчёта скважин, все скважины рассчитываются одновременно по сечениям.
 
 # Для построения графиков и их исследований
 import matplotlib.pyplot as plt
-import math
 
-# Востребователен для натуральных логарифмов и квадратных корней
-from numpy import zeros
+# Векторные вычисления сразу по всем скважинам
+import numpy as np
 
-# Нужен для подгрузки данных, таких как  P, T, po и т.д. из готового файла, чтобы избежать бесконечных импутов
-import toml
+from .HGD_Corr import Correlations
+from .HGD_Fluid import fluid
+from .HGD_Prof import instrument
+from .HGD_RK import dopri
+from .HGD_Store import (
+    dump_data,
+    load_data,
+    open_profile,
+    output_columns,
+    output_nodes,
+    release,
+    save_profile,
+)
 
+# Цвета графиков по номеру скважины
+COLORS = ["orange", "green", "blue"]
 
+
+@instrument
 class SKV:
+    # Исходные данные, которые читает расчёт, и сохраняемые в кэше результаты
+    KEYS = (
+        "N3",
+        "muN0",
+        "alphav",
+        "OTsheroh",
+        "thickT",
+        "betaN",
+        "betaV",
+        "CN",
+        "CV",
+        "lyambdaGr",
+        "lyambdaN0",
+        "lyambdaV",
+        "lyambdaSt",
+        "po",
+        "E",
+        "Tgr",
+        "g",
+        "Re1",
+        "Re2",
+        "pi",
+        "pov",
+        "rc",
+        "Hskv",
+        "gradT",
+        "Pc",
+        "h",
+        "pvt",
+    )
+    RESULTS = ("nodes", "v1", "po1", "T1", "P1", "G1", "nu")
+    # Результаты предыдущих блоков, которые читает расчёт, и передаваемые далее результаты
+    INPUTS = ("Qpl",)
+    OUTPUTS = {"Pskv": "P1", "Gskv": "G1", "Tskv": "T1"}
+
     def __init__(self):
 
-        pass
+        # Правило выгрузки профилей: "full" - все сечения, целое k - каждое k-е,
+        # "end" - только начало и конец
+        self.output = "full"
+        # Каталог для профилей на диске и размер пачки скважин (режим месторождения)
+        self.store = None
+        self.chunk = None
+        # Точность расчёта с переменным шагом, None - расчёт по N сечениям
+        self.rk = None
+        # Наблюдатель шагов расчёта по сечениям: observer(блок, строки, j, величины)
+        self.observer = None
 
     def load(self, filepath1, filepath2):
 
         # Подключение и интерпретация файла данных Data_HGD_input.toml и Data_HGD_output.toml
-        self.DT = toml.load(filepath1)
-        self.DT2 = toml.load(filepath2)
+        self.DT = load_data(filepath1)
+        self.DT2 = load_data(filepath2)
 
         # Блок ввода исходных параметров системы.
 
@@ -67,7 +125,7 @@ class SKV:
         # Глубина пролегания трубопроводов, м
         self.H = self.DT["H"]
         self.Qpl = self.DT2["Qpl"]
-        self.Ppl = self.DT2["Ppl"]
+        self.Ppl = self.DT2.get("Ppl", [])
         # Ускорение свободного падения
         self.g = self.DT["g"]
         # Критические числа Рейнольдса
@@ -82,31 +140,12 @@ class SKV:
         self.Hskv = self.DT["Hskv"]
         self.gradT = self.DT["gradT"]
 
-        # Задание списков физических параметров для системы скважины
-        self.v1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.po1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.T1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.P1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.G1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.nu = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-
         # Предварительные расчёты и интерпретация исходных данных
         self.Pc = self.DT["Pc"]
-
-        for i in range(3):
-            self.P1[i][0] = self.Pc[i]
-
         self.Qpl = self.DT2["Qpl"]
-        self.Ppl = self.DT2["Ppl"]
+        self.Ppl = self.DT2.get("Ppl", [])
         self.h = self.DT["h"]
 
-        self.Dc = [0, 0, 0]
-        self.dc = [0, 0, 0]
-        self.S1 = [0, 0, 0]
-        self.deltaZ = [0, 0, 0]
-        self.lyambda2 = [0, 0, 0]
-        self.z = []
-
     def dump(self, filepath):
 
         self.DT2 = {
@@ -116,216 +155,390 @@ class SKV:
             "Ppl": self.Ppl,
             "Qpl": self.Qpl,
         }
-        with open(filepath, "w") as io:
-            toml.dump(self.DT2, io)
+        dump_data(filepath, self.DT2)
 
-    def solve(self):
-
-        for i in range(3):
+    def field(self, dirpath, chunk=1000):
 
-            # Расчёт начальных температур
-            self.T1[i][0] = self.Tgr + (self.Hskv[i] + self.h[i]) * self.gradT
+        # Режим месторождения: профили пишутся в файлы каталога dirpath,
+        # скважины рассчитываются пачками по chunk штук
+        self.store = dirpath
+        self.chunk = chunk
 
-            # Диаметры скважин
+    def alloc(self, name):
 
-            # Внешний диаметр скважины
-            self.Dc[i] = self.rc[i] * 2
-            # внутренний диаметр
-            self.dc[i] = self.Dc[i] - (2 * self.thick)
+        # Массив профиля (скважина x сечение) в памяти или на диске
+        if self.store is None:
+            return np.zeros((self.n, len(self.nodes)))
+        return open_profile(self.store, name, (self.n, len(self.nodes)))
 
-            # Площадь сечения скважины
-            self.S1[i] = (self.pi * (self.dc[i] ** 2)) / 4
+    def block(self, sl):
 
-            # Рассчёт начальной плотности смеси
-            self.po1[i][0] = (self.po / (1 + (self.betaN * (self.T1[i][0] - 293)))) * (
-                1 - self.alphav
-            ) + (self.pov / (1 + (self.betaV * (self.T1[i][0] - 293)))) * self.alphav
+        # Строки профилей для пачки sl: срезы массивов в памяти или временные массивы
+        if self.store is None:
+            return (
+                self.v1[sl],
+                self.po1[sl],
+                self.T1[sl],
+                self.P1[sl],
+                self.G1[sl],
+                self.nu[sl],
+            )
+        m = len(range(self.n)[sl])
+        return tuple(np.zeros((m, len(self.nodes))) for _ in range(6))
 
-            # Начальных расход, берётся из рассчёта пласта, пересчёт в кг/с
-            self.G1[i][0] = self.Qpl[i] * self.po1[i][0]
+    def prepare(self):
 
-            # Рассчёт начальной скорости потока
-            self.v1[i][0] = self.G1[i][0] / (self.po1[i][0] * self.S1[i])
+        # Количество скважин берётся из длины списка глубин
+        self.n = len(self.Hskv)
 
-            # Рассчёт шага разбиения
-            self.deltaZ[i] = self.Hskv[i] / self.N
+        # Диаметры скважин
 
-            # Задание списка глубины скважины
-            Z = [self.deltaZ[i] * (self.N - _) for _ in range(self.N + 1)]
-            self.z.append(Z)
+        # Внешний диаметр скважины
+        self.Dc = np.asarray(self.rc, dtype=float) * 2
+        # внутренний диаметр
+        self.dc = self.Dc - (2 * self.thick)
 
-            # Вычисление lyambda2 для каждой скважины
-            self.lyambda2[i] = 0.11 * (((68 / self.Re2) + self.OTsheroh) ** 0.25)
+        # Площадь сечения скважины
+        self.S1 = (self.pi * (self.dc**2)) / 4
 
-        # Формула вязкости Эйнштейна для смеси воды и нефти
-        muN = self.muN0 * (1 + 2.5 * self.alphav)
+        # Рассчёт шага разбиения
+        self.deltaZ = np.asarray(self.Hskv, dtype=float) / self.N
 
-        lyambda1 = 64 / self.Re1
-
-        # Рассчёт теплоёмкости смеси
-        C = self.CN * (1 - self.alphav) + self.CV * self.alphav
+        # Свойства смеси нефти и воды (модуль HGD_Fluid)
+        self.fluid = fluid(self)
 
-        # Рассчёт теплопроводности смеси
-        lyambdaN = self.lyambdaN0 * (1 - self.alphav) + self.lyambdaV * self.alphav
-
-        # Рассчёт скважин по сечениям
-        for i in range(3):
-            for j in range(0, self.N):
-                dzeta = 0
-                # Формула для вычисления плотности смеси
-                self.po1[i][j + 1] = (
-                    self.po / (1 + (self.betaN * (self.T1[i][j] - 293)))
-                ) * (1 - self.alphav) + (
-                    self.pov / (1 + (self.betaV * (self.T1[i][j] - 293)))
-                ) * self.alphav
-
-                # Формула для вычисления кинематической вязкости смеси
-                self.nu[i][j] = muN / self.po1[i][j]
-
-                # Скорость и расход
-                self.v1[i][j + 1] = (self.po1[i][j] * self.v1[i][j]) / (
-                    self.po1[i][j + 1]
-                )
+    def solve(self):
 
-                # Потери давления, определение числа Рейнольдса
-                Re = (self.v1[i][j] * self.dc[i]) / self.nu[i][j]
-
-                # Определение lyambdaT по условиям числа Рейнольдса
-                if Re == self.Re2:
-                    lyambdaT = self.lyambda2[i]
-                # Для ламинарного режима
-                elif Re <= self.Re1:
-                    lyambdaT = lyambda1
-                # Для переходного режима
-                elif self.Re1 < Re <= self.Re2:
-                    lyambdaT = lyambda1 + (
-                        (self.lyambda2[i] - lyambda1) / (self.Re2 - self.Re1)
-                    ) * (Re - self.Re1)
-                elif self.Re2 < Re <= 500 / self.OTsheroh:
-                    lyambdaT = 0.067 * (((158 / Re) + 2 * self.OTsheroh) ** 0.2)
-                elif Re > 500 / self.OTsheroh:
-                    lyambdaT = 0.067 * ((2.136 * self.OTsheroh) ** 0.2)
-
-                lyambdaTr = (1.05 * lyambdaT) / (self.E**2)
-
-                # Работа сил трения на участке deltaZ, ф. Вейсбаха-Дарси
-                deltaPtr = (
-                    lyambdaTr
-                    * (self.deltaZ[i] / self.dc[i])
-                    * self.po1[i][j]
-                    * ((self.v1[i][j] ** 2) / 2)
+        self.prepare()
+
+        if self.rk is not None:
+            self.adaptive()
+            return
+
+        # Сохраняемые сечения профилей
+        self.nodes = output_nodes(self.N, self.output)
+
+        # Задание массивов физических параметров для системы скважин (скважина x сечение)
+        self.v1 = self.alloc("vskv")
+        self.po1 = self.alloc("poskv")
+        self.T1 = self.alloc("Tskv")
+        self.P1 = self.alloc("Pskv")
+        self.G1 = self.alloc("Gskv")
+        self.nu = self.alloc("nuskv")
+
+        # Скважины рассчитываются пачками, чтобы временные массивы не росли с их числом
+        chunk = self.chunk or self.n
+        for a in range(0, self.n, chunk):
+            self.march(slice(a, min(a + chunk, self.n)))
+
+        if self.store is not None:
+            save_profile(self.store, "Qpl", self.Qpl)
+
+    def adaptive(self):
+
+        # Расчёт с переменным шагом и точностью self.rk (модуль HGD_RK). Узлы профилей -
+        # принятые шаги, номера сечений nodes дробные (в единицах шага Hskv / N)
+        f, y0, G = self.ode()
+        x, y, self.stats = dopri(f, y0, self.rk)
+
+        keep = output_nodes(len(x) - 1, self.output)
+        self.nodes = x[keep] * self.N
+        self.P1 = y[keep, 0].T
+        self.T1 = y[keep, 1].T
+
+        # Давление на забое - до местных потерь на входе в НКТ, как при расчёте по сечениям
+        self.P1[:, 0] = self.Pc
+
+        # Профили по узлам (узел x строка) с параметрами строк, затем (строка x узел)
+        T = y[keep, 1]
+        po = self.fluid.rho(T)
+        self.po1 = po.T
+        self.v1 = (G / (po * self.S1)).T
+        self.G1 = (G * np.ones((len(keep), 1))).T
+        self.nu = (self.fluid.muN / po).T
+
+        if self.store is not None:
+            for name, value in zip(
+                ("vskv", "poskv", "Tskv", "Pskv", "Gskv", "nuskv", "Qpl"),
+                (self.v1, self.po1, self.T1, self.P1, self.G1, self.nu, self.Qpl),
+            ):
+                save_profile(self.store, name, value)
+
+    def ode(self):
+
+        # Уравнения скважин в виде системы ОДУ для давления и температуры по доле глубины
+        # x = 0..1 от забоя к устью: правая часть f(x, y), начальное состояние y0 = (P, T)
+        # и массовый расход G, постоянный по глубине
+        Hskv = np.asarray(self.Hskv, dtype=float)
+        h = np.asarray(self.h, dtype=float)
+        dc = self.dc
+        Dc = self.Dc
+
+        # Плотность смеси и её производная по температуре
+        density = self.fluid.rho
+        ddensity = self.fluid.drho
+
+        T0 = self.Tgr + (Hskv + h) * self.gradT
+        po0 = density(T0)
+        G = np.asarray(self.Qpl, dtype=float) * po0
+        v0 = G / (po0 * self.S1)
+
+        # Местные потери на входе в трубу НКТ
+        P0 = np.asarray(self.Pc, dtype=float) - 0.5 * po0 * ((v0**2) / 2)
+
+        muN = self.fluid.muN
+        C = self.fluid.C
+        lyambdaN = self.fluid.lyambdaN
+        Pr = self.fluid.Pr
+        Rst = (dc / 2 * self.lyambdaSt) * np.log(Dc / dc)
+        Rgr = (dc / 2 * self.lyambdaGr) * np.log(10)
+
+        # Корреляции трения и теплоотдачи при постоянном по глубине числе Рейнольдса
+        corr = Correlations(
+            G * dc / (self.S1 * muN),
+            self.Re1,
+            self.Re2,
+            self.OTsheroh,
+            self.E,
+            Pr,
+            lyambdaN,
+            dc,
+        )
+
+        def f(x, y):
+
+            P, T = y
+            po = density(T)
+            dpo = ddensity(T)
+            v = G / (po * self.S1)
+            nu = muN / po
+
+            # Температура грунта на текущей глубине; в числе Грасгофа - длина участка
+            # Hskv / N, как при расчёте по сечениям
+            TgrSkv = self.Tgr + Hskv * (1 - x) * self.gradT
+            Gr = (self.g * (self.deltaZ**3) * self.betaN * (T - TgrSkv)) / nu**2
+
+            # Коэффициент теплоотдачи от потока к стенке (модуль HGD_Corr)
+            alphaSS = corr.alphaSS(Gr)
+            k = 1 / ((1 / alphaSS) + Rst + Rgr)
+
+            # Тепловой баланс и уравнение Бернулли на единицу длины
+            dT = k * self.pi * dc * (TgrSkv - T) / (C * G)
+            dv = -v * dpo / po * dT
+            dP = (
+                po
+                * (
+                    -(corr.alphak * v * dv)
+                    - self.g
+                    - corr.lyambdaTr / dc * ((v**2) / 2)
                 )
+                + (P / po) * dpo * dT
+            )
 
-                # потери на колене 90, при выходе из скважины, и на открытой задвижке
-                if j == self.N + 1:
-                    dzeta = 1.37 + 0.15
+            return Hskv * np.array([dP, dT])
 
-                # потери на входе в трубу НКТ
-                if j == 0:
-                    dzeta = 0.5
+        return f, np.array([P0, T0]), G
 
-                # Местные потери давления
-                deltaPmest = dzeta * self.po1[i][j] * ((self.v1[i][j] ** 2) / 2)
+    def stream(self, sl=slice(None)):
 
-                # Суммарные потери давления
-                deltaP = deltaPtr + deltaPmest
+        # Потоковый расчёт без профилей: генератор состояний сечений скважин sl,
+        # память не зависит от числа сечений N, перебор можно прервать в любом сечении
+        self.prepare()
+        yield from self.sections(sl)
 
-                # Потери теплоты
+    def march(self, sl):
 
-                # Расчет температуры грунта по мере уменьшения координаты z
-                TgrSkv = self.Tgr + self.z[i][j + 1] * self.gradT
+        # Профили пачки: в режиме месторождения рассчитываются в памяти и затем
+        # целиком переносятся на диск
+        v1, po1, T1, P1, G1, nu1 = self.block(sl)
 
-                # Число Прандтля для нефти
-                Pr = (muN * C) / lyambdaN
+        # Столбцы профилей для сохраняемых сечений
+        keep = output_columns(self.nodes, self.N)
 
-                # Число Прандтля для стенки трубы
-                PrSt = 1
+        # Запись сечения в профили, если оно сохраняется по правилу выгрузки
+        for s in self.sections(sl):
+            c = keep[s["j"]]
+            if c >= 0:
+                po1[:, c] = s["rho"]
+                v1[:, c] = s["v"]
+                T1[:, c] = s["T"]
+                P1[:, c] = s["P"]
+                G1[:, c] = s["G"]
+                nu1[:, c] = s["nu"]
 
-                # Число Грасгофа
-                Gr = (
-                    self.g
-                    * ((self.deltaZ[i]) ** 3)
-                    * self.betaN
-                    * (self.T1[i][j] - TgrSkv)
-                ) / self.nu[i][j] ** 2
-
-                # Для ламинарного режима
-                alphaL = (
-                    0.17
-                    * (lyambdaN / self.dc[i])
-                    * Re**0.33
-                    * Pr**0.43
-                    * Gr**0.1
-                    * 1
-                )
+        if self.store is not None:
+            for profile, block in zip(
+                (self.v1, self.po1, self.T1, self.P1, self.G1, self.nu),
+                (v1, po1, T1, P1, G1, nu1),
+            ):
+                profile[sl] = block
+                release(profile)
 
-                # Для турбулентного режима
-                alphaT = 0.021 * (lyambdaN / self.dc[i]) * Re**0.8 * Pr**0.43 * 1
+    def sections(self, sl):
 
-                if Re <= self.Re1:
+        # Генератор состояний скважин пачки sl по сечениям j = 0..N от забоя к устью:
+        # глубина z, давление, температура, плотность, скорость, расход, вязкость,
+        # число Рейнольдса и режим течения (0 - ламинарный, 1 - переходный, 2 - турбулентный)
 
-                    # Для ламинарного режима
-                    alphaSS = alphaL
+        # Параметры скважин пачки sl
+        Hskv = np.asarray(self.Hskv, dtype=float)[sl]
+        h = np.asarray(self.h, dtype=float)[sl]
+        dc = self.dc[sl]
+        Dc = self.Dc[sl]
+        S1 = self.S1[sl]
+        deltaZ = self.deltaZ[sl]
 
-                    # Коэффициент Кориолиса
-                    alphak = 2
+        P = np.array(self.Pc, dtype=float)[sl]
 
-                elif Re >= self.Re2:
+        # Расчёт начальных температур
+        T = self.Tgr + (Hskv + h) * self.gradT
 
-                    # Для турбулентного режима
-                    alphaSS = alphaT
+        # Рассчёт начальной плотности смеси
+        po = self.fluid.rho(T)
 
-                    # Коэффициент Кориолиса
-                    alphak = 1.1
+        # Начальных расход, берётся из рассчёта пласта, пересчёт в кг/с
+        G = np.asarray(self.Qpl, dtype=float)[sl] * po
 
-                elif self.Re1 < Re < self.Re2:
+        # Рассчёт начальной скорости потока
+        v = G / (po * S1)
 
-                    # Для переходного режима
-                    alphaSS = alphaL + ((alphaT - alphaL) / 8000) * (Re - 2000)
+        # Формула вязкости Эйнштейна для смеси воды и нефти
+        muN = self.fluid.muN
 
-                    # Коэффициент Кориолиса
-                    alphak = (-1.169e-4 * Re) + 2.269
+        # Рассчёт теплоёмкости смеси
+        C = self.fluid.C
 
-                # Коэффициент теплопередачи К от теплоносителя в грунт для подземных трубопроводов с учетом стенки трубы, Вт/м**2 * K
-                k = 1 / (
-                    (1 / alphaSS)
-                    + (
-                        (self.dc[i] / 2 * self.lyambdaSt)
-                        * math.log(self.Dc[i] / self.dc[i])
-                    )
-                    + ((self.dc[i] / 2 * self.lyambdaGr) * math.log(10))
+        # Рассчёт теплопроводности смеси
+        lyambdaN = self.fluid.lyambdaN
+
+        # Число Прандтля для нефти
+        Pr = self.fluid.Pr
+
+        # Термические сопротивления стенки и грунта не зависят от сечения
+        Rst = (dc / 2 * self.lyambdaSt) * np.log(Dc / dc)
+        Rgr = (dc / 2 * self.lyambdaGr) * np.log(10)
+
+        # Корреляции трения и теплоотдачи: число Рейнольдса по глубине не меняется,
+        # поэтому они вычисляются один раз по начальному сечению (модуль HGD_Corr)
+        corr = Correlations(
+            (v * dc) / (muN / po),
+            self.Re1,
+            self.Re2,
+            self.OTsheroh,
+            self.E,
+            Pr,
+            lyambdaN,
+            dc,
+        )
+
+        # Наблюдатель шагов (модуль HGD_Diag); без него в цикле - только проверка
+        observe = self.observer
+
+        # Рассчёт скважин по сечениям, все скважины пачки продвигаются одновременно
+        for j in range(0, self.N + 1):
+            dzeta = 0
+
+            # Формула для вычисления кинематической вязкости смеси
+            nu = muN / po
+
+            # Потери давления, определение числа Рейнольдса
+            Re = (v * dc) / nu
+
+            yield {
+                "j": j,
+                "z": deltaZ * (self.N - j),
+                "P": P,
+                "T": T,
+                "rho": po,
+                "v": v,
+                "G": G,
+                "nu": nu,
+                "Re": Re,
+                "regime": corr.regime,
+            }
+
+            if j == self.N:
+                return
+
+            # Формула для вычисления плотности смеси
+            po2 = self.fluid.rho(T)
+
+            # Скорость и расход
+            v2 = (po * v) / po2
+
+            # Работа сил трения на участке deltaZ, ф. Вейсбаха-Дарси
+            deltaPtr = corr.lyambdaTr * (deltaZ / dc) * po * ((v**2) / 2)
+
+            # потери на колене 90, при выходе из скважины, и на открытой задвижке
+            if j == self.N + 1:
+                dzeta = 1.37 + 0.15
+
+            # потери на входе в трубу НКТ
+            if j == 0:
+                dzeta = 0.5
+
+            # Местные потери давления
+            deltaPmest = dzeta * po * ((v**2) / 2)
+
+            # Суммарные потери давления
+            deltaP = deltaPtr + deltaPmest
+
+            # Потери теплоты
+
+            # Расчет температуры грунта по мере уменьшения координаты z
+            TgrSkv = self.Tgr + deltaZ * (self.N - j - 1) * self.gradT
+
+            # Число Грасгофа
+            Gr = (self.g * ((deltaZ) ** 3) * self.betaN * (T - TgrSkv)) / nu**2
+
+            # Коэффициент теплоотдачи от потока к стенке (модуль HGD_Corr)
+            alphaSS = corr.alphaSS(Gr)
+
+            # Коэффициент теплопередачи К от теплоносителя в грунт для подземных трубопроводов с учетом стенки трубы, Вт/м**2 * K
+            k = 1 / ((1 / alphaSS) + Rst + Rgr)
+
+            # Тепловой поток в окружающую среду, Дж/с
+            Qvn = k * self.pi * dc * deltaZ * (TgrSkv - T)
+
+            if observe is not None:
+                observe(
+                    self,
+                    sl,
+                    j,
+                    {
+                        "Re": Re,
+                        "lyambdaT": corr.lyambdaT,
+                        "alphaSS": alphaSS,
+                        "alphak": corr.alphak,
+                        "deltaPtr": deltaPtr,
+                        "Qvn": Qvn,
+                    },
                 )
 
-                # Тепловой поток в окружающую среду, Дж/с
-                Qvn = (
-                    k * self.pi * self.dc[i] * self.deltaZ[i] * (TgrSkv - self.T1[i][j])
-                )
+            # Уравнение теплового баланса
+            T2 = T + (Qvn / (C * G))
 
-                # Уравнение теплового баланса
-                self.T1[i][j + 1] = self.T1[i][j] + (Qvn / (C * self.G1[i][j]))
+            # Уравнение Бернулли
+            P2 = po2 * (
+                (P / po)
+                + (corr.alphak * ((v**2) / 2))
+                - (corr.alphak * ((v2**2) / 2))
+                - (self.g * deltaZ)
+                - (deltaP / po2)
+            )
 
-                # Уравнение Бернулли
-                self.P1[i][j + 1] = self.po1[i][j + 1] * (
-                    (self.P1[i][j] / self.po1[i][j])
-                    + (alphak * ((self.v1[i][j] ** 2) / 2))
-                    - (alphak * ((self.v1[i][j + 1] ** 2) / 2))
-                    - (self.g * self.deltaZ[i])
-                    - (deltaP / self.po1[i][j + 1])
-                )
+            G2 = po * v * S1
 
-                self.G1[i][j + 1] = self.po1[i][j] * self.v1[i][j] * self.S1[i]
+            T, P, po, v, G = T2, P2, po2, v2, G2
 
     def plot(self):
 
         # Построение графика
 
-        self.z[0] = [self.z[0][_] * (-1) for _ in range(0, self.N + 1)]
-        self.z[1] = [self.z[1][_] * (-1) for _ in range(0, self.N + 1)]
-        self.z[2] = [self.z[2][_] * (-1) for _ in range(0, self.N + 1)]
+        legend = ["Скважина №%d" % (i + 1) for i in range(self.n)]
 
-        self.P1[0] = [self.P1[0][_] / 1e6 for _ in range(0, self.N + 1)]
-        self.P1[1] = [self.P1[1][_] / 1e6 for _ in range(0, self.N + 1)]
-        self.P1[2] = [self.P1[2][_] / 1e6 for _ in range(0, self.N + 1)]
+        # Глубина сечений скважин
+        self.z = self.deltaZ[:, None] * (self.N - self.nodes)
 
         fig = plt.figure(1)
         ax = fig.add_subplot(111)
@@ -338,10 +551,9 @@ class SKV:
         plt.ylabel("Давление, МПа", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.z[0], self.P1[0], c="orange", linewidth=2)
-        plt.plot(self.z[1], self.P1[1], c="green", linewidth=2)
-        plt.plot(self.z[2], self.P1[2], c="blue", linewidth=2)
-        plt.legend(["Скважина №1", "Скважина №2", "Скважина №3"])
+        for i in range(self.n):
+            plt.plot(-self.z[i], self.P1[i] / 1e6, c=COLORS[i % 3], linewidth=2)
+        plt.legend(legend)
 
         fig = plt.figure(2)
         ax = fig.add_subplot(111)
@@ -354,10 +566,9 @@ class SKV:
         plt.ylabel("Температура, К", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.z[0], self.T1[0], c="orange", linewidth=2)
-        plt.plot(self.z[1], self.T1[1], c="green", linewidth=2)
-        plt.plot(self.z[2], self.T1[2], c="blue", linewidth=2)
-        plt.legend(["Скважина №1", "Скважина №2", "Скважина №3"])
+        for i in range(self.n):
+            plt.plot(-self.z[i], self.T1[i], c=COLORS[i % 3], linewidth=2)
+        plt.legend(legend)
 
         fig = plt.figure(3)
         ax = fig.add_subplot(111)
@@ -370,19 +581,18 @@ class SKV:
         plt.ylabel("Плотность, кг/м^3", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.z[0], self.po1[0], c="orange", linewidth=2)
-        plt.plot(self.z[1], self.po1[1], c="green", linewidth=2)
-        plt.plot(self.z[2], self.po1[2], c="blue", linewidth=2)
-        plt.legend(["Скважина №1", "Скважина №2", "Скважина №3"])
+        for i in range(self.n):
+            plt.plot(-self.z[i], self.po1[i], c=COLORS[i % 3], linewidth=2)
+        plt.legend(legend)
         plt.show()
 
 
 if __name__ == "__main__":
 
     PL = SKV()
-    PL.load(r"Project_HGD\Data_HGD_input.toml", r"Project_HGD\Data_HGD_output.toml")
+    PL.load(r"Project_HGD\Data_HGD_input.toml", r"Project_HGD\Data_HGD_output")
     PL.solve()
-    PL.dump(r"Project_HGD\Data_HGD_output.toml")
+    PL.dump(r"Project_HGD\Data_HGD_output")
     PL.plot()
 
     print(PL)
@@ -0,0 +1,125 @@
+# Модуль хранения профилей в двоичных файлах с отображением в память.
+#
+# Каталог хранилища содержит по одному файлу .npy на каждую величину (Pskv, Gskv, Ptr, ...):
+# небольшой заголовок с формой массива и сами числа float64 без потери точности.
+# Через этот каталог блоки передают результаты друг другу (Data_HGD_output), последующие
+# блоки читают его с отображением в память, без разбора и копирования.
+# Файл с расширением .toml по-прежнему поддерживается как текстовая выгрузка для просмотра.
+
+import hashlib
+import mmap
+import os
+
+import numpy as np
+
+# Нужен для чтения прежнего текстового формата Data_HGD_output.toml
+import toml
+
+
+def open_profile(dirpath, name, shape):
+
+    # Создание массива на диске, доступного для записи как обычный массив numpy
+    os.makedirs(dirpath, exist_ok=True)
+    return np.lib.format.open_memmap(
+        os.path.join(dirpath, name + ".npy"), mode="w+", dtype=np.float64, shape=shape
+    )
+
+
+def output_nodes(N, output="full"):
+
+    # Номера сечений, которые сохраняются в профилях: все ("full"), каждое k-е (целое k)
+    # или только начало и конец ("end"). Первое и последнее сечения сохраняются всегда,
+    # последующие блоки берут из профилей только последнее
+    if output == "full":
+        return np.arange(N + 1)
+    if output == "end":
+        return np.array([0, N])
+    if isinstance(output, int) and output > 0:
+        return np.union1d(np.arange(0, N + 1, output), [N])
+    raise ValueError("Неизвестное правило выгрузки профилей: %r" % (output,))
+
+
+def output_columns(nodes, N):
+
+    # Номер столбца профиля для каждого сечения 0..N, -1 - сечение не сохраняется
+    keep = [-1] * (N + 1)
+    for c, j in enumerate(nodes):
+        keep[j] = c
+    return keep
+
+
+def release(profile):
+
+    # Сброс записанных данных на диск и освобождение страниц памяти, чтобы объём
+    # занятой памяти не зависел от размера профиля
+    if not isinstance(profile, np.memmap):
+        return
+    profile.flush()
+    if hasattr(mmap, "MADV_DONTNEED") and profile._mmap is not None:
+        profile._mmap.madvise(mmap.MADV_DONTNEED)
+
+
+def save_profile(dirpath, name, value):
+
+    # Запись величины целиком. Файл пишется под временным именем и затем подменяется,
+    # чтобы не испортить массив, который в это время отображён в память для чтения
+    os.makedirs(dirpath, exist_ok=True)
+    filepath = os.path.join(dirpath, name + ".npy")
+
+    # Профиль, уже лежащий в этом файле (режим месторождения), не переписывается
+    if isinstance(value, np.memmap) and os.path.exists(filepath):
+        if value.filename and os.path.samefile(value.filename, filepath):
+            value.flush()
+            return
+
+    with open(filepath + ".tmp", "wb") as io:
+        np.save(io, np.asarray(value, dtype=np.float64))
+    os.replace(filepath + ".tmp", filepath)
+
+
+def dump_data(filepath, data):
+
+    # Выгрузка результатов блока: в каталог хранилища или в текстовый файл toml
+    if str(filepath).endswith(".toml"):
+        with open(filepath, "w") as io:
+            toml.dump({key: np.asarray(v).tolist() for key, v in data.items()}, io)
+        return
+
+    for key, value in data.items():
+        save_profile(filepath, key, value)
+
+
+def load_data(filepath):
+
+    # Словарь уже загруженных данных передаётся как есть, текстовый файл toml
+    # читается целиком, каталог хранилища - с отображением в память
+    if isinstance(filepath, dict):
+        return filepath
+    if not os.path.isdir(filepath):
+        return toml.load(filepath)
+
+    data = {}
+    for name in sorted(os.listdir(filepath)):
+        if name.endswith(".npy"):
+            data[name[:-4]] = np.load(os.path.join(filepath, name), mmap_mode="r")
+    return data
+
+
+def content(value):
+
+    # Значение исходных данных для сравнения и ключа кэша: путь к файлу (таблица PVT)
+    # заменяется хэшем содержимого файла, чтобы правка файла была изменением данных
+    if isinstance(value, str) and os.path.isfile(value):
+        with open(value, "rb") as io:
+            return hashlib.sha256(io.read()).hexdigest()
+    return value
+
+
+def endpoints(profile):
+
+    # Значения в последнем сечении каждого профиля, без чтения остальных узлов
+    if isinstance(profile, np.ndarray):
+        value = np.array(profile[:, -1], dtype=float)
+        release(profile)
+        return value
+    return np.array([row[-1] for row in profile], dtype=float)
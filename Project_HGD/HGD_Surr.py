@@ -0,0 +1,265 @@
+# Модуль суррогатной модели: быстрая замена расчёта цепочки для массовых запросов
+# "что, если" (расход G, давление P и температура T на выходе общего трубопровода).
+#
+# Пространство исходных данных - интервалы параметров (по умолчанию относительный
+# разброс SPREAD ансамбля, параметры скважин - по каждой скважине). Точки выбираются
+# латинским гиперкубом с наибольшим наименьшим расстоянием между точками, рассчитываются
+# ансамблем (модуль HGD_Ensemble) на нескольких процессах. По ним строится интерполяция
+# радиальными базисными функциями r**3 с линейной частью; ошибка оценивается
+# перекрёстной проверкой с исключением одной точки (формула Риппы, без повторных
+# построений).
+#
+# predict рассчитывает по модели только точки внутри области доверия (в пределах
+# интервалов и недалеко от рассчитанных точек), остальные - ансамблем цепочки.
+# Модель сохраняется в файл .npz вместе с исходными данными.
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import toml
+
+from .HGD_Ensemble import SPREAD, Ensemble
+from .HGD_Store import load_data
+
+# Величины на выходе общего трубопровода
+OUTPUTS = ("G", "P", "T")
+
+
+def design(M, d, tries=20, seed=None):
+
+    # Латинский гиперкуб M x d в единичном кубе: из tries вариантов - с наибольшим
+    # наименьшим расстоянием между точками
+    rng = np.random.default_rng(seed)
+    best, score = None, -1
+    for _ in range(tries):
+        u = rng.permuted(np.tile(np.arange(M), (d, 1)), axis=1).T + rng.random((M, d))
+        u /= M
+        dist = np.sqrt(((u[:, None] - u[None]) ** 2).sum(axis=2))
+        np.fill_diagonal(dist, np.inf)
+        if dist.min() > score:
+            best, score = u, dist.min()
+    return best
+
+
+def run_block(DT, samples, rk=None, fast=None):
+
+    # Расчёт пачки вариантов одним ансамблем (в отдельном процессе)
+    EN = Ensemble()
+    EN.rk = rk
+    EN.fast = fast
+    EN.load(DT)
+    EN.set(samples)
+    out = EN.solve()
+    return np.stack([out[name] for name in OUTPUTS], axis=1)
+
+
+def kernel(A, B):
+
+    # Матрица базисных функций r**3 между точками A и B
+    r2 = (A**2).sum(axis=1)[:, None] + (B**2).sum(axis=1)[None] - 2 * A @ B.T
+    return np.sqrt(np.maximum(r2, 0)) ** 3
+
+
+class Surrogate:
+    def __init__(self):
+
+        # Точность расчёта с переменным шагом и быстрого расчёта трубопроводов
+        self.rk = 1e-6
+        self.fast = 1e-4
+        # Число процессов для расчёта точек, None - в текущем процессе
+        self.workers = None
+        # Радиус области доверия в долях наибольшего расстояния до ближайшей точки
+        self.trust = 2.0
+
+    def load(self, filepath, spread=None):
+
+        # Подключение и интерпретация файла данных Data_HGD_input.toml; интервалы
+        # параметров - исходные значения +-spread, коэффициент обводненности в [0, 1]
+        self.DT = load_data(filepath)
+        spread = SPREAD if spread is None else spread
+
+        self.names = []
+        lo, hi = [], []
+        for key, rel in spread.items():
+            base = np.atleast_1d(np.asarray(self.DT[key], dtype=float))
+            scalar = np.ndim(self.DT[key]) == 0
+            for i, x in enumerate(base):
+                self.names.append((key, None if scalar else i))
+                a, b = sorted((x * (1 - rel), x * (1 + rel)))
+                if key == "alphav":
+                    a, b = max(a, 0), min(b, 1)
+                lo.append(a)
+                hi.append(b)
+        self.lo = np.array(lo)
+        self.hi = np.array(hi)
+
+    def samples(self, X):
+
+        # Варианты ансамбля по точкам X (точка x параметр)
+        samples = {}
+        for p, (key, i) in enumerate(self.names):
+            if i is None:
+                samples[key] = X[:, p]
+            else:
+                if key not in samples:
+                    samples[key] = np.repeat(
+                        np.asarray(self.DT[key], dtype=float)[None], len(X), axis=0
+                    )
+                samples[key][:, i] = X[:, p]
+        return samples
+
+    def evaluate(self, X):
+
+        # Расчёт точек цепочкой: пачками на нескольких процессах или одним ансамблем
+        X = np.asarray(X, dtype=float)
+        if not self.workers or self.workers == 1 or len(X) < 2:
+            return run_block(self.DT, self.samples(X), self.rk, self.fast)
+
+        parts = np.array_split(X, min(self.workers, len(X)))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            Y = pool.map(
+                run_block,
+                itertools.repeat(self.DT),
+                [self.samples(part) for part in parts],
+                itertools.repeat(self.rk),
+                itertools.repeat(self.fast),
+            )
+            return np.concatenate(list(Y))
+
+    def fit(self, M=500, seed=None):
+
+        # Расчёт M точек плана и построение интерполяции
+        self.U = design(M, len(self.names), seed=seed)
+        self.Y = self.evaluate(self.lo + self.U * (self.hi - self.lo))
+        self.build()
+
+    def build(self):
+
+        # Коэффициенты интерполяции по нормированным величинам и ошибки перекрёстной
+        # проверки: ошибка без точки i равна c_i / (B**-1)_ii
+        M, d = self.U.shape
+        self.mean = self.Y.mean(axis=0)
+        self.std = np.where(self.Y.std(axis=0) > 0, self.Y.std(axis=0), 1)
+        poly = np.hstack([np.ones((M, 1)), self.U])
+        B = np.zeros((M + d + 1, M + d + 1))
+        B[:M, :M] = kernel(self.U, self.U)
+        B[:M, M:] = poly
+        B[M:, :M] = poly.T
+        rhs = np.zeros((M + d + 1, len(OUTPUTS)))
+        rhs[:M] = (self.Y - self.mean) / self.std
+
+        Binv = np.linalg.inv(B)
+        self.coef = Binv @ rhs
+        loo = self.coef[:M] / np.diag(Binv)[:M, None] * self.std
+        self.error = {
+            name: (
+                float(np.sqrt((loo[:, k] ** 2).mean())),
+                float(np.abs(loo[:, k]).max()),
+            )
+            for k, name in enumerate(OUTPUTS)
+        }
+
+        # Область доверия: наибольшее расстояние от точки плана до ближайшей другой
+        dist = kernel(self.U, self.U) ** (1 / 3)
+        np.fill_diagonal(dist, np.inf)
+        self.radius = self.trust * dist.min(axis=1).max()
+
+    def points(self, batch):
+
+        # Точки запроса: массив (точка x параметр) или словарь параметров, как у
+        # ансамбля; не заданные параметры - исходные значения
+        if not isinstance(batch, dict):
+            return np.atleast_2d(np.asarray(batch, dtype=float))
+        M = len(next(iter(batch.values())))
+        X = np.zeros((M, len(self.names)))
+        for p, (key, i) in enumerate(self.names):
+            if key in batch:
+                value = np.asarray(batch[key], dtype=float)
+                X[:, p] = value if i is None else value[:, i]
+            else:
+                X[:, p] = self.DT[key] if i is None else self.DT[key][i]
+        return X
+
+    def predict(self, batch):
+
+        # Величины на выходе для пакета точек; точки вне области доверия
+        # рассчитываются цепочкой. trusted - точки, рассчитанные по модели
+        X = self.points(batch)
+        U = (X - self.lo) / (self.hi - self.lo)
+        K = kernel(U, self.U)
+        Y = (
+            K @ self.coef[: len(self.U)]
+            + self.coef[len(self.U)]
+            + U @ self.coef[len(self.U) + 1 :]
+        )
+        Y = Y * self.std + self.mean
+
+        inside = np.all((U >= 0) & (U <= 1), axis=1)
+        near = K.min(axis=1) ** (1 / 3) <= self.radius
+        self.trusted = inside & near
+        if not self.trusted.all():
+            Y[~self.trusted] = self.evaluate(X[~self.trusted])
+        return {name: Y[:, k] for k, name in enumerate(OUTPUTS)}
+
+    def save(self, filepath):
+
+        # Модель, интервалы параметров и исходные данные - в один файл .npz
+        data = {
+            key: np.asarray(v).tolist() if isinstance(v, np.ndarray) else v
+            for key, v in self.DT.items()
+        }
+        np.savez_compressed(
+            filepath,
+            names=np.array(
+                ["%s:%s" % (key, "" if i is None else i) for key, i in self.names]
+            ),
+            lo=self.lo,
+            hi=self.hi,
+            U=self.U,
+            Y=self.Y,
+            settings=np.array([self.rk or 0, self.fast or 0, self.trust]),
+            data=np.array(toml.dumps(data)),
+        )
+
+    def restore(self, filepath):
+
+        # Загрузка модели, сохранённой save; интерполяция строится заново по точкам
+        with np.load(filepath) as io:
+            self.names = []
+            for name in io["names"]:
+                key, i = str(name).split(":")
+                self.names.append((key, int(i) if i else None))
+            self.lo, self.hi = io["lo"], io["hi"]
+            self.U, self.Y = io["U"], io["Y"]
+            rk, fast, self.trust = io["settings"]
+            self.rk, self.fast = rk or None, fast or None
+            self.DT = toml.loads(str(io["data"]))
+        self.build()
+
+
+if __name__ == "__main__":
+
+    import time
+
+    SU = Surrogate()
+    SU.load(r"Project_HGD\Data_HGD_input.toml")
+    SU.workers = 4
+    start = time.perf_counter()
+    SU.fit(500, seed=1)
+    print("Построение по 500 точкам, с: %.2f" % (time.perf_counter() - start))
+    for name, (rms, worst) in SU.error.items():
+        print(
+            "Ошибка %s (перекрёстная проверка): ср. кв. %.4g, наибольшая %.4g"
+            % (name, rms, worst)
+        )
+
+    # Пакет случайных запросов внутри интервалов
+    rng = np.random.default_rng(2)
+    X = SU.lo + rng.random((10000, len(SU.names))) * (SU.hi - SU.lo)
+    start = time.perf_counter()
+    out = SU.predict(X)
+    print(
+        "10000 запросов, с: %.3f, по модели: %d"
+        % (time.perf_counter() - start, SU.trusted.sum())
+    )
@@ -0,0 +1,136 @@
+# Модуль перебора вариантов исходных данных на нескольких процессах.
+#
+# Варианты задаются файлом toml, в котором каждому параметру Data_HGD_input.toml
+# сопоставлен список значений, например:
+#
+#   L = [[5000, 6000, 6400], [4000, 5000, 5000]]
+#   Dt = [0.2, 0.25, 0.3]
+#   alphav = [0.5, 1.0]
+#
+# Рассчитываются все сочетания значений (здесь 2 x 3 x 2 = 12 вариантов). Каждый вариант
+# считается всей цепочкой в памяти отдельного процесса (run_system), так что общего
+# файла Data_HGD_output у разных вариантов нет. С общим кэшем (--cache) варианты,
+# различающиеся только параметрами последующих блоков, не пересчитывают предыдущие.
+
+import argparse
+import csv
+import itertools
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import toml
+
+from .HGD_Store import load_data
+from .HGD_System import run_system
+
+
+def cases(spec):
+
+    # Все сочетания значений перебираемых параметров
+    keys = list(spec)
+    for values in itertools.product(*(spec[key] for key in keys)):
+        yield dict(zip(keys, values))
+
+
+def run_case(DT, case, cache=None, fast=None):
+
+    # Расчёт одного варианта всей цепочкой в памяти процесса, профили не сохраняются
+    t0 = time.perf_counter()
+    result = run_system(
+        dict(DT, **case), output="end", cache=cache, fast=fast
+    ).summary()
+    result["time"] = time.perf_counter() - t0
+    return result
+
+
+def sweep(filepath, spec, workers=None, cache=None, fast=None):
+
+    # Перебор вариантов на пуле процессов, результат - таблица (вариант, итоги)
+    DT = load_data(filepath)
+    variants = list(cases(spec))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(
+            pool.map(
+                run_case,
+                itertools.repeat(DT),
+                variants,
+                itertools.repeat(cache),
+                itertools.repeat(fast),
+                chunksize=1,
+            )
+        )
+
+    return list(zip(variants, results))
+
+
+def parse_spec(filepath=None, sets=()):
+
+    # Перебираемые параметры из файла toml и из аргументов вида key=[v1, v2]
+    spec = toml.load(filepath) if filepath else {}
+    for item in sets:
+        spec.update(toml.loads(item))
+    return spec
+
+
+def write_table(rows, io):
+
+    # Итоговая таблица: перебираемые параметры, суммарный дебит пластов, расход,
+    # давление и температура на выходе общего трубопровода, время расчёта
+    keys = list(rows[0][0]) if rows else []
+    writer = csv.writer(io)
+    writer.writerow(keys + ["Q", "G", "P", "T", "time"])
+    for case, result in rows:
+        writer.writerow(
+            [case[key] for key in keys]
+            + [result[name] for name in ("Q", "G", "P", "T", "time")]
+        )
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        prog="python -m Project_HGD.HGD_Sweep",
+        description="Перебор вариантов исходных данных на нескольких процессах.",
+    )
+    parser.add_argument("base", help="базовый файл исходных данных toml")
+    parser.add_argument("spec", nargs="?", help="файл toml с перебираемыми значениями")
+    parser.add_argument(
+        "-s",
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=[...]",
+        help="перебираемый параметр, например -s 'Dt=[0.2, 0.25]'",
+    )
+    parser.add_argument("-j", "--workers", type=int, help="число процессов")
+    parser.add_argument("-o", "--output", help="файл csv для итоговой таблицы")
+    parser.add_argument("--cache", help="каталог кэша результатов блоков")
+    parser.add_argument(
+        "--fast",
+        type=float,
+        metavar="TOL",
+        help="быстрый расчёт трубопроводов по формуле Шухова с точностью TOL",
+    )
+    args = parser.parse_args(argv)
+
+    spec = parse_spec(args.spec, args.set)
+    t0 = time.perf_counter()
+    rows = sweep(args.base, spec, args.workers, args.cache, args.fast)
+
+    if args.output:
+        with open(args.output, "w", newline="") as io:
+            write_table(rows, io)
+    else:
+        write_table(rows, sys.stdout)
+
+    print(
+        "Вариантов: %d, время: %.2f с" % (len(rows), time.perf_counter() - t0),
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+
+    main()
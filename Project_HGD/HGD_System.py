@@ -0,0 +1,110 @@
+# Модуль расчёта всей системы "пласт - скважина - трубопровод" за один вызов.
+#
+# Результаты блоков передаются следующим блокам массивами в памяти, без промежуточного
+# файла Data_HGD_output. На диск результаты пишутся только по запросу (persist).
+# С кэшем (cache) блоки, исходные данные которых не изменились, не пересчитываются.
+
+from .HGD_Cache import Cache
+from .HGD_Pl import Plast
+from .HGD_Skv import SKV
+from .HGD_Store import load_data
+from .HGD_Tr123 import Tr123
+from .HGD_TrO import TrO
+
+
+class SystemResult:
+    def __init__(self, PL, SK, TR, TO):
+
+        # Рассчитанные блоки системы
+        self.plast = PL
+        self.skv = SK
+        self.tr = TR
+        self.tro = TO
+
+        # Суммарный объемный дебит пластов, м**3/с
+        self.Q = float(PL.Q.sum())
+        # Расход, давление и температура на выходе общего трубопровода
+        self.G = float(TO.G1[0, -1])
+        self.P = float(TO.P1[0, -1])
+        self.T = float(TO.T1[0, -1])
+
+    def summary(self):
+
+        return {"Q": self.Q, "G": self.G, "P": self.P, "T": self.T}
+
+
+def run_system(
+    config, persist=None, verbose=False, output="full", cache=None, rk=None, fast=None
+):
+
+    # config - путь к Data_HGD_input.toml или уже загруженный словарь исходных данных,
+    # persist - каталог (или файл .toml) для выгрузки результатов, как у цепочки __main__,
+    # output - правило выгрузки профилей, общее или словарь {"skv": ..., "tr": ..., "tro": ...},
+    # cache - каталог кэша результатов блоков или объект Cache,
+    # rk - точность расчёта скважин и трубопроводов с переменным шагом (None - по N сечениям),
+    # fast - точность быстрого расчёта трубопроводов по формуле Шухова
+    DT = load_data(config)
+    if not isinstance(output, dict):
+        output = {"skv": output, "tr": output, "tro": output}
+    if isinstance(cache, str):
+        cache = Cache(cache)
+
+    def solve(stage, upstream=None):
+
+        # Расчёт блока или выбор его результата из кэша, возвращает ключ результата
+        if cache is None:
+            stage.solve()
+            return None
+        return cache.run(stage, upstream)
+
+    PL = Plast()
+    PL.verbose = verbose
+    PL.load(DT)
+    PL.solve()
+    key = cache.key(PL) if cache is not None else None
+
+    SK = SKV()
+    SK.output = output.get("skv", "full")
+    SK.rk = rk
+    SK.load(DT, {"Qpl": PL.Q})
+    key = solve(SK, key)
+
+    TR = Tr123()
+    TR.output = output.get("tr", "full")
+    TR.rk = rk
+    TR.fast = fast
+    TR.load(DT, {"Qpl": PL.Q, "Pskv": SK.P1, "Gskv": SK.G1, "Tskv": SK.T1})
+    key = solve(TR, key)
+
+    TO = TrO()
+    TO.output = output.get("tro", "full")
+    TO.rk = rk
+    TO.fast = fast
+    TO.load(
+        DT,
+        {
+            "Qpl": PL.Q,
+            "Pskv": SK.P1,
+            "Gskv": SK.G1,
+            "Tskv": SK.T1,
+            "Ptr": TR.P1,
+            "Gtr": TR.G1,
+            "Ttr": TR.T1,
+        },
+    )
+    solve(TO, key)
+
+    if persist is not None:
+        for stage in (PL, SK, TR, TO):
+            stage.dump(persist)
+
+    return SystemResult(PL, SK, TR, TO)
+
+
+if __name__ == "__main__":
+
+    RS = run_system(r"Project_HGD\Data_HGD_input.toml", verbose=True)
+
+    print("Расход на выходе общего трубопровода, кг/с:", RS.G)
+    print("Давление на выходе общего трубопровода, Па:", RS.P)
+    print("Температура на выходе общего трубопровода, К:", RS.T)
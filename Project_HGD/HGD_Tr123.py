@@ -2,25 +2,84 @@
 
 # Для построения графиков и их исследований
 import matplotlib.pyplot as plt
-import math
-
-# Востребователен для натуральных логарифмов и квадратных корней
-from numpy import zeros
-
-# Нужен для подгрузки данных, таких как  P, T, po и т.д. из готового файла, чтобы избежать бесконечных импутов
-import toml
-
 
+# Векторные вычисления сразу по всем трубопроводам
+import numpy as np
+
+from .HGD_Corr import Correlations
+from .HGD_Fluid import fluid
+from .HGD_Prof import instrument
+from .HGD_RK import dopri
+from .HGD_Store import (
+    dump_data,
+    endpoints,
+    load_data,
+    open_profile,
+    output_columns,
+    output_nodes,
+    release,
+    save_profile,
+)
+
+# Цвета графиков по номеру трубопровода
+COLORS = ["orange", "green", "blue"]
+
+
+@instrument
 class Tr123:
+    # Исходные данные, которые читает расчёт, и сохраняемые в кэше результаты
+    KEYS = (
+        "N3",
+        "muN0",
+        "Dt",
+        "alphav",
+        "OTsheroh",
+        "thickT",
+        "betaN",
+        "betaV",
+        "CN",
+        "CV",
+        "L",
+        "lyambdaGr",
+        "lyambdaN0",
+        "lyambdaV",
+        "po",
+        "E",
+        "Tgr",
+        "H",
+        "g",
+        "Re1",
+        "Re2",
+        "pi",
+        "pov",
+        "rc",
+        "pvt",
+    )
+    RESULTS = ("nodes", "v1", "po1", "T1", "P1", "G1", "nu")
+    # Результаты предыдущих блоков, которые читает расчёт, и передаваемые далее результаты
+    INPUTS = ("Qpl", "Pskv", "Gskv", "Tskv")
+    OUTPUTS = {"Ptr": "P1", "Gtr": "G1", "Ttr": "T1"}
+
     def __init__(self):
 
-        pass
+        # Правило выгрузки профилей: "full" - все сечения, целое k - каждое k-е,
+        # "end" - только начало и конец
+        self.output = "full"
+        # Каталог для профилей на диске и размер пачки трубопроводов (режим месторождения)
+        self.store = None
+        self.chunk = None
+        # Точность расчёта с переменным шагом, None - расчёт по N сечениям
+        self.rk = None
+        # Точность быстрого расчёта по формуле Шухова, None - расчёт по N сечениям
+        self.fast = None
+        # Наблюдатель шагов расчёта по сечениям: observer(блок, строки, j, величины)
+        self.observer = None
 
     def load(self, filepath1, filepath2):
 
         # Подключение и интерпретация файла данных Data_HGD_input.toml и Data_HGD_output.toml
-        self.DT = toml.load(filepath1)
-        self.DT2 = toml.load(filepath2)
+        self.DT = load_data(filepath1)
+        self.DT2 = load_data(filepath2)
 
         # Блок ввода исходных параметров системы.
 
@@ -67,7 +126,7 @@ class Tr123:
         # Глубина пролегания трубопроводов, м
         self.H = self.DT["H"]
         self.Qpl = self.DT2["Qpl"]
-        self.Ppl = self.DT2["Ppl"]
+        self.Ppl = self.DT2.get("Ppl", [])
         # Ускорение свободного падения
         self.g = self.DT["g"]
         # Критические числа Рейнольдса
@@ -85,224 +144,480 @@ class Tr123:
         self.gradT = self.DT["gradT"]
         self.Tskv = self.DT2["Tskv"]
 
-        # Задание списков физических параметров для системы скважины
-        self.v1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.po1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.T1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.P1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.G1 = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-        self.nu = [[0 for _ in range(self.N + 1)] for _ in range(3)]
-
-        self.deltaX = [0, 0, 0]
-        self.lyambda2 = [0, 0, 0]
-        self.x = []
-
-    def solve(self):
-
-        # Внутренний диаметр трубопровода
-        self.Dt = self.Dt - (2 * self.thick)  # внутренний диаметр
-
-        # Площадь сечения трубопроводов
-        S1 = (self.pi * (self.Dt**2)) / 4
-
-        # Глубина пролегания трубопроводов, до центра сечения трубы, м
-        self.H = self.H + (self.Dt / 2)
-
-        # Предварительные расчёты и интерпретация исходных данных
-        for i in range(3):
-
-            Pskv = self.DT2["Pskv"]
-            self.P1[i][0] = Pskv[i][-1]
-
-            Gskv = self.DT2["Gskv"]
-
-            Tskv = self.DT2["Tskv"]
-
-            # Расчёт начальных температур
-            self.T1[i][0] = Tskv[i][-1]
-
-            # Рассчёт начальной плотности смеси
-            self.po1[i][0] = (self.po / (1 + (self.betaN * (self.T1[i][0] - 293)))) * (
-                1 - self.alphav
-            ) + (self.pov / (1 + (self.betaV * (self.T1[i][0] - 293)))) * self.alphav
-
-            # Начальных расход, берётся из рассчёта скважин, кг/с
-            self.G1[i][0] = Gskv[i][-1]
-
-            # Рассчёт начальной скорости потока
-            self.v1[i][0] = self.G1[i][0] / (self.po1[i][0] * S1)
-
-            # Рассчёт шага разбиения
-            self.deltaX[i] = self.L[i] / self.N
+    def field(self, dirpath, chunk=1000):
 
-            # Задание списка разбиения трубопроводов
-            X = [self.deltaX[i] * _ for _ in range(self.N + 1)]
-            self.x.append(X)
+        # Режим месторождения: профили пишутся в файлы каталога dirpath,
+        # трубопроводы рассчитываются пачками по chunk штук
+        self.store = dirpath
+        self.chunk = chunk
 
-            self.lyambda2[i] = 0.11 * (((68 / self.Re2) + self.OTsheroh) ** 0.25)
+    def alloc(self, name):
 
-        # Формула вязкости Эйнштейна для смеси воды и нефти
-        muN = self.muN0 * (1 + 2.5 * self.alphav)
-
-        lyambda1 = 64 / self.Re1
-
-        # Рассчёт теплоёмкости смеси
-        C = self.CN * (1 - self.alphav) + self.CV * self.alphav
+        # Массив профиля (трубопровод x сечение) в памяти или на диске
+        if self.store is None:
+            return np.zeros((self.n, len(self.nodes)))
+        return open_profile(self.store, name, (self.n, len(self.nodes)))
 
-        # Рассчёт теплопроводности смеси
-        lyambdaN = self.lyambdaN0 * (1 - self.alphav) + self.lyambdaV * self.alphav
+    def block(self, sl):
 
-        # Рассчёт трубопроводов по сечениям
-        for i in range(3):
+        # Строки профилей для пачки sl: срезы массивов в памяти или временные массивы
+        if self.store is None:
+            return (
+                self.v1[sl],
+                self.po1[sl],
+                self.T1[sl],
+                self.P1[sl],
+                self.G1[sl],
+                self.nu[sl],
+            )
+        m = len(range(self.n)[sl])
+        return tuple(np.zeros((m, len(self.nodes))) for _ in range(6))
 
-            for j in range(0, self.N):
+    def prepare(self):
 
-                dzeta = 0
+        # Количество трубопроводов берётся из длины списка L
+        self.n = len(self.L)
 
-                # Уравнение плотности
-                self.po1[i][j + 1] = (
-                    self.po / (1 + (self.betaN * (self.T1[i][j] - 293)))
-                ) * (1 - self.alphav) + (
-                    self.pov / (1 + (self.betaV * (self.T1[i][j] - 293)))
-                ) * self.alphav
+        # Рассчёт шага разбиения
+        self.deltaX = np.asarray(self.L, dtype=float) / self.N
 
-                # Формула для вычисления кинематической вязкости смеси
-                self.nu[i][j] = muN / self.po1[i][j]
+        # Свойства смеси нефти и воды (модуль HGD_Fluid)
+        self.fluid = fluid(self)
 
-                # Скорость и расход
-                self.v1[i][j + 1] = (self.po1[i][j] * self.v1[i][j]) / (
-                    self.po1[i][j + 1]
-                )
+    def solve(self):
 
-                # Потери давления, определение числа Рейнольдса
-                Re = (self.v1[i][j] * self.Dt) / self.nu[i][j]
-
-                # Определение lyambdaT по условиям числа Рейнольдса
-                if Re == self.Re2:
-                    lyambdaT = self.lyambda2[i]
-
-                # Для ламинарного режима
-                elif Re <= self.Re1:
-                    lyambdaT = lyambda1
-
-                # Для переходного режима
-                elif self.Re1 < Re <= self.Re2:
-                    lyambdaT = lyambda1 + (
-                        (self.lyambda2[i] - lyambda1) / (self.Re2 - self.Re1)
-                    ) * (Re - self.Re1)
-                elif self.Re2 < Re <= 500 / self.OTsheroh:
-                    lyambdaT = 0.067 * (((158 / Re) + 2 * self.OTsheroh) ** 0.2)
-                elif Re > 500 / self.OTsheroh:
-                    lyambdaT = 0.067 * ((2.136 * self.OTsheroh) ** 0.2)
-
-                lyambdaTr = (1.05 * lyambdaT) / (self.E**2)
-
-                # Работа сил трения на участке deltaX, ф. Вейсбаха-Дарси
-                deltaPtr = (
-                    lyambdaTr
-                    * (self.deltaX[i] / self.Dt)
-                    * self.po1[i][j]
-                    * ((self.v1[i][j] ** 2) / 2)
+        self.prepare()
+
+        if self.rk is not None:
+            self.adaptive()
+            return
+        if self.fast is not None:
+            self.shukhov()
+            return
+
+        # Сохраняемые сечения профилей
+        self.nodes = output_nodes(self.N, self.output)
+
+        # Задание массивов физических параметров для системы трубопроводов
+        self.v1 = self.alloc("vtr")
+        self.po1 = self.alloc("potr")
+        self.T1 = self.alloc("Ttr")
+        self.P1 = self.alloc("Ptr")
+        self.G1 = self.alloc("Gtr")
+        self.nu = self.alloc("nutr")
+
+        # Трубопроводы рассчитываются пачками, чтобы временные массивы не росли с их числом
+        chunk = self.chunk or self.n
+        for a in range(0, self.n, chunk):
+            self.march(slice(a, min(a + chunk, self.n)))
+
+    def adaptive(self):
+
+        # Расчёт с переменным шагом и точностью self.rk (модуль HGD_RK)
+        f, y0, G, P0, S1 = self.ode()
+        x, y, self.stats = dopri(f, y0, self.rk)
+        self.profiles(x, y, G, S1, P0)
+
+    def profiles(self, x, y, G, S1, P0):
+
+        # Профили по узлам x (доли длины) и состояниям y = (P, T) в них. Номера сечений
+        # nodes дробные (в единицах шага L / N)
+        keep = output_nodes(len(x) - 1, self.output)
+        self.nodes = x[keep] * self.N
+        self.P1 = y[keep, 0].T
+        self.T1 = y[keep, 1].T
+
+        # Давление в начале - до местных потерь на входе, как при расчёте по сечениям
+        self.P1[:, 0] = P0
+
+        # Профили по узлам (узел x строка) с параметрами строк, затем (строка x узел)
+        T = y[keep, 1]
+        po = self.fluid.rho(T)
+        self.po1 = po.T
+        self.v1 = (G / (po * S1)).T
+        self.G1 = (G * np.ones((len(keep), 1))).T
+        self.nu = (self.fluid.muN / po).T
+
+        if self.store is not None:
+            for name, value in zip(
+                ("vtr", "potr", "Ttr", "Ptr", "Gtr", "nutr"),
+                (self.v1, self.po1, self.T1, self.P1, self.G1, self.nu),
+            ):
+                save_profile(self.store, name, value)
+
+    def shukhov(self):
+
+        # Быстрый расчёт по формулам, без шагов по сечениям. Число Рейнольдса
+        # Re = G * Dt / (S1 * muN) по длине трубопровода не меняется, поэтому режим течения,
+        # коэффициенты трения и Кориолиса постоянны. На участке с постоянным коэффициентом
+        # теплопередачи k температура следует формуле Шухова, давление - проинтегрированной
+        # формуле Дарси - Вейсбаха. При ламинарном и переходном режимах k зависит от
+        # температуры (через число Грасгофа), поэтому число участков m удваивается, пока
+        # изменение k на участке не станет меньше self.fast (не более N участков)
+        L = np.asarray(self.L, dtype=float)
+        rc = np.asarray(self.rc, dtype=float)
+        Dt = self.Dt - (2 * self.thick)
+        S1 = (self.pi * (Dt**2)) / 4
+        H = self.H + (Dt / 2)
+
+        density = self.fluid.rho
+
+        # Начальное состояние - последнее сечение скважин, с местными потерями на входе
+        P0 = np.array(endpoints(self.Pskv), dtype=float)
+        T0 = np.array(endpoints(self.Tskv), dtype=float)
+        G = np.array(endpoints(self.Gskv), dtype=float)
+        po0 = density(T0)
+        v0 = G / (po0 * S1)
+        dzeta = (1 - (rc * 2 - (2 * self.thick)) / S1) ** 2 * 0.762
+        P1 = P0 - dzeta * po0 * ((v0**2) / 2)
+
+        muN = self.fluid.muN
+        C = self.fluid.C
+        lyambdaN = self.fluid.lyambdaN
+        Pr = self.fluid.Pr
+        alphaGr = (2 * self.lyambdaGr) / (
+            Dt * (np.log((2 * H) / Dt) + np.sqrt((((2 * H) / Dt) ** 2) - 1))
+        )
+
+        # Корреляции трения и теплоотдачи при постоянном по длине числе Рейнольдса
+        corr = Correlations(
+            G * Dt / (S1 * muN),
+            self.Re1,
+            self.Re2,
+            self.OTsheroh,
+            self.E,
+            Pr,
+            lyambdaN,
+            Dt,
+        )
+
+        def heat(T):
+
+            # Коэффициент теплопередачи в грунт при температуре T
+            nu = muN / density(T)
+            Gr = (self.g * (self.deltaX**3) * self.betaN * (T - self.Tgr)) / nu**2
+            alphaSS = corr.alphaSS(Gr)
+            return 1 / (
+                (1 / (alphaSS * Dt))
+                + ((1 / (2 * lyambdaN)) * np.log(Dt / Dt))
+                + (1 / (alphaGr * Dt))
+            )
+
+        m = 1
+        while True:
+            x = np.linspace(0, 1, m + 1)
+            y = [np.array([P1, T0])]
+            P, T, po, v = P1, T0, po0, v0
+            err = 0
+            for _ in range(m):
+
+                # Формула Шухова с k, уточнённым по температуре в конце участка
+                l = L / m
+                k = heat(T)
+                T2 = self.Tgr + (T - self.Tgr) * np.exp(-k * self.pi * Dt * l / (C * G))
+                k2 = heat(T2)
+                err = max(err, np.max(np.abs(k2 - k) / (k + k2) * 2))
+                T2 = self.Tgr + (T - self.Tgr) * np.exp(
+                    -(k + k2) / 2 * self.pi * Dt * l / (C * G)
                 )
 
-                if i == 0 or i == 2:
-
-                    # потери на повороте 45 для 1 и 3 трубопроводов
-                    if j == self.N + 1:
-                        dzeta = 0.44
-
-                if j == 0:
-                    dzeta = (1 - (self.rc[i] * 2 - (2 * self.thick)) / S1) ** 2 * 0.762
-
-                # Местные потери давления
-                deltaPmest = dzeta * self.po1[i][j] * ((self.v1[i][j] ** 2) / 2)
-
-                # Суммарные потери давления
-                deltaP = deltaPtr + deltaPmest
-
-                # Подвод теплоты
-
-                # Коэффициент теплоотдачи alphaGr от стенки трубопровода к грунту (формула Форхгеймера - Власова), Вт/м**2 * K
-                alphaGr = (2 * self.lyambdaGr) / (
-                    self.Dt
-                    * (
-                        math.log((2 * self.H) / self.Dt)
-                        + math.sqrt((((2 * self.H) / self.Dt) ** 2) - 1)
-                    )
+                # Уравнение Бернулли для участка с потерями на трение
+                po2 = density(T2)
+                v2 = G / (po2 * S1)
+                P = po2 * (
+                    (P / po)
+                    + (corr.alphak * ((v**2) / 2))
+                    - (corr.alphak * ((v2**2) / 2))
+                    - corr.lyambdaTr * (l / Dt) * (((v**2) + (v2**2)) / 4)
                 )
+                T, po, v = T2, po2, v2
+                y.append(np.array([P, T]))
+
+            if err <= self.fast or m >= self.N:
+                break
+            m *= 2
+
+        self.stats = {"segments": m}
+        self.profiles(x, np.array(y), G, S1, P0)
+
+    def ode(self):
+
+        # Уравнения трубопроводов в виде системы ОДУ для давления и температуры по доле
+        # длины x = 0..1: правая часть f(x, y), начальное состояние y0 = (P, T) после
+        # местных потерь на входе, массовый расход G, давление до потерь P0 и площадь S1
+        L = np.asarray(self.L, dtype=float)
+        rc = np.asarray(self.rc, dtype=float)
+        Dt = self.Dt - (2 * self.thick)
+        S1 = (self.pi * (Dt**2)) / 4
+        H = self.H + (Dt / 2)
+
+        # Плотность смеси и её производная по температуре
+        density = self.fluid.rho
+        ddensity = self.fluid.drho
+
+        # Начальное состояние - последнее сечение скважин
+        P0 = np.array(endpoints(self.Pskv), dtype=float)
+        T0 = np.array(endpoints(self.Tskv), dtype=float)
+        G = np.array(endpoints(self.Gskv), dtype=float)
+        po0 = density(T0)
+        v0 = G / (po0 * S1)
+
+        # Местные потери на входе в трубопровод
+        dzeta = (1 - (rc * 2 - (2 * self.thick)) / S1) ** 2 * 0.762
+        P1 = P0 - dzeta * po0 * ((v0**2) / 2)
+
+        muN = self.fluid.muN
+        C = self.fluid.C
+        lyambdaN = self.fluid.lyambdaN
+        Pr = self.fluid.Pr
+        alphaGr = (2 * self.lyambdaGr) / (
+            Dt * (np.log((2 * H) / Dt) + np.sqrt((((2 * H) / Dt) ** 2) - 1))
+        )
+
+        # Корреляции трения и теплоотдачи при постоянном по длине числе Рейнольдса
+        corr = Correlations(
+            G * Dt / (S1 * muN),
+            self.Re1,
+            self.Re2,
+            self.OTsheroh,
+            self.E,
+            Pr,
+            lyambdaN,
+            Dt,
+        )
+
+        def f(x, y):
+
+            P, T = y
+            po = density(T)
+            dpo = ddensity(T)
+            v = G / (po * S1)
+            nu = muN / po
+
+            # В числе Грасгофа - длина участка L / N, как при расчёте по сечениям
+            Gr = (self.g * (self.deltaX**3) * self.betaN * (T - self.Tgr)) / nu**2
+
+            # Коэффициент теплоотдачи от потока к стенке (модуль HGD_Corr)
+            alphaSS = corr.alphaSS(Gr)
+            k = 1 / (
+                (1 / (alphaSS * Dt))
+                + ((1 / (2 * lyambdaN)) * np.log(Dt / Dt))
+                + (1 / (alphaGr * Dt))
+            )
+
+            # Тепловой баланс и уравнение Бернулли на единицу длины
+            dT = k * self.pi * Dt * (self.Tgr - T) / (C * G)
+            dv = -v * dpo / po * dT
+            dP = (
+                po * (-(corr.alphak * v * dv) - corr.lyambdaTr / Dt * ((v**2) / 2))
+                + (P / po) * dpo * dT
+            )
+
+            return L * np.array([dP, dT])
+
+        return f, np.array([P1, T0]), G, P0, S1
+
+    def stream(self, sl=slice(None)):
+
+        # Потоковый расчёт без профилей: генератор состояний сечений трубопроводов sl,
+        # память не зависит от числа сечений N, перебор можно прервать в любом сечении
+        self.prepare()
+        yield from self.sections(sl)
+
+    def march(self, sl):
+
+        # Профили пачки: в режиме месторождения рассчитываются в памяти и затем
+        # целиком переносятся на диск
+        v1, po1, T1, P1, G1, nu1 = self.block(sl)
+
+        # Столбцы профилей для сохраняемых сечений
+        keep = output_columns(self.nodes, self.N)
+
+        # Запись сечения в профили, если оно сохраняется по правилу выгрузки
+        for s in self.sections(sl):
+            c = keep[s["j"]]
+            if c >= 0:
+                po1[:, c] = s["rho"]
+                v1[:, c] = s["v"]
+                T1[:, c] = s["T"]
+                P1[:, c] = s["P"]
+                G1[:, c] = s["G"]
+                nu1[:, c] = s["nu"]
+
+        if self.store is not None:
+            for profile, block in zip(
+                (self.v1, self.po1, self.T1, self.P1, self.G1, self.nu),
+                (v1, po1, T1, P1, G1, nu1),
+            ):
+                profile[sl] = block
+                release(profile)
+
+    def sections(self, sl):
+
+        # Генератор состояний трубопроводов пачки sl по сечениям j = 0..N:
+        # координата x, давление, температура, плотность, скорость, расход, вязкость,
+        # число Рейнольдса и режим течения (0 - ламинарный, 1 - переходный, 2 - турбулентный)
 
-                # Число Прандтля для нефти
-                Pr = (muN * C) / lyambdaN
-
-                # Число Грасгофа
-                Gr = (
-                    self.g
-                    * ((self.deltaX[i]) ** 3)
-                    * self.betaN
-                    * (self.T1[i][j] - self.Tgr)
-                ) / self.nu[i][j] ** 2
-
-                # Для ламинарного режима
-                alphaL = (
-                    0.17
-                    * (lyambdaN / self.Dt)
-                    * Re**0.33
-                    * Pr**0.43
-                    * Gr**0.1
-                    * 1
-                )
+        # Внутренний диаметр трубопровода
+        Dt = self.Dt - (2 * self.thick)
 
-                # Для турбулентного режима
-                alphaT = 0.021 * (lyambdaN / self.Dt) * Re**0.8 * Pr**0.43 * 1
+        # Площадь сечения трубопроводов
+        S1 = (self.pi * (Dt**2)) / 4
 
-                if Re <= self.Re1:
+        # Глубина пролегания трубопроводов, до центра сечения трубы, м
+        H = self.H + (Dt / 2)
 
-                    # Для ламинарного режима
-                    alphaSS = alphaL
+        deltaX = self.deltaX[sl]
+        rc = np.asarray(self.rc, dtype=float)[sl]
 
-                    # Коэффициент Кориолиса
-                    alphak = 2
+        # Предварительные расчёты и интерпретация исходных данных, берётся последнее
+        # сечение скважин
+        P = np.array(endpoints(self.Pskv[sl]), dtype=float)
 
-                elif Re >= self.Re2:
+        # Расчёт начальных температур
+        T = np.array(endpoints(self.Tskv[sl]), dtype=float)
 
-                    # Для турбулентного режима
-                    alphaSS = alphaT
+        # Рассчёт начальной плотности смеси
+        po = self.fluid.rho(T)
 
-                    # Коэффициент Кориолиса
-                    alphak = 1.1
+        # Начальных расход, берётся из рассчёта скважин, кг/с
+        G = np.array(endpoints(self.Gskv[sl]), dtype=float)
 
-                elif self.Re1 < Re < self.Re2:
+        # Рассчёт начальной скорости потока
+        v = G / (po * S1)
 
-                    # Для переходного режима
-                    alphaSS = alphaL + ((alphaT - alphaL) / 8000) * (Re - 2000)
+        # Формула вязкости Эйнштейна для смеси воды и нефти
+        muN = self.fluid.muN
 
-                    # Коэффициент Кориолиса
-                    alphak = (-1.169e-4 * Re) + 2.269
+        # Рассчёт теплоёмкости смеси
+        C = self.fluid.C
 
-                # Коэффициент теплопередачи К от теплоносителя в грунт для подземных трубопроводов, Вт/м**2 * K
-                k = 1 / (
-                    (1 / (alphaSS * self.Dt))
-                    + ((1 / (2 * lyambdaN)) * math.log(self.Dt / self.Dt))
-                    + (1 / (alphaGr * self.Dt))
+        # Рассчёт теплопроводности смеси
+        lyambdaN = self.fluid.lyambdaN
+
+        # Число Прандтля для нефти
+        Pr = self.fluid.Pr
+
+        # Коэффициент теплоотдачи alphaGr от стенки трубопровода к грунту (формула Форхгеймера - Власова), Вт/м**2 * K
+        alphaGr = (2 * self.lyambdaGr) / (
+            Dt * (np.log((2 * H) / Dt) + np.sqrt((((2 * H) / Dt) ** 2) - 1))
+        )
+
+        # Поворот на 45 градусов есть у 1 и 3 трубопроводов
+        turn = np.isin(np.arange(self.n)[sl], (0, 2))
+
+        # Корреляции трения и теплоотдачи: число Рейнольдса по длине не меняется,
+        # поэтому они вычисляются один раз по начальному сечению (модуль HGD_Corr)
+        corr = Correlations(
+            (v * Dt) / (muN / po),
+            self.Re1,
+            self.Re2,
+            self.OTsheroh,
+            self.E,
+            Pr,
+            lyambdaN,
+            Dt,
+        )
+
+        # Наблюдатель шагов (модуль HGD_Diag); без него в цикле - только проверка
+        observe = self.observer
+
+        # Рассчёт трубопроводов по сечениям, все трубопроводы пачки продвигаются одновременно
+        for j in range(0, self.N + 1):
+
+            dzeta = 0
+
+            # Формула для вычисления кинематической вязкости смеси
+            nu = muN / po
+
+            # Потери давления, определение числа Рейнольдса
+            Re = (v * Dt) / nu
+
+            yield {
+                "j": j,
+                "x": deltaX * j,
+                "P": P,
+                "T": T,
+                "rho": po,
+                "v": v,
+                "G": G,
+                "nu": nu,
+                "Re": Re,
+                "regime": corr.regime,
+            }
+
+            if j == self.N:
+                return
+
+            # Уравнение плотности
+            po2 = self.fluid.rho(T)
+
+            # Скорость и расход
+            v2 = (po * v) / po2
+
+            # Работа сил трения на участке deltaX, ф. Вейсбаха-Дарси
+            deltaPtr = corr.lyambdaTr * (deltaX / Dt) * po * ((v**2) / 2)
+
+            # потери на повороте 45 для 1 и 3 трубопроводов
+            if j == self.N + 1:
+                dzeta = 0.44 * turn
+
+            if j == 0:
+                dzeta = (1 - (rc * 2 - (2 * self.thick)) / S1) ** 2 * 0.762
+
+            # Местные потери давления
+            deltaPmest = dzeta * po * ((v**2) / 2)
+
+            # Суммарные потери давления
+            deltaP = deltaPtr + deltaPmest
+
+            # Подвод теплоты
+
+            # Число Грасгофа
+            Gr = (self.g * ((deltaX) ** 3) * self.betaN * (T - self.Tgr)) / nu**2
+
+            # Коэффициент теплоотдачи от потока к стенке (модуль HGD_Corr)
+            alphaSS = corr.alphaSS(Gr)
+
+            # Коэффициент теплопередачи К от теплоносителя в грунт для подземных трубопроводов, Вт/м**2 * K
+            k = 1 / (
+                (1 / (alphaSS * Dt))
+                + ((1 / (2 * lyambdaN)) * np.log(Dt / Dt))
+                + (1 / (alphaGr * Dt))
+            )
+
+            # Тепловой поток в окружающую среду, Дж/с
+            Qvn = k * self.pi * Dt * deltaX * (self.Tgr - T)
+
+            if observe is not None:
+                observe(
+                    self,
+                    sl,
+                    j,
+                    {
+                        "Re": Re,
+                        "lyambdaT": corr.lyambdaT,
+                        "alphaSS": alphaSS,
+                        "alphak": corr.alphak,
+                        "deltaPtr": deltaPtr,
+                        "Qvn": Qvn,
+                    },
                 )
 
-                # Тепловой поток в окружающую среду, Дж/с
-                Qvn = (
-                    k * self.pi * self.Dt * self.deltaX[i] * (self.Tgr - self.T1[i][j])
-                )
+            # Уравнение теплового баланса
+            T2 = T + (Qvn / (C * G))
 
-                # Уравнение теплового баланса
-                self.T1[i][j + 1] = self.T1[i][j] + (Qvn / (C * self.G1[i][j]))
+            # Уравнение Бернулли
+            P2 = po2 * (
+                (P / po)
+                + (corr.alphak * ((v**2) / 2))
+                - (corr.alphak * ((v2**2) / 2))
+                - (deltaP / po2)
+            )
 
-                # Уравнение Бернулли
-                self.P1[i][j + 1] = self.po1[i][j + 1] * (
-                    (self.P1[i][j] / self.po1[i][j])
-                    + (alphak * ((self.v1[i][j] ** 2) / 2))
-                    - (alphak * ((self.v1[i][j + 1] ** 2) / 2))
-                    - (deltaP / self.po1[i][j + 1])
-                )
+            G2 = po * v * S1
 
-                self.G1[i][j + 1] = self.po1[i][j] * self.v1[i][j] * S1
+            T, P, po, v, G = T2, P2, po2, v2, G2
 
     def dump(self, filepath):
 
@@ -316,20 +631,16 @@ class Tr123:
             "Gtr": self.G1,
             "Ttr": self.T1,
         }
-        with open(filepath, "w") as io:
-            toml.dump(self.DT2, io)
+        dump_data(filepath, self.DT2)
 
     def plot(self):
 
         # Построение графика
 
-        self.x[0] = [self.x[0][_] * (-1) for _ in range(0, self.N + 1)]
-        self.x[1] = [self.x[1][_] * (-1) for _ in range(0, self.N + 1)]
-        self.x[2] = [self.x[2][_] * (-1) for _ in range(0, self.N + 1)]
+        legend = ["Скважина №%d" % (i + 1) for i in range(self.n)]
 
-        self.P1[0] = [self.P1[0][_] / 1e6 for _ in range(0, self.N + 1)]
-        self.P1[1] = [self.P1[1][_] / 1e6 for _ in range(0, self.N + 1)]
-        self.P1[2] = [self.P1[2][_] / 1e6 for _ in range(0, self.N + 1)]
+        # Координата сечений трубопроводов
+        self.x = self.deltaX[:, None] * self.nodes
 
         fig = plt.figure(1)
         ax = fig.add_subplot(111)
@@ -342,10 +653,9 @@ class Tr123:
         plt.ylabel("Давление, МПа", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.x[0], self.P1[0], c="orange", linewidth=2)
-        plt.plot(self.x[1], self.P1[1], c="green", linewidth=2)
-        plt.plot(self.x[2], self.P1[2], c="blue", linewidth=2)
-        plt.legend(["Скважина №1", "Скважина №2", "Скважина №3"])
+        for i in range(self.n):
+            plt.plot(-self.x[i], self.P1[i] / 1e6, c=COLORS[i % 3], linewidth=2)
+        plt.legend(legend)
 
         fig = plt.figure(2)
         ax = fig.add_subplot(111)
@@ -358,10 +668,9 @@ class Tr123:
         plt.ylabel("Температура, К", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.x[0], self.T1[0], c="orange", linewidth=2)
-        plt.plot(self.x[1], self.T1[1], c="green", linewidth=2)
-        plt.plot(self.x[2], self.T1[2], c="blue", linewidth=2)
-        plt.legend(["Скважина №1", "Скважина №2", "Скважина №3"])
+        for i in range(self.n):
+            plt.plot(-self.x[i], self.T1[i], c=COLORS[i % 3], linewidth=2)
+        plt.legend(legend)
 
         fig = plt.figure(3)
         ax = fig.add_subplot(111)
@@ -374,19 +683,18 @@ class Tr123:
         plt.ylabel("Плотность, кг/м^3", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.x[0], self.po1[0], c="orange", linewidth=2)
-        plt.plot(self.x[1], self.po1[1], c="green", linewidth=2)
-        plt.plot(self.x[2], self.po1[2], c="blue", linewidth=2)
-        plt.legend(["Скважина №1", "Скважина №2", "Скважина №3"])
+        for i in range(self.n):
+            plt.plot(-self.x[i], self.po1[i], c=COLORS[i % 3], linewidth=2)
+        plt.legend(legend)
         plt.show()
 
 
 if __name__ == "__main__":
 
     PL = Tr123()
-    PL.load(r"Project_HGD\Data_HGD_input.toml", r"Project_HGD\Data_HGD_output.toml")
+    PL.load(r"Project_HGD\Data_HGD_input.toml", r"Project_HGD\Data_HGD_output")
     PL.solve()
-    PL.dump(r"Project_HGD\Data_HGD_output.toml")
+    PL.dump(r"Project_HGD\Data_HGD_output")
     PL.plot()
 
     print(PL)
@@ -1,26 +1,74 @@
-# Модуль рассчёта трубопроводов от 1, 2, 3 скважин.
+# Модуль рассчёта общего трубопровода, в который сходятся трубопроводы от скважин.
 
 # Для построения графиков и их исследований
 import matplotlib.pyplot as plt
-import math
 
-# Востребователен для натуральных логарифмов и квадратных корней
-from numpy import zeros
+# Векторные вычисления сразу по всем сценариям
+import numpy as np
 
-# Нужен для подгрузки данных, таких как  P, T, po и т.д. из готового файла, чтобы избежать бесконечных импутов
-import toml
+from .HGD_Corr import Correlations
+from .HGD_Fluid import fluid
+from .HGD_Prof import instrument
+from .HGD_RK import dopri
+from .HGD_Store import dump_data, endpoints, load_data, output_columns, output_nodes
 
+# Цвета графиков по номеру трубопровода
+COLORS = ["orange", "green", "blue"]
 
+
+@instrument
 class TrO:
+    # Исходные данные, которые читает расчёт, и сохраняемые в кэше результаты
+    KEYS = (
+        "N4",
+        "muN0",
+        "Dt",
+        "alphav",
+        "OTsheroh",
+        "thickT",
+        "betaN",
+        "betaV",
+        "CN",
+        "CV",
+        "LTrO",
+        "L",
+        "lyambdaGr",
+        "lyambdaN0",
+        "lyambdaV",
+        "po",
+        "E",
+        "Tgr",
+        "H",
+        "g",
+        "Re1",
+        "Re2",
+        "pi",
+        "pov",
+        "pvt",
+    )
+    RESULTS = ("nodes", "v1", "po1", "T1", "P1", "G1", "nu")
+    # Результаты предыдущих блоков, которые читает расчёт; общий трубопровод - последний
+    # блок системы, его результаты далее не передаются
+    INPUTS = ("Qpl", "Pskv", "Gskv", "Tskv", "Ptr", "Gtr", "Ttr")
+    OUTPUTS = {}
+
     def __init__(self):
 
-        pass
+        # Правило выгрузки профилей: "full" - все сечения, целое k - каждое k-е,
+        # "end" - только начало и конец
+        self.output = "full"
+        # Точность расчёта с переменным шагом, None - расчёт по N сечениям
+        self.rk = None
+        # Точность быстрого расчёта по формуле Шухова, None - расчёт по N сечениям
+        self.fast = None
+        # Наблюдатель шагов расчёта по сечениям: observer(блок, строки, j, величины)
+        self.observer = None
 
     def load(self, filepath1, filepath2):
 
         # Подключение и интерпретация файла данных Data_HGD_input.toml и Data_HGD_output.toml
-        self.DT = toml.load(filepath1)
-        self.DT2 = toml.load(filepath2)
+        self.DT = load_data(filepath1)
+        self.DT2 = load_data(filepath2)
 
         # Блок ввода исходных параметров системы.
 
@@ -84,18 +132,10 @@ class TrO:
         self.Gskv = self.DT2["Gskv"]
         self.gradT = self.DT["gradT"]
         self.Tskv = self.DT2["Tskv"]
-        self.Ppl = self.DT2["Ppl"]
+        self.Ppl = self.DT2.get("Ppl", [])
         self.Qpl = self.DT2["Qpl"]
         self.Ptr = self.DT2["Ptr"]
 
-        # Задание списков физических параметров для системы скважины
-        self.v1 = [0 for _ in range(self.N + 1)]
-        self.po1 = [0 for _ in range(self.N + 1)]
-        self.T1 = [0 for _ in range(self.N + 1)]
-        self.P1 = [0 for _ in range(self.N + 1)]
-        self.G1 = [0 for _ in range(self.N + 1)]
-        self.nu = [0 for _ in range(self.N + 1)]
-
     def dump(self, filepath):
 
         self.DT2 = {
@@ -108,10 +148,9 @@ class TrO:
             "Gtr": self.G1,
             "Ttr": self.T1,
         }
-        with open(filepath, "w") as io:
-            toml.dump(self.DT2, io)
+        dump_data(filepath, self.DT2)
 
-    def solve(self):
+    def prepare(self):
 
         # Внутренний диаметр трубопровода
 
@@ -121,205 +160,424 @@ class TrO:
         # Площадь сечения трубопроводов
         self.S1 = (self.pi * (dt**2)) / 4
 
-        # Глубина пролегания трубопроводов, до центра сечения трубы, м
-        self.H = self.H + (self.Dt / 2)
-
         # Предварительные расчёты и интерпретация исходных данных
         self.Pskv = self.DT2["Pskv"]
         self.Ptr = self.DT2["Ptr"]
         self.Gtr = self.DT2["Gtr"]
+        self.Ttr = self.DT2["Ttr"]
+
+        # Концы трубопроводов от скважин, по строке на сценарий (сценарий x трубопровод)
+        Gtr = endpoints(self.Gtr).reshape(-1, len(self.L))
+        Ttr = endpoints(self.Ttr).reshape(-1, len(self.L))
+        self.m = Gtr.shape[0]
 
         # Начальных расход, берётся из рассчёта скважин, кг/с
-        self.G1[0] = self.Gtr[0][-1] + self.Gtr[1][-1] + self.Gtr[2][-1]
-        Ttr = self.DT2["Ttr"]
+        self.G0 = Gtr.sum(axis=1)
 
         # Расчёт начальной температуры, с учётом подвода массы
-        self.T1[0] = (
-            Ttr[0][-1] * self.Gtr[0][-1]
-            + Ttr[1][-1] * self.Gtr[1][-1]
-            + Ttr[2][-1] * self.Gtr[2][-1]
-        ) / self.G1[0]
+        self.T0 = (Ttr * Gtr).sum(axis=1) / self.G0
+
+        # Рассчёт шага разбиения
+        self.deltaX = np.asarray(self.LTrO, dtype=float) / self.N
+
+        # Свойства смеси нефти и воды (модуль HGD_Fluid)
+        self.fluid = fluid(self)
+
+    def solve(self):
+
+        self.prepare()
+
+        if self.rk is not None:
+            self.adaptive()
+            return
+        if self.fast is not None:
+            self.shukhov()
+            return
+
+        # Сохраняемые сечения профилей
+        self.nodes = output_nodes(self.N, self.output)
+
+        # Задание массивов физических параметров общего трубопровода (сценарий x сечение)
+        self.v1 = np.zeros((self.m, len(self.nodes)))
+        self.po1 = np.zeros((self.m, len(self.nodes)))
+        self.T1 = np.zeros((self.m, len(self.nodes)))
+        self.P1 = np.zeros((self.m, len(self.nodes)))
+        self.G1 = np.zeros((self.m, len(self.nodes)))
+        self.nu = np.zeros((self.m, len(self.nodes)))
+
+        # Столбцы профилей для сохраняемых сечений
+        keep = output_columns(self.nodes, self.N)
+
+        # Запись сечения в профили, если оно сохраняется по правилу выгрузки
+        for s in self.sections():
+            c = keep[s["j"]]
+            if c >= 0:
+                self.po1[:, c] = s["rho"]
+                self.v1[:, c] = s["v"]
+                self.T1[:, c] = s["T"]
+                self.P1[:, c] = s["P"]
+                self.G1[:, c] = s["G"]
+                self.nu[:, c] = s["nu"]
+
+    def adaptive(self):
+
+        # Расчёт с переменным шагом и точностью self.rk (модуль HGD_RK)
+        f, y0 = self.ode()
+        x, y, self.stats = dopri(f, y0, self.rk)
+        self.profiles(x, y)
+
+    def profiles(self, x, y):
+
+        # Профили по узлам x (доли длины) и состояниям y = (P, T) в них. Номера сечений
+        # nodes дробные (в единицах шага LTrO / N)
+        keep = output_nodes(len(x) - 1, self.output)
+        self.nodes = x[keep] * self.N
+        self.P1 = y[keep, 0].T
+        self.T1 = y[keep, 1].T
+
+        # Давление в начале - до потерь на тройнике, как при расчёте по сечениям
+        self.P1[:, 0] = 4.2e6
+
+        # Профили по узлам (узел x строка) с параметрами строк, затем (строка x узел)
+        T = y[keep, 1]
+        po = self.fluid.rho(T)
+        self.po1 = po.T
+        self.v1 = (self.G0 / (po * self.S1)).T
+        self.G1 = (self.G0 * np.ones((len(keep), 1))).T
+        self.nu = (self.fluid.muN / po).T
+
+    def shukhov(self):
+
+        # Быстрый расчёт по формулам, без шагов по сечениям. Число Рейнольдса
+        # Re = G * Dt / (S1 * muN) по длине общего трубопровода не меняется, поэтому режим
+        # течения, коэффициенты трения и Кориолиса постоянны. На участке с постоянным коэффициентом
+        # теплопередачи k температура следует формуле Шухова, давление - проинтегрированной
+        # формуле Дарси - Вейсбаха. При ламинарном и переходном режимах k зависит от
+        # температуры (через число Грасгофа), поэтому число участков m удваивается, пока
+        # изменение k на участке не станет меньше self.fast (не более N участков)
+        L = self.LTrO
+        Dt = self.Dt
+        S1 = self.S1
+        H = self.H + (self.Dt / 2)
+
+        density = self.fluid.rho
+
+        # Начальное состояние - смесь потоков трубопроводов, с потерями на тройнике
+        G = self.G0
+        T0 = self.T0
+        po0 = density(T0)
+        v0 = G / (po0 * S1)
+        P1 = 4.2e6 - 0.23 * po0 * ((v0**2) / 2)
+
+        muN = self.fluid.muN
+        C = self.fluid.C
+        lyambdaN = self.fluid.lyambdaN
+        Pr = self.fluid.Pr
+        alphaGr = (2 * self.lyambdaGr) / (
+            Dt * (np.log((2 * H) / Dt) + np.sqrt((((2 * H) / Dt) ** 2) - 1))
+        )
+
+        # Корреляции трения и теплоотдачи при постоянном по длине числе Рейнольдса
+        corr = Correlations(
+            G * Dt / (S1 * muN),
+            self.Re1,
+            self.Re2,
+            self.OTsheroh,
+            self.E,
+            Pr,
+            lyambdaN,
+            Dt,
+        )
+
+        def heat(T):
+
+            # Коэффициент теплопередачи в грунт при температуре T
+            nu = muN / density(T)
+            Gr = (self.g * (self.deltaX**3) * self.betaN * (T - self.Tgr)) / nu**2
+            alphaSS = corr.alphaSS(Gr)
+            return 1 / (
+                (1 / (alphaSS * Dt))
+                + ((1 / (2 * lyambdaN)) * np.log(Dt / Dt))
+                + (1 / (alphaGr * Dt))
+            )
+
+        m = 1
+        while True:
+            x = np.linspace(0, 1, m + 1)
+            y = [np.array([P1, T0])]
+            P, T, po, v = P1, T0, po0, v0
+            err = 0
+            for _ in range(m):
+
+                # Формула Шухова с k, уточнённым по температуре в конце участка
+                l = L / m
+                k = heat(T)
+                T2 = self.Tgr + (T - self.Tgr) * np.exp(-k * self.pi * Dt * l / (C * G))
+                k2 = heat(T2)
+                err = max(err, np.max(np.abs(k2 - k) / (k + k2) * 2))
+                T2 = self.Tgr + (T - self.Tgr) * np.exp(
+                    -(k + k2) / 2 * self.pi * Dt * l / (C * G)
+                )
+
+                # Уравнение Бернулли для участка с потерями на трение
+                po2 = density(T2)
+                v2 = G / (po2 * S1)
+                P = po2 * (
+                    (P / po)
+                    + (corr.alphak * ((v**2) / 2))
+                    - (corr.alphak * ((v2**2) / 2))
+                    - corr.lyambdaTr * (l / Dt) * (((v**2) + (v2**2)) / 4)
+                )
+                T, po, v = T2, po2, v2
+                y.append(np.array([P, T]))
+
+            if err <= self.fast or m >= self.N:
+                break
+            m *= 2
+
+        self.stats = {"segments": m}
+        self.profiles(x, np.array(y))
+
+    def ode(self):
+
+        # Уравнения общего трубопровода в виде системы ОДУ для давления и температуры
+        # по доле длины x = 0..1: правая часть f(x, y) и начальное состояние y0 = (P, T)
+        # после потерь на тройнике
+        G = self.G0
+        T0 = self.T0
+        H = self.H + (self.Dt / 2)
+
+        # Плотность смеси и её производная по температуре
+        density = self.fluid.rho
+        ddensity = self.fluid.drho
+
+        po0 = density(T0)
+        v0 = G / (po0 * self.S1)
+
+        # Потери на тройнике
+        P0 = 4.2e6 - 0.23 * po0 * ((v0**2) / 2)
+
+        muN = self.fluid.muN
+        C = self.fluid.C
+        lyambdaN = self.fluid.lyambdaN
+        Pr = self.fluid.Pr
+        alphaGr = (2 * self.lyambdaGr) / (
+            self.Dt
+            * (np.log((2 * H) / self.Dt) + np.sqrt((((2 * H) / self.Dt) ** 2) - 1))
+        )
+
+        # Корреляции трения и теплоотдачи при постоянном по длине числе Рейнольдса
+        corr = Correlations(
+            G * self.Dt / (self.S1 * muN),
+            self.Re1,
+            self.Re2,
+            self.OTsheroh,
+            self.E,
+            Pr,
+            lyambdaN,
+            self.Dt,
+        )
+
+        def f(x, y):
+
+            P, T = y
+            po = density(T)
+            dpo = ddensity(T)
+            v = G / (po * self.S1)
+            nu = muN / po
+
+            # В числе Грасгофа - длина участка LTrO / N, как при расчёте по сечениям
+            Gr = (self.g * (self.deltaX**3) * self.betaN * (T - self.Tgr)) / nu**2
+
+            # Коэффициент теплоотдачи от потока к стенке (модуль HGD_Corr)
+            alphaSS = corr.alphaSS(Gr)
+            k = 1 / (
+                (1 / (alphaSS * self.Dt))
+                + ((1 / (2 * lyambdaN)) * np.log(self.Dt / self.Dt))
+                + (1 / (alphaGr * self.Dt))
+            )
+
+            # Тепловой баланс и уравнение Бернулли на единицу длины
+            dT = k * self.pi * self.Dt * (self.Tgr - T) / (C * G)
+            dv = -v * dpo / po * dT
+            dP = (
+                po * (-(corr.alphak * v * dv) - corr.lyambdaTr / self.Dt * ((v**2) / 2))
+                + (P / po) * dpo * dT
+            )
+
+            return self.LTrO * np.array([dP, dT])
+
+        return f, np.array([P0, T0])
+
+    def stream(self):
+
+        # Потоковый расчёт без профилей: генератор состояний сечений общего трубопровода,
+        # память не зависит от числа сечений N, перебор можно прервать в любом сечении
+        self.prepare()
+        yield from self.sections()
+
+    def sections(self):
+
+        # Генератор состояний общего трубопровода по сечениям j = 0..N для всех сценариев:
+        # координата x, давление, температура, плотность, скорость, расход, вязкость,
+        # число Рейнольдса и режим течения (0 - ламинарный, 1 - переходный, 2 - турбулентный)
+
+        # Глубина пролегания трубопроводов, до центра сечения трубы, м
+        H = self.H + (self.Dt / 2)
+
+        G = self.G0
+        T = self.T0
 
         # Расчет итогового давления, получаемого общим трубопроводом
-        self.P1[0] = 4.2e6
+        P = np.full(self.m, 4.2e6)
 
         # Рассчёт начальной плотности смеси
-        self.po1[0] = (self.po / (1 + (self.betaN * (self.T1[0] - 293)))) * (
-            1 - self.alphav
-        ) + (self.pov / (1 + (self.betaV * (self.T1[0] - 293)))) * self.alphav
+        po = self.fluid.rho(T)
 
         # Рассчёт начальной скорости потока
-        self.v1[0] = self.G1[0] / (self.po1[0] * self.S1)
-
-        # Рассчёт шага разбиения
-        deltaX = self.LTrO / self.N
-
-        # Задание списка разбиения трубопроводов
-        self.x = [deltaX * _ for _ in range(self.N + 1)]
+        v = G / (po * self.S1)
 
-        lyambda2 = 0.11 * (((68 / self.Re2) + self.OTsheroh) ** 0.25)
+        deltaX = self.deltaX
 
         # Формула вязкости Эйнштейна для смеси воды и нефти
-        muN = self.muN0 * (1 + 2.5 * self.alphav)
-
-        lyambda1 = 64 / self.Re1
+        muN = self.fluid.muN
 
         # Рассчёт теплоёмкости смеси
-        C = self.CN * (1 - self.alphav) + self.CV * self.alphav
+        C = self.fluid.C
 
         # Рассчёт теплопроводности смеси
-        lyambdaN = self.lyambdaN0 * (1 - self.alphav) + self.lyambdaV * self.alphav
+        lyambdaN = self.fluid.lyambdaN
+
+        # Число Прандтля для нефти
+        Pr = self.fluid.Pr
+
+        # Коэффициент теплоотдачи alphaGr от стенки трубопровода к грунту (формула Форхгеймера - Власова), Вт/м**2 * K
+        alphaGr = (2 * self.lyambdaGr) / (
+            self.Dt
+            * (np.log((2 * H) / self.Dt) + np.sqrt((((2 * H) / self.Dt) ** 2) - 1))
+        )
+
+        # Корреляции трения и теплоотдачи: число Рейнольдса по длине не меняется,
+        # поэтому они вычисляются один раз по начальному сечению (модуль HGD_Corr)
+        corr = Correlations(
+            (v * self.Dt) / (muN / po),
+            self.Re1,
+            self.Re2,
+            self.OTsheroh,
+            self.E,
+            Pr,
+            lyambdaN,
+            self.Dt,
+        )
+
+        # Наблюдатель шагов (модуль HGD_Diag); без него в цикле - только проверка
+        observe = self.observer
 
         # Рассчёт трубопроводов по сечениям
 
-        for j in range(0, self.N):
+        for j in range(0, self.N + 1):
 
             dzeta = 0
 
-            # Уравнение плотности
-            self.po1[j + 1] = (self.po / (1 + (self.betaN * (self.T1[j] - 293)))) * (
-                1 - self.alphav
-            ) + (self.pov / (1 + (self.betaV * (self.T1[j] - 293)))) * self.alphav
-
-            self.nu[j] = muN / self.po1[j]
-
-            # Скорость и расход
-            self.v1[j + 1] = (self.po1[j] * self.v1[j]) / (self.po1[j + 1])
+            nu = muN / po
 
             # Потери давления, определение числа Рейнольдса
-            Re = (self.v1[j] * self.Dt) / self.nu[j]
-
-            # Определение lyambdaT по условиям числа Рейнольдса
-            if Re == self.Re2:
-                lyambdaT = lyambda2
-
-            # Для ламинарного режима
-            elif Re <= self.Re1:
-                lyambdaT = lyambda1
+            Re = (v * self.Dt) / nu
+
+            yield {
+                "j": j,
+                "x": deltaX * j,
+                "P": P,
+                "T": T,
+                "rho": po,
+                "v": v,
+                "G": G,
+                "nu": nu,
+                "Re": Re,
+                "regime": corr.regime,
+            }
+
+            if j == self.N:
+                return
 
-            # Для переходного режима
-            elif self.Re1 < Re <= self.Re2:
-                lyambdaT = lyambda1 + (
-                    (lyambda2 - lyambda1) / (self.Re2 - self.Re1)
-                ) * (Re - self.Re1)
-            elif self.Re2 < Re <= 500 / self.OTsheroh:
-                lyambdaT = 0.067 * (((158 / Re) + 2 * self.OTsheroh) ** 0.2)
-            elif Re > 500 / self.OTsheroh:
-                lyambdaT = 0.067 * ((2.136 * self.OTsheroh) ** 0.2)
+            # Уравнение плотности
+            po2 = self.fluid.rho(T)
 
-            lyambdaTr = (1.05 * lyambdaT) / (self.E**2)
+            # Скорость и расход
+            v2 = (po * v) / po2
 
             # потери на тройнике
             if j == 0:
                 dzeta = 0.23
 
             # Работа сил трения на участке deltaX, ф. Вейсбаха-Дарси
-            deltaPtr = (
-                lyambdaTr * (deltaX / self.Dt) * self.po1[j] * ((self.v1[j] ** 2) / 2)
-            )
+            deltaPtr = corr.lyambdaTr * (deltaX / self.Dt) * po * ((v**2) / 2)
 
             # Местные потери давления
-            deltaPmest = dzeta * self.po1[j] * ((self.v1[j] ** 2) / 2)
+            deltaPmest = dzeta * po * ((v**2) / 2)
 
             # Суммарные потери давления
             deltaP = deltaPtr + deltaPmest
 
             # Подвод теплоты
 
-            # Коэффициент теплоотдачи alphaGr от стенки трубопровода к грунту (формула Форхгеймера - Власова), Вт/м**2 * K
-            alphaGr = (2 * self.lyambdaGr) / (
-                self.Dt
-                * (
-                    math.log((2 * self.H) / self.Dt)
-                    + math.sqrt((((2 * self.H) / self.Dt) ** 2) - 1)
-                )
-            )
-
-            # Число Прандтля для нефти
-            Pr = (muN * C) / lyambdaN
-
             # Число Грасгофа
-            Gr = (
-                self.g * ((deltaX) ** 3) * self.betaN * (self.T1[j] - self.Tgr)
-            ) / self.nu[j] ** 2
-
-            # Для ламинарного режима
-            alphaL = (
-                0.17 * (lyambdaN / self.Dt) * Re**0.33 * Pr**0.43 * Gr**0.1 * 1
-            )
-
-            # Для турбулентного режима
-            alphaT = 0.021 * (lyambdaN / self.Dt) * Re**0.8 * Pr**0.43 * 1
-
-            if Re <= self.Re1:
-
-                # Для ламинарного режима
-                alphaSS = alphaL
-
-                # Коэффициент Кориолиса
-                alphak = 2
-
-            elif Re >= self.Re2:
-
-                # Для турбулентного режима
-                alphaSS = alphaT
-
-                # Коэффициент Кориолиса
-                alphak = 1.1
-
-            elif self.Re1 < Re < self.Re2:
+            Gr = (self.g * ((deltaX) ** 3) * self.betaN * (T - self.Tgr)) / nu**2
 
-                # Для переходного режима
-                alphaSS = alphaL + ((alphaT - alphaL) / 8000) * (Re - 2000)
-
-                # Коэффициент Кориолиса
-                alphak = (-1.169e-4 * Re) + 2.269
+            # Коэффициент теплоотдачи от потока к стенке (модуль HGD_Corr)
+            alphaSS = corr.alphaSS(Gr)
 
             # Коэффициент теплопередачи К от теплоносителя в грунт для подземных трубопроводов, Вт/м**2 * K
             k = 1 / (
                 (1 / (alphaSS * self.Dt))
-                + ((1 / (2 * lyambdaN)) * math.log(self.Dt / self.Dt))
+                + ((1 / (2 * lyambdaN)) * np.log(self.Dt / self.Dt))
                 + (1 / (alphaGr * self.Dt))
             )
 
             # Тепловой поток в окружающую среду, Дж/с
-            Qvn = k * self.pi * self.Dt * deltaX * (self.Tgr - self.T1[j])
+            Qvn = k * self.pi * self.Dt * deltaX * (self.Tgr - T)
+
+            if observe is not None:
+                observe(
+                    self,
+                    slice(None),
+                    j,
+                    {
+                        "Re": Re,
+                        "lyambdaT": corr.lyambdaT,
+                        "alphaSS": alphaSS,
+                        "alphak": corr.alphak,
+                        "deltaPtr": deltaPtr,
+                        "Qvn": Qvn,
+                    },
+                )
 
             # Уравнение теплового баланса
-            self.T1[j + 1] = self.T1[j] + (Qvn / (C * self.G1[j]))
+            T2 = T + (Qvn / (C * G))
 
             # Уравнение Бернулли
-            self.P1[j + 1] = self.po1[j + 1] * (
-                (self.P1[j] / self.po1[j])
-                + (alphak * ((self.v1[j] ** 2) / 2))
-                - (alphak * ((self.v1[j + 1] ** 2) / 2))
-                - (deltaP / self.po1[j + 1])
+            P2 = po2 * (
+                (P / po)
+                + (corr.alphak * ((v**2) / 2))
+                - (corr.alphak * ((v2**2) / 2))
+                - (deltaP / po2)
             )
 
-            self.G1[j + 1] = self.po1[j] * self.v1[j] * self.S1
-
-    def plot(self):
-
-        # График общего давления системы
-
-        # Задание списка разбиения трубопроводов
-        self.Pskv[0] = self.Pskv[0] + self.Ptr[0]
-        self.Pskv[0] = self.Pskv[0] + self.P1
+            G2 = po * v * self.S1
 
-        self.Pskv[1] = self.Pskv[1] + self.Ptr[1]
-        self.Pskv[1] = self.Pskv[1] + self.P1
+            T, P, po, v, G = T2, P2, po2, v2, G2
 
-        self.Pskv[2] = self.Pskv[2] + self.Ptr[2]
-        self.Pskv[2] = self.Pskv[2] + self.P1
-
-        self.Pskv[0] = [self.Pskv[0][_] / 1e6 for _ in range(0, (self.N + 1) * 3)]
+    def plot(self):
 
-        self.Pskv[1] = [self.Pskv[1][_] / 1e6 for _ in range(0, (self.N + 1) * 3)]
+        # График общего давления системы (первый сценарий)
 
-        self.Pskv[2] = [self.Pskv[2][_] / 1e6 for _ in range(0, (self.N + 1) * 3)]
+        # Давление вдоль скважины, трубопровода от неё и общего трубопровода
+        Psys = [
+            np.concatenate([self.Pskv[i], self.Ptr[i], self.P1[0]]) / 1e6
+            for i in range(len(self.L))
+        ]
 
-        X = [1 * _ for _ in range((self.N + 1) * 3)]
-        print(self.Pskv[0])
+        X = np.arange(len(Psys[0]))
 
         plt.figure(0)
         # заголовок
@@ -330,12 +588,11 @@ class TrO:
         plt.ylabel("Давление, МПа", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(X, self.Pskv[0], c="orange", linewidth=2)
-        plt.plot(X, self.Pskv[1], c="green", linewidth=2)
-        plt.plot(X, self.Pskv[2], c="blue", linewidth=2)
+        for i in range(len(self.L)):
+            plt.plot(X, Psys[i], c=COLORS[i % 3], linewidth=2)
 
         # Построение графика
-        self.P1 = [self.P1[_] / 1e6 for _ in range(0, self.N + 1)]
+        x = self.deltaX * self.nodes
 
         plt.figure(1)
         # заголовок
@@ -346,7 +603,7 @@ class TrO:
         plt.ylabel("Давление, МПа", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.x, self.P1, c="green", linewidth=2)
+        plt.plot(x, self.P1[0] / 1e6, c="green", linewidth=2)
         plt.legend(["Общий трубопровод"])
 
         plt.figure(2)
@@ -359,7 +616,7 @@ class TrO:
 
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.x, self.T1, c="green", linewidth=2)
+        plt.plot(x, self.T1[0], c="green", linewidth=2)
         plt.legend(["Общий трубопровод"])
 
         plt.figure(3)
@@ -371,7 +628,7 @@ class TrO:
         plt.ylabel("Расход ,кг/с", fontsize=14)
         # включение отображение сетки
         plt.grid(which="major", color="grey", linewidth=0.5)
-        plt.plot(self.x, self.G1, c="green", linewidth=2)
+        plt.plot(x, self.G1[0], c="green", linewidth=2)
         plt.legend(["Общий трубопровод"])
         plt.show()
 
@@ -379,9 +636,9 @@ class TrO:
 if __name__ == "__main__":
 
     PL = TrO()
-    PL.load(r"Project_HGD\Data_HGD_input.toml", r"Project_HGD\Data_HGD_output.toml")
+    PL.load(r"Project_HGD\Data_HGD_input.toml", r"Project_HGD\Data_HGD_output")
     PL.solve()
-    PL.dump(r"Project_HGD\Data_HGD_output.toml")
+    PL.dump(r"Project_HGD\Data_HGD_output")
     PL.plot()
 
     print(PL)
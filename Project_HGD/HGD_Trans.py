@@ -0,0 +1,346 @@
+# Модуль нестационарного расчёта системы: изменение температур и давлений во времени
+# при изменении забойных давлений (пуск, остановка, регулирование штуцерами).
+#
+# Сечения скважин и трубопроводов - те же, что у блоков SKV, Tr123 и TrO (N сечений),
+# все строки (скважины, трубопроводы) рассчитываются одновременно, массивами строка x
+# сечение. Тепловая инерция: температура потока и стенки трубы в каждом сечении,
+#   rho * C * S * dT/dt + G * C * dT/dx = Kin * (Tw - T),
+#   mSt * CSt * dTw/dt = Kin * (T - Tw) + Kout * (Tgr - Tw),
+# где Kin - теплоотдача от потока к стенке, Kout - от стенки в грунт (на единицу длины),
+# mSt - масса стенки на единицу длины (плотность poSt). Перенос тепла - явная схема
+# против потока, шаг по времени ограничен условием Куранта и скоростью теплообмена.
+#
+# Гидравлика квазистационарна: волны давления проходят систему за секунды, поэтому
+# расход скважины - формула Дюпюи при текущем Pc, давления по сечениям - уравнение
+# Бернулли при текущих температурах, как при расчёте по сечениям (местные потери - на
+# входе в трубы). Начальное состояние - стационарный расчёт цепочки.
+
+import numpy as np
+
+from .HGD_Corr import Correlations
+from .HGD_Pl import Plast
+from .HGD_Store import load_data
+from .HGD_System import run_system
+
+# Число Нуссельта ламинарного течения при постоянной температуре стенки: нижняя граница
+# теплоотдачи, в том числе в остановленной трубе
+NU_MIN = 3.66
+
+
+def shutdown(Pc, Pk, start, stop):
+
+    # Расписание забойных давлений: скважины остановлены (Pc = Pk) с момента start до
+    # stop, с, в остальное время - забойные давления Pc
+    return lambda t: Pk if start <= t < stop else Pc
+
+
+def ramp(Pc0, Pc1, start, stop):
+
+    # Расписание забойных давлений: линейное изменение от Pc0 до Pc1 за время start..stop
+    def schedule(t):
+        a = min(max((t - start) / (stop - start), 0), 1)
+        return Pc0 + a * (Pc1 - Pc0)
+
+    return schedule
+
+
+class Channel:
+    def __init__(self, stage, D, S, w, Kout, mC, Tgr, gdz, zeta, T):
+
+        # Строки блока stage (скважины или трубопроводы) по его сечениям: диаметр трения
+        # и теплоотдачи D, площадь сечения S, множитель теплоотдачи к стенке w (1 - на
+        # единицу площади, D - как в k трубопроводов), теплопередача от стенки в грунт
+        # Kout и теплоёмкость стенки mC на единицу длины, температура грунта Tgr,
+        # g * dz участка, коэффициент местных потерь на входе zeta, профиль температур T
+        rows = T.shape[0]
+
+        def column(a):
+            return np.broadcast_to(np.asarray(a, dtype=float), (rows,))[:, None]
+
+        self.stage = stage
+        self.fluid = stage.fluid
+        self.N = T.shape[1] - 1
+        self.dx = column(getattr(stage, "deltaZ", getattr(stage, "deltaX", 0)))
+        self.D = column(D)
+        self.S = column(S)
+        self.w = column(w)
+        self.Kout = column(Kout)
+        self.mC = column(mC)
+        self.Tgr = np.broadcast_to(Tgr, T.shape)
+        self.gdz = column(gdz)
+        self.zeta = column(zeta)
+        self.G = None
+
+        # Температура потока
+        self.T = np.array(T, dtype=float)
+
+    def equilibrium(self):
+
+        # Температура стенки в тепловом равновесии с потоком и грунтом
+        self.heat()
+        self.Tw = (self.Kin * self.T + self.Kout * self.Tgr) / (self.Kin + self.Kout)
+
+    def flow(self, G):
+
+        # Расход строк; корреляции трения и теплоотдачи пересчитываются при его изменении
+        G = np.asarray(G, dtype=float)[:, None]
+        if self.G is not None and np.array_equal(G, self.G):
+            return
+        self.G = G
+        s = self.stage
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.corr = Correlations(
+                G * self.D / (self.S * self.fluid.muN),
+                s.Re1,
+                s.Re2,
+                s.OTsheroh,
+                s.E,
+                self.fluid.Pr,
+                self.fluid.lyambdaN,
+                self.D,
+            )
+
+    def heat(self):
+
+        # Плотность, скорость и теплоотдача от потока к стенке на единицу длины
+        s = self.stage
+        self.rho = self.fluid.rho(self.T)
+        self.v = self.G / (self.rho * self.S)
+        nu = self.fluid.muN / self.rho
+        Gr = (s.g * self.dx**3 * s.betaN * np.abs(self.T - self.Tgr)) / nu**2
+        alpha = np.maximum(self.corr.alphaSS(Gr), NU_MIN * self.fluid.lyambdaN / self.D)
+        self.Kin = s.pi * self.D * alpha * self.w
+
+    def limit(self):
+
+        # Наибольший устойчивый шаг по времени явной схемы
+        dt = self.mC / (self.Kin + self.Kout)
+        dt = np.minimum(dt, self.rho * self.fluid.C * self.S / self.Kin)
+        with np.errstate(divide="ignore"):
+            dt = np.minimum(dt, self.dx / np.abs(self.v))
+        return float(dt.min())
+
+    def step(self, dt, Tin):
+
+        # Шаг по времени: перенос тепла против потока и теплообмен потока со стенкой
+        # и стенки с грунтом. В строках с расходом температура на входе - Tin
+        q = self.Kin * (self.Tw - self.T)
+        dT = q / (self.rho * self.fluid.C * self.S)
+        dT[:, 1:] -= self.v[:, 1:] * (self.T[:, 1:] - self.T[:, :-1]) / self.dx
+        self.Tw += dt * (self.Kout * (self.Tgr - self.Tw) - q) / self.mC
+        self.T += dt * dT
+        flowing = self.G[:, 0] > 0
+        self.T[flowing, 0] = np.asarray(Tin, dtype=float)[flowing]
+
+    def pressure(self, P0):
+
+        # Давление в конце строк по давлению в начале (до местных потерь на входе):
+        # уравнение Бернулли для P / rho, просуммированное по участкам
+        rho = self.fluid.rho(self.T)
+        v = self.G / (rho * self.S)
+        a, b = rho[:, :-1], rho[:, 1:]
+        va, vb = v[:, :-1], v[:, 1:]
+        loss = self.corr.lyambdaTr * (self.dx / self.D) * a * (va**2) / 2
+        loss[:, :1] += self.zeta * a[:, :1] * (va[:, :1] ** 2) / 2
+        u = (
+            self.corr.alphak * ((va**2) / 2)
+            - self.corr.alphak * ((vb**2) / 2)
+            - self.gdz
+            - loss / b
+        )
+        P0 = np.asarray(P0, dtype=float)
+        return rho[:, -1] * (P0 / rho[:, 0] + u.sum(axis=1))
+
+
+class Transient:
+    def __init__(self):
+
+        # Интервал выдачи результатов, с, и запас устойчивости шага по времени
+        self.every = 600.0
+        self.cfl = 0.9
+        # Давление в узле сбора (в начале общего трубопровода, как в HGD_TrO), Па
+        self.Pcol = 4.2e6
+
+    def load(self, filepath):
+
+        # Подключение и интерпретация файла данных Data_HGD_input.toml, начальное
+        # состояние - стационарный расчёт цепочки по сечениям
+        self.DT = load_data(filepath)
+        self.Pk = np.asarray(self.DT["Pk"], dtype=float)
+        self.Pc = np.asarray(self.DT["Pc"], dtype=float)
+        self.steady = run_system(self.DT, output="full")
+        self.channels()
+        self.t = 0.0
+        self.steps = 0
+        self.Q = None
+        self.rates(self.Pc)
+        for part in (self.wells, self.lines, self.trunk):
+            part.equilibrium()
+
+    def channels(self):
+
+        # Строки скважин, трубопроводов от них и общего трубопровода
+        SK, TR, TO = self.steady.skv, self.steady.tr, self.steady.tro
+        pi = SK.pi
+        CSt = self.DT["CSt"]
+        poSt = self.DT["poSt"]
+
+        # Скважины: стенка НКТ и грунт - термические сопротивления, как в блоке SKV
+        dc, Dc = SK.dc, SK.Dc
+        Rst = (dc / 2 * SK.lyambdaSt) * np.log(Dc / dc)
+        Rgr = (dc / 2 * SK.lyambdaGr) * np.log(10)
+        depth = SK.deltaZ[:, None] * (SK.N - np.arange(SK.N + 1))
+        self.wells = Channel(
+            SK,
+            dc,
+            SK.S1,
+            1,
+            pi * dc / (Rst + Rgr),
+            poSt * CSt * pi * (Dc**2 - dc**2) / 4,
+            SK.Tgr + depth * SK.gradT,
+            SK.g * SK.deltaZ,
+            0.5,
+            SK.T1,
+        )
+        self.T0 = (
+            SK.Tgr
+            + (np.asarray(SK.Hskv, dtype=float) + np.asarray(SK.h, dtype=float))
+            * SK.gradT
+        )
+
+        # Трубопроводы от скважин: внутренний диаметр, теплоотдача в грунт по формуле
+        # Форхгеймера - Власова, как в блоке Tr123
+        Dt = TR.Dt - 2 * TR.thick
+        S1 = pi * Dt**2 / 4
+        rc = np.asarray(TR.rc, dtype=float)
+        self.lines = Channel(
+            TR,
+            Dt,
+            S1,
+            Dt,
+            pi * Dt * self.ground(TR, Dt) * Dt,
+            poSt * CSt * pi * (TR.Dt**2 - Dt**2) / 4,
+            TR.Tgr,
+            0,
+            (1 - (rc * 2 - (2 * TR.thick)) / S1) ** 2 * 0.762,
+            TR.T1,
+        )
+
+        # Общий трубопровод: диаметр Dt и площадь по внутреннему диаметру, как в TrO
+        dt = TO.Dt - 2 * TO.thick
+        self.trunk = Channel(
+            TO,
+            TO.Dt,
+            TO.S1,
+            TO.Dt,
+            pi * TO.Dt * self.ground(TO, TO.Dt) * TO.Dt,
+            poSt * CSt * pi * (TO.Dt**2 - dt**2) / 4,
+            TO.Tgr,
+            0,
+            0.23,
+            TO.T1,
+        )
+
+    def ground(self, stage, D):
+
+        # Коэффициент теплоотдачи от стенки трубопровода к грунту, Вт/м**2 * K
+        H = stage.H + (D / 2)
+        return (2 * stage.lyambdaGr) / (
+            D * (np.log((2 * H) / D) + np.sqrt((((2 * H) / D) ** 2) - 1))
+        )
+
+    def rates(self, Pc):
+
+        # Дебиты скважин при забойных давлениях Pc (формула Дюпюи, блок Plast) и
+        # массовые расходы строк; при Pc >= Pk скважина остановлена
+        Pc = np.broadcast_to(np.asarray(Pc, dtype=float), self.Pc.shape)
+        if self.Q is not None and np.array_equal(Pc, self.Pc):
+            return
+        PL = Plast()
+        PL.verbose = False
+        PL.load(dict(self.DT, Pc=list(Pc)))
+        PL.solve()
+        self.Pc = np.array(Pc)
+        self.Q = np.maximum(PL.Q, 0)
+
+        G = self.Q * self.wells.fluid.rho(self.T0)
+        self.wells.flow(G)
+        self.lines.flow(G)
+        self.trunk.flow(np.array([G.sum()]))
+
+    def step(self, dt):
+
+        # Шаг по времени не больше устойчивого; возвращает сделанный шаг
+        parts = (self.wells, self.lines, self.trunk)
+        for part in parts:
+            part.heat()
+        dt = min(dt, self.cfl * min(part.limit() for part in parts))
+
+        self.wells.step(dt, self.T0)
+        self.lines.step(dt, self.wells.T[:, -1])
+
+        # Смешение потоков на входе общего трубопровода
+        G = self.lines.G[:, 0]
+        Tin = self.trunk.T[:, 0]
+        if G.sum() > 0:
+            Tin = np.array([(G * self.lines.T[:, -1]).sum() / G.sum()])
+        self.trunk.step(dt, Tin)
+
+        self.t += dt
+        self.steps += 1
+        return dt
+
+    def state(self):
+
+        # Величины в текущий момент: давления - квазистационарный расчёт по сечениям
+        Pskv = self.wells.pressure(self.Pc)
+        Ptr = self.lines.pressure(Pskv)
+        P = self.trunk.pressure([self.Pcol])
+        return {
+            "t": self.t,
+            "G": float(self.trunk.G[0, 0]),
+            "P": float(P[0]),
+            "T": float(self.trunk.T[0, -1]),
+            "Pc": self.Pc.copy(),
+            "Gskv": self.wells.G[:, 0].copy(),
+            "Pskv": Pskv,
+            "Tskv": self.wells.T[:, -1].copy(),
+            "Ptr": Ptr,
+            "Ttr": self.lines.T[:, -1].copy(),
+        }
+
+    def run(self, duration, schedule=None):
+
+        # Расчёт на время duration, с, от текущего момента. schedule(t) - забойные
+        # давления во времени (без него - постоянные). Результаты выдаются по мере
+        # расчёта (генератор) в начале и через каждые every секунд
+        end = self.t + duration
+        yield self.state()
+        while self.t < end * (1 - 1e-12):
+            out = min(self.t + self.every, end)
+            while self.t < out * (1 - 1e-12):
+                if schedule is not None:
+                    self.rates(schedule(self.t))
+                self.step(out - self.t)
+            self.t = out
+            yield self.state()
+
+
+if __name__ == "__main__":
+
+    import time
+
+    TS = Transient()
+    TS.load(r"Project_HGD\Data_HGD_input.toml")
+    TS.every = 3600.0
+
+    # Остановка скважин на 6 часов и повторный пуск, расчёт на сутки
+    schedule = shutdown(TS.Pc, TS.Pk, 6 * 3600, 12 * 3600)
+    start = time.perf_counter()
+    for row in TS.run(24 * 3600, schedule):
+        print(
+            "t = %5.1f ч  G = %6.3f кг/с  P = %10.1f Па  T = %7.3f К"
+            % (row["t"] / 3600, row["G"], row["P"], row["T"])
+        )
+    elapsed = time.perf_counter() - start
+    print("Шагов по времени:", TS.steps, "время расчёта, с: %.2f" % elapsed)
@@ -0,0 +1,15 @@
+# Общие данные тестов: файл исходных данных пакета
+
+import os
+
+import pytest
+
+DATA = os.path.join(
+    os.path.dirname(__file__), "..", "Project_HGD", "Data_HGD_input.toml"
+)
+
+
+@pytest.fixture
+def data():
+
+    return DATA
@@ -0,0 +1,59 @@
+# Тесты наблюдателя шагов HGD_Diag
+
+import numpy as np
+import pytest
+
+from Project_HGD.HGD_Diag import DIAGNOSTICS, Recorder
+from Project_HGD.HGD_Ensemble import WELL_KEYS
+from Project_HGD.HGD_Graph import take
+from Project_HGD.HGD_Pl import Plast
+from Project_HGD.HGD_Skv import SKV
+from Project_HGD.HGD_Store import load_data
+from Project_HGD.HGD_Tr123 import Tr123
+
+
+def wells(DT, SK):
+
+    # Расчёт скважин блоком SK по сечениям
+    PL = Plast()
+    PL.verbose = False
+    PL.load(DT)
+    PL.solve()
+    SK.load(DT, {"Qpl": PL.Q})
+    SK.solve()
+    return SK
+
+
+def test_record(data):
+
+    # Повторный расчёт с другим числом скважин - новые массивы записей
+    DT = load_data(data)
+    SK = SKV()
+    RE = Recorder().attach(SK)
+    wells(DT, SK)
+    assert set(RE.data) == set(DIAGNOSTICS)
+    assert RE.data["Re"].shape == (3, SK.N)
+    first = RE.data["Re"].copy()
+
+    wells(take(DT, [2, 0], WELL_KEYS), SK)
+    assert RE.data["Re"].shape == (2, SK.N)
+    np.testing.assert_allclose(RE.data["Re"], first[[2, 0]], rtol=1e-12)
+
+
+@pytest.mark.parametrize("cls, attr", [(SKV, "rk"), (Tr123, "rk"), (Tr123, "fast")])
+def test_attach_stepper(cls, attr):
+
+    # С переменным шагом и быстрым расчётом наблюдатель не вызывается
+    stage = cls()
+    setattr(stage, attr, 1e-6)
+    with pytest.raises(ValueError):
+        Recorder().attach(stage)
+
+
+def test_not_recorded():
+
+    # Режим течения до расчёта блока
+    SK = SKV()
+    RE = Recorder().attach(SK)
+    with pytest.raises(ValueError):
+        RE.transitions(SK)
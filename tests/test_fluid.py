@@ -0,0 +1,83 @@
+# Тесты свойств смеси HGD_Fluid с таблицей PVT и учёта правки файла таблицы кэшем
+# и инкрементным пересчётом
+
+import numpy as np
+import pytest
+import toml
+
+from Project_HGD.HGD_Cache import Cache
+from Project_HGD.HGD_Fluid import PVTTable
+from Project_HGD.HGD_Graph import Incremental
+from Project_HGD.HGD_Store import load_data
+from Project_HGD.HGD_System import run_system
+
+TABLE = {
+    "T": [273.0, 293.0, 323.0, 373.0],
+    "po": [866.0, 852.1, 838.0, 812.0],
+    "pov": [999.8, 998.2, 988.0, 958.4],
+}
+
+
+def test_lookup():
+
+    # Кусочно-линейная интерполяция по таблице, за её пределами - продолжение крайних
+    # интервалов; обводнённость - по строкам (сценариям)
+    PT = PVTTable(TABLE)
+    T = np.array([[260.0, 280.0, 293.0, 340.0, 400.0]] * 3)
+    alphav = np.array([[0.0], [0.3], [1.0]])
+    rho = PT.rho(T, alphav)
+
+    for row, a in zip(range(3), alphav[:, 0]):
+        mix = np.array(TABLE["po"]) * (1 - a) + np.array(TABLE["pov"]) * a
+        inside = np.interp(T[row, 1:4], TABLE["T"], mix)
+        np.testing.assert_allclose(rho[row, 1:4], inside, rtol=1e-14)
+        left = mix[0] + (mix[1] - mix[0]) / 20 * (260.0 - 273.0)
+        right = mix[3] + (mix[3] - mix[2]) / 50 * (400.0 - 373.0)
+        assert rho[row, 0] == pytest.approx(left, rel=1e-14)
+        assert rho[row, 4] == pytest.approx(right, rel=1e-14)
+
+    np.testing.assert_allclose(
+        PT.drho(T[:, 2:3], alphav)[:, 0],
+        (1 - alphav[:, 0]) * (838.0 - 852.1) / 30 + alphav[:, 0] * (988.0 - 998.2) / 30,
+        rtol=1e-12,
+    )
+
+
+def edited(data, tmp_path):
+
+    # Исходные данные с таблицей PVT в файле и правка этого файла
+    path = tmp_path / "pvt.toml"
+    path.write_text(toml.dumps(TABLE))
+    DT = dict(load_data(data), pvt=str(path), alphav=0.5)
+
+    def edit():
+        table = dict(TABLE, po=[p * 0.95 for p in TABLE["po"]])
+        path.write_text(toml.dumps(table))
+
+    return DT, edit
+
+
+def test_cache_pvt_file(data, tmp_path):
+
+    # После правки файла таблицы результат не берётся из кэша
+    DT, edit = edited(data, tmp_path)
+    cache = Cache(str(tmp_path / "cache"))
+    before = run_system(DT, cache=cache).P
+    edit()
+    misses = cache.misses
+    after = run_system(DT, cache=cache).P
+    assert cache.misses > misses
+    assert after == pytest.approx(run_system(DT).P, rel=1e-12)
+    assert after != pytest.approx(before, rel=1e-9)
+
+
+def test_incremental_pvt_file(data, tmp_path):
+
+    # После правки файла таблицы блоки, читающие pvt, пересчитываются
+    DT, edit = edited(data, tmp_path)
+    IN = Incremental()
+    IN.run(DT)
+    edit()
+    RS = IN.run(DT)
+    assert IN.solved["skv"] is None
+    assert RS.P == pytest.approx(run_system(DT).P, rel=1e-12)
@@ -0,0 +1,70 @@
+# Тесты инкрементного пересчёта HGD_Graph: результат после изменения проницаемости
+# одной скважины совпадает с полным расчётом цепочки
+
+import numpy as np
+import pytest
+
+from Project_HGD.HGD_Graph import Incremental
+from Project_HGD.HGD_Store import load_data
+from Project_HGD.HGD_System import run_system
+
+
+def compare(RS, full):
+
+    for name in ("skv", "tr", "tro"):
+        a, b = getattr(RS, name), getattr(full, name)
+        np.testing.assert_allclose(a.nodes, b.nodes)
+        for attr in ("P1", "T1", "G1"):
+            np.testing.assert_allclose(getattr(a, attr), getattr(b, attr), rtol=1e-12)
+    assert RS.summary() == pytest.approx(full.summary(), rel=1e-12)
+
+
+def edit(data, rk=None, fast=None, slow=False, factor=2.0):
+
+    # Расчёт исходных данных, затем изменение k скважины №2. slow - скважина №1 почти
+    # остановлена (Pc близко к Pk): ламинарный режим в её трубопроводе
+    DT = load_data(data)
+    if slow:
+        DT = dict(DT, Pc=list(DT["Pc"]))
+        DT["Pc"][0] = DT["Pk"][0] * 0.999
+
+    IN = Incremental()
+    IN.rk = rk
+    IN.fast = fast
+    IN.run(DT)
+
+    DT = dict(DT, k=list(DT["k"]))
+    DT["k"][1] *= factor
+    return IN, IN.run(DT), run_system(DT, rk=rk, fast=fast)
+
+
+def test_splice(data):
+
+    # Расчёт по N сечениям: пересчитывается только строка изменённой скважины
+    IN, RS, full = edit(data)
+    assert IN.solved["skv"] == [1]
+    assert IN.solved["tr"] == [1]
+    compare(RS, full)
+
+
+@pytest.mark.parametrize("factor", [2.0, 0.1])
+def test_rk(data, factor):
+
+    # С переменным шагом узлы строки изменённой скважины отличаются от узлов всех строк
+    # (при k * 0.1), блоки пересчитываются целиком
+    IN, RS, full = edit(data, rk=1e-6, factor=factor)
+    assert IN.solved["skv"] is None
+    assert IN.solved["tr"] is None
+    compare(RS, full)
+
+
+@pytest.mark.parametrize("slow", [False, True])
+def test_fast(data, slow):
+
+    # При быстром расчёте число участков трубопроводов зависит от всех строк (с почти
+    # остановленной скважиной - 16 участков против 1 у изменённой), трубопроводы
+    # пересчитываются целиком, скважины - по строкам
+    IN, RS, full = edit(data, fast=1e-4, slow=slow)
+    assert IN.solved["skv"] == [1]
+    assert IN.solved["tr"] is None
+    compare(RS, full)
@@ -0,0 +1,40 @@
+# Тесты проверки топологии сети сбора HGD_Net
+
+import pytest
+
+from Project_HGD.HGD_Net import Network
+from Project_HGD.HGD_Store import load_data
+
+
+def network(data, wells, to):
+
+    DT = dict(load_data(data), netWells=wells, netTo=to, netL=[1000.0] * len(to))
+    NE = Network()
+    NE.load(DT)
+    return NE
+
+
+def test_tree(data):
+
+    # Две скважины в узел 0, третья - в узел 1, оба узла - в узел 2, узел 2 - на выход
+    NE = network(data, [0, 0, 1], [2, 2, -1])
+    assert [list(level) for level in NE.levels] == [[0, 1], [2]]
+    assert NE.upstream[2].all()
+
+
+@pytest.mark.parametrize(
+    "to", [[0], [1, 0, -1], [-1, 2, 1]], ids=["self", "pair", "side"]
+)
+def test_cycle(data, to):
+
+    # Узел, выходящий сам в себя, и циклы из двух узлов (в том числе рядом с выходом)
+    with pytest.raises(ValueError, match="цикл|выход"):
+        network(data, [0, 0, 0], to)
+
+
+@pytest.mark.parametrize("to", [[-1, -1], [1, 5]], ids=["roots", "range"])
+def test_not_tree(data, to):
+
+    # Два выхода и номер узла вне сети
+    with pytest.raises(ValueError):
+        network(data, [0, 0, 1], to)
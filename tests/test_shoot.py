@@ -0,0 +1,46 @@
+# Тесты обратного расчёта HGD_Shoot
+
+import numpy as np
+import pytest
+
+from Project_HGD.HGD_Shoot import Shooting
+from Project_HGD.HGD_System import run_system
+
+
+def test_outlet_reachable(data):
+
+    # Давление на выходе, при котором трубопроводы от скважин подают нефть в узел сбора
+    SH = Shooting()
+    SH.load(data)
+    Pc = SH.outlet(4.19e6)
+    assert SH.converged
+    assert SH.feasible.all()
+
+    RS = run_system(dict(SH.DT, Pc=list(Pc)), output="end", rk=SH.rk, fast=SH.fast)
+    assert abs(RS.P - 4.19e6) <= SH.tol
+    assert np.all(RS.skv.P1[:, -1] > 0)
+    assert np.all(RS.tr.P1[:, -1] >= SH.Pcol - SH.tol)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("target", [4.0e6, 3.0e6])
+def test_outlet_infeasible(data, target):
+
+    # Невязка сведена, но давление в конце трубопроводов ниже Pcol (при 3 МПа - и
+    # отрицательное давление на устье): решение не сошедшееся
+    SH = Shooting()
+    SH.load(data)
+    SH.outlet(target)
+    assert np.all(np.abs(SH.residual) <= SH.tol)
+    assert not SH.converged
+    assert not SH.feasible.all()
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_outlet_unreachable(data):
+
+    # Давление выше достижимого при наименьшем дебите
+    SH = Shooting()
+    SH.load(data)
+    with pytest.raises(ValueError):
+        SH.outlet(4.5e6)
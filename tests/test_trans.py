@@ -0,0 +1,49 @@
+# Тесты нестационарного расчёта HGD_Trans
+
+import numpy as np
+import pytest
+
+from Project_HGD.HGD_Trans import Transient, shutdown
+
+
+def transient(data):
+
+    TS = Transient()
+    TS.load(data)
+    TS.every = 600.0
+    return TS
+
+
+def test_steady(data):
+
+    # Без расписания система остаётся в стационарном состоянии цепочки
+    TS = transient(data)
+    rows = list(TS.run(3600.0))
+    assert [row["t"] for row in rows] == pytest.approx(np.arange(0, 3601, 600))
+    for row in rows:
+        assert row["G"] == pytest.approx(TS.steady.G, rel=1e-12)
+        assert row["P"] == pytest.approx(TS.steady.P, rel=1e-6)
+        assert row["T"] == pytest.approx(TS.steady.T, abs=1e-3)
+        np.testing.assert_allclose(row["Tskv"], TS.steady.skv.T1[:, -1], atol=1e-3)
+
+
+def test_shutdown_restart(data):
+
+    # Остановка скважин с 600 до 3600 с: расход падает до нуля, устье остывает.
+    # После пуска расход восстанавливается сразу, а к устью сначала приходит остывшая
+    # в скважине нефть, затем температура растёт к стационарной
+    TS = transient(data)
+    rows = {row["t"]: row for row in TS.run(7200.0, shutdown(TS.Pc, TS.Pk, 600, 3600))}
+
+    G0, Tskv0 = rows[0.0]["G"], rows[0.0]["Tskv"]
+    assert G0 == pytest.approx(TS.steady.G, rel=1e-12)
+    for t in (1200.0, 2400.0, 3600.0):
+        assert rows[t]["G"] == 0
+        assert np.all(rows[t]["Gskv"] == 0)
+    assert np.all(rows[3600.0]["Tskv"] < Tskv0)
+
+    for t in (4200.0, 7200.0):
+        assert rows[t]["G"] == pytest.approx(G0, rel=1e-12)
+    assert np.all(rows[4800.0]["Tskv"] < rows[3600.0]["Tskv"])
+    assert np.all(rows[4800.0]["Tskv"] < rows[7200.0]["Tskv"])
+    assert np.all(rows[7200.0]["Tskv"] < Tskv0)